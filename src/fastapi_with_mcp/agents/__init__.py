@@ -1,2 +1,8 @@
 # agents/__init__.py
-from .graph import make_graph
\ No newline at end of file
+from .graph import make_graph, make_model, MCP_SERVERS, TOOL_CACHE_TTLS
+from .pool import MCPSessionPool
+from .checkpoint import ThreadStore
+from .limits import UpstreamBudgets
+from .tool_cache import ToolResultCache
+from .llm_cache import SQLiteLLMCache
+from .fake_model import ScriptedChatModel
\ No newline at end of file
@@ -0,0 +1,126 @@
+# agents/checkpoint.py
+import asyncio
+import logging
+import time
+import weakref
+from contextlib import asynccontextmanager
+
+from langchain_core.messages import HumanMessage, RemoveMessage
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+logger = logging.getLogger(__name__)
+
+
+class ThreadStore:
+    """
+    File-local SQLite checkpointer for conversation threads, with the
+    housekeeping that keeps per-turn checkpoint I/O bounded.
+
+    - Runs are invoked with `checkpoint_during=False`, so a turn writes one
+      checkpoint instead of one per ReAct step.
+    - `compact` drops the oldest whole turns once a thread holds more than
+      `max_messages` messages, and deletes checkpoints superseded by the
+      latest `keep_checkpoints`.
+    - Threads idle for longer than `max_idle` seconds are evicted.
+    - `lock` serializes the runs of one thread: two turns that both start
+      from the same checkpoint would otherwise each write their own, and
+      one of them would be lost.
+
+    Args:
+        saver (AsyncSqliteSaver): The LangGraph checkpointer.
+        max_messages (int, optional): Messages kept per thread. Defaults to 40.
+        keep_checkpoints (int, optional): Checkpoints kept per thread. Defaults to 1.
+        max_idle (float, optional): Seconds before an idle thread is evicted. Defaults to 7 days.
+        evict_interval (float, optional): Minimum seconds between eviction sweeps. Defaults to 1 hour.
+    """
+
+    def __init__(
+        self,
+        saver: AsyncSqliteSaver,
+        max_messages: int = 40,
+        keep_checkpoints: int = 1,
+        max_idle: float = 7 * 24 * 3600,
+        evict_interval: float = 3600,
+    ):
+        self.saver = saver
+        self.max_messages = max_messages
+        self.keep_checkpoints = keep_checkpoints
+        self.max_idle = max_idle
+        self.evict_interval = evict_interval
+        self._last_evict = 0.0
+        # 잡거나 기다리는 요청이 없으면 사라지므로 스레드 수만큼 쌓이지 않는다
+        self._locks = weakref.WeakValueDictionary()
+
+    @classmethod
+    @asynccontextmanager
+    async def open(cls, path: str, **kwargs):
+        async with AsyncSqliteSaver.from_conn_string(path) as saver:
+            await saver.setup()
+            store = cls(saver, **kwargs)
+            await store._execute(
+                "CREATE TABLE IF NOT EXISTS thread_activity "
+                "(thread_id TEXT PRIMARY KEY, last_seen REAL NOT NULL)"
+            )
+            yield store
+
+    @staticmethod
+    def config(thread_id: str) -> dict:
+        return {"configurable": {"thread_id": thread_id}}
+
+    def lock(self, thread_id: str) -> asyncio.Lock:
+        """The lock held around a run of the thread and its compaction."""
+        lock = self._locks.get(thread_id)
+        if lock is None:
+            lock = self._locks[thread_id] = asyncio.Lock()
+        return lock
+
+    async def compact(self, agent, thread_id: str):
+        """Trim the thread to its newest turns and drop superseded checkpoints."""
+        config = self.config(thread_id)
+        state = await agent.aget_state(config)
+        messages = state.values.get("messages", [])
+
+        if len(messages) > self.max_messages:
+            # 도구 호출과 결과가 갈라지지 않도록 사람 메시지 경계에서 자른다
+            cut = len(messages) - self.max_messages
+            turns = [i for i, m in enumerate(messages) if isinstance(m, HumanMessage)]
+            cut = next((i for i in turns if i >= cut), turns[-1] if turns else 0)
+            if cut > 0:
+                await agent.aupdate_state(
+                    config, {"messages": [RemoveMessage(id=m.id) for m in messages[:cut]]}
+                )
+
+        await self._execute(
+            "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_id NOT IN "
+            "(SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? "
+            "ORDER BY checkpoint_id DESC LIMIT ?)",
+            (thread_id, thread_id, self.keep_checkpoints),
+        )
+        await self._execute(
+            "DELETE FROM writes WHERE thread_id = ? AND checkpoint_id NOT IN "
+            "(SELECT checkpoint_id FROM checkpoints WHERE thread_id = ?)",
+            (thread_id, thread_id),
+        )
+        await self._execute(
+            "INSERT OR REPLACE INTO thread_activity (thread_id, last_seen) VALUES (?, ?)",
+            (thread_id, time.time()),
+        )
+
+        if time.monotonic() - self._last_evict > self.evict_interval:
+            self._last_evict = time.monotonic()
+            await self.evict_idle()
+
+    async def evict_idle(self):
+        """Delete every thread that has not been used for `max_idle` seconds."""
+        cutoff = time.time() - self.max_idle
+        stale = "SELECT thread_id FROM thread_activity WHERE last_seen < ?"
+        for table in ("checkpoints", "writes"):
+            await self._execute(
+                f"DELETE FROM {table} WHERE thread_id IN ({stale})", (cutoff,)
+            )
+        await self._execute("DELETE FROM thread_activity WHERE last_seen < ?", (cutoff,))
+
+    async def _execute(self, sql: str, params: tuple = ()):
+        async with self.saver.lock:
+            await self.saver.conn.execute(sql, params)
+            await self.saver.conn.commit()
@@ -0,0 +1,86 @@
+# agents/fake_model.py
+import asyncio
+import re
+import time
+import uuid
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+# 질문에 이 단어가 있으면 해당 도구를 호출한다
+_SEARCH_KEYWORDS = {
+    "search_news": ("news", "뉴스"),
+    "search_book": ("book", "책"),
+    "search_blog": ("blog", "블로그"),
+}
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Deterministic offline stand-in for ChatOpenAI.
+
+    The reply depends only on the conversation and the bound tools: a user
+    message that looks like arithmetic calls `add`/`multiply`, one that
+    mentions news/books/blogs calls the matching Naver search tool, and once
+    a tool result arrives the model answers with it. Tool call ids are
+    derived from the conversation, so identical runs produce identical
+    messages. `latency` simulates the LLM round-trip.
+
+    Selected with CHAT_MODEL=fake (see `make_model`).
+    """
+
+    latency: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-fake"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"latency": self.latency}
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        return self._reply(messages, kwargs.get("tools", []))
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._reply(messages, kwargs.get("tools", []))
+
+    def _reply(self, messages, tools) -> ChatResult:
+        names = {tool["function"]["name"] for tool in tools}
+        last = messages[-1]
+        if isinstance(last, ToolMessage):
+            message = AIMessage(content=f"Result: {str(last.content)[:200]}")
+        elif isinstance(last, HumanMessage) and (call := self._plan(str(last.content), names)):
+            call["id"] = "call_" + uuid.uuid5(
+                uuid.NAMESPACE_OID, "".join(str(m.content) for m in messages)
+            ).hex[:24]
+            message = AIMessage(content="", tool_calls=[call])
+        else:
+            message = AIMessage(content=f"Echo: {last.content}")
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    @staticmethod
+    def _plan(text: str, names: set):
+        numbers = [int(n) for n in re.findall(r"-?\d+", text)]
+        if len(numbers) >= 2:
+            if "multiply" in names and re.search(r"[x*×]|multiply|곱", text):
+                return {"name": "multiply", "args": {"a": numbers[0], "b": numbers[1]}}
+            if "add" in names and re.search(r"\+|add|더하", text):
+                return {"name": "add", "args": {"a": numbers[0], "b": numbers[1]}}
+
+        lowered = text.lower()
+        for name, keywords in _SEARCH_KEYWORDS.items():
+            if name in names and any(keyword in lowered for keyword in keywords):
+                quoted = re.search(r"['\"](.+?)['\"]", text)
+                query = quoted.group(1) if quoted else text
+                return {"name": name, "args": {"query": query, "display": 10}}
+        return None
@@ -1,28 +1,78 @@
 # agents/graph.py
+import os
+from pathlib import Path
 from contextlib import asynccontextmanager
 from langchain_openai import ChatOpenAI
 from langgraph.prebuilt import create_react_agent
 from langsmith import traceable
 from langchain_mcp_adapters.client import MultiServerMCPClient
+from mcp.client.stdio import get_default_environment
+from .fake_model import ScriptedChatModel
+from .metrics import LLMTimer
+from .tools import apply_middleware
 
 from dotenv import load_dotenv
 load_dotenv()
 
+MCP_SERVERS = {
+    "math": {
+        "command": "python",
+        "args": ["servers/math_server.py"],
+        "transport": "stdio"
+    },
+    "naver_api": {
+        "command": "python",
+        "args": ["servers/naver_api.py"],
+        "transport": "stdio", # "sse"
+        # stdio 서버는 기본 환경변수만 물려받으므로 NAVER_* 설정은 직접 넘긴다
+        # 풀의 서버 프로세스들이 하나의 일일 쿼터를 세도록 같은 파일을 쓴다
+        "env": {
+            **get_default_environment(),
+            "NAVER_QUOTA_DB": str(Path(__file__).resolve().parent.parent / "naver_quota.sqlite"),
+            **{k: v for k, v in os.environ.items() if k.startswith("NAVER_")},
+        },
+    }
+}
+
+# 캐시해도 되는(멱등) 도구와 TTL(초). 여기 없는 도구는 캐시하지 않는다
+TOOL_CACHE_TTLS = {
+    "naver_api": {
+        "search_blog": 300,
+        "search_news": 300,
+        "search_book": 3600,
+    },
+}
+
+def make_model(budgets=None, cache=None):
+    # CHAT_MODEL=fake 이면 OpenAI 없이 결정적으로 동작하는 모델을 쓴다
+    if os.environ.get("CHAT_MODEL") == "fake":
+        return ScriptedChatModel(
+            latency=float(os.environ.get("FAKE_LLM_LATENCY", "0")),
+            cache=cache,
+            callbacks=[LLMTimer("fake")],
+        )
+    return ChatOpenAI(
+        model="gpt-4o",
+        http_async_client=budgets.llm_client if budgets else None,
+        cache=cache,
+        callbacks=[LLMTimer("gpt-4o")],
+    )  # LangSmith가 자동 추적
+
 @traceable(name="fastapi_with_mcp")
 @asynccontextmanager
-async def make_graph():
-    model = ChatOpenAI(model="gpt-4o")  # LangSmith가 자동 추적
-    async with MultiServerMCPClient({
-        "math": {
-            "command": "python",
-            "args": ["servers/math_server.py"],
-            "transport": "stdio"
-        },
-        "naver_api": {
-            "command": "python",
-            "args": ["servers/naver_api.py"],
-            "transport": "stdio" # "sse"
-        }
-    }) as client:
-        agent = create_react_agent(model, client.get_tools())
+async def make_graph(pool=None, checkpointer=None, model=None, middleware=()):
+    if model is None:
+        model = make_model()
+    if pool is None:
+        # 풀이 없으면 요청마다 MCP 서버를 새로 띄운다
+        async with MultiServerMCPClient(MCP_SERVERS) as client:
+            tools = apply_middleware(client.server_name_to_tools, middleware)
+            agent = create_react_agent(model, tools, checkpointer=checkpointer)
+            yield agent
+        return
+
+    async with pool.checkout() as session:
+        # guard는 가장 안쪽: 캐시 적중은 세션을 건드리지 않는다
+        tools = apply_middleware(session.tools_by_server, (*middleware, session.guard))
+        agent = create_react_agent(model, tools, checkpointer=checkpointer)
         yield agent
@@ -0,0 +1,86 @@
+# agents/limits.py
+import asyncio
+import time
+
+import httpx
+
+
+class Budget:
+    """Concurrency budget for one upstream, with wait-time counters."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._semaphore = asyncio.Semaphore(limit)
+        self.in_flight = 0
+        self.waiting = 0
+        self.calls = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    async def __aenter__(self):
+        started = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        waited = time.perf_counter() - started
+        self.calls += 1
+        self.in_flight += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    async def __aexit__(self, *exc_info):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "calls": self.calls,
+            "wait_seconds_total": self.wait_seconds_total,
+            "wait_seconds_max": self.wait_seconds_max,
+        }
+
+
+class UpstreamBudgets:
+    """
+    Process-wide concurrency budgets per upstream, shared by all requests.
+
+    Tool calls are limited per MCP server (e.g. "math", "naver_api") when the
+    instance is used as tool middleware (see `apply_middleware`). LLM
+    calls are limited through the connection pool of the HTTP client handed
+    to ChatOpenAI, so at most `llm` requests to OpenAI are open at once.
+
+    Args:
+        llm (int): Concurrent OpenAI requests.
+        **servers (int): Concurrent tool calls per MCP server name.
+    """
+
+    def __init__(self, llm: int, **servers: int):
+        self.llm = llm
+        self.servers = {name: Budget(limit) for name, limit in servers.items()}
+        self.llm_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=llm, max_keepalive_connections=llm),
+            # 대기 시간은 AdmissionController가 제한하므로 pool 대기는 무제한
+            timeout=httpx.Timeout(120.0, pool=None),
+        )
+
+    async def __call__(self, server, tool, call, kwargs):
+        """Tool middleware: hold the server's budget for the duration of the call."""
+        budget = self.servers.get(server)
+        if budget is None:
+            return await call(**kwargs)
+        async with budget:
+            return await call(**kwargs)
+
+    async def aclose(self):
+        await self.llm_client.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "llm": {"limit": self.llm},
+            **{name: budget.stats() for name, budget in self.servers.items()},
+        }
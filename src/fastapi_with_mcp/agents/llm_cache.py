@@ -0,0 +1,142 @@
+# agents/llm_cache.py
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+
+# 실행마다 달라지지만 모델 입력의 의미에는 영향이 없는 필드
+_VOLATILE_FIELDS = ("id", "response_metadata", "usage_metadata")
+
+
+def _canonical_prompt(prompt: str) -> str:
+    try:
+        messages = json.loads(prompt)
+    except ValueError:
+        return prompt
+    for message in messages if isinstance(messages, list) else []:
+        kwargs = message.get("kwargs") if isinstance(message, dict) else None
+        if isinstance(kwargs, dict):
+            for field in _VOLATILE_FIELDS:
+                kwargs.pop(field, None)
+    return json.dumps(messages, sort_keys=True, ensure_ascii=False)
+
+
+class SQLiteLLMCache(BaseCache):
+    """
+    Persistent exact-match cache for chat model responses.
+
+    LangChain hands the cache the serialized message list and an
+    `llm_string` holding the model parameters and the bound tool schemas;
+    the key is a hash of both, with per-run message ids and usage metadata
+    stripped so the same conversation maps to the same key. Entries expire
+    after `ttl` seconds and the least recently used ones are evicted beyond
+    `max_entries`.
+
+    Hit rate and the model latency saved by hits are tracked in `stats()`.
+
+    Args:
+        path (str): SQLite database file.
+        ttl (float, optional): Seconds an entry stays valid. Defaults to 1 day.
+        max_entries (int, optional): Entries kept. Defaults to 10000.
+    """
+
+    def __init__(self, path: str, ttl: float = 24 * 3600, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL,
+                latency REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS llm_cache_last_used ON llm_cache (last_used);
+            """
+        )
+        self._started = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.latency_saved = 0.0
+
+    @staticmethod
+    def key(prompt: str, llm_string: str) -> str:
+        data = _canonical_prompt(prompt) + "\x00" + llm_string
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str):
+        key = self.key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created, latency FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[1] + self.ttl < now:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                if len(self._started) > self.max_entries:
+                    # 실패해서 update가 오지 않은 조회가 쌓이지 않도록
+                    self._started.clear()
+                self._started[key] = time.perf_counter()
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            self.latency_saved += row[2]
+
+        generations = loads(row[0])
+        for generation in generations:
+            # 새 id를 받게 해서 같은 스레드에서 이전 메시지를 덮어쓰지 않도록 한다
+            generation.message.id = None
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val):
+        key = self.key(prompt, llm_string)
+        value = dumps(return_val)
+        now = time.time()
+        with self._lock:
+            started = self._started.pop(key, None)
+            latency = time.perf_counter() - started if started is not None else 0.0
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created, last_used, latency) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, now, now, latency),
+            )
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache "
+                "ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def clear(self, **kwargs):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "latency_saved_seconds": self.latency_saved,
+        }
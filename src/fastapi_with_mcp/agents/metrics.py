@@ -0,0 +1,154 @@
+# agents/metrics.py
+import bisect
+import contextvars
+import time
+from contextlib import contextmanager
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _labels(items) -> str:
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+
+
+class Histogram:
+    """Minimal Prometheus histogram with labels, rendered in text format."""
+
+    def __init__(self, name: str, help: str, buckets: tuple = BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        self._series = {}
+        REGISTRY.append(self)
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, count) in self._series.items():
+            cumulative = 0
+            for bound, n in zip((*self.buckets, "+Inf"), counts):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_labels((*key, ('le', bound)))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(key)} {total}")
+            lines.append(f"{self.name}_count{_labels(key)} {count}")
+        return lines
+
+
+REGISTRY = []
+
+REQUEST_SECONDS = Histogram("chat_request_seconds", "HTTP request duration")
+POOL_WAIT_SECONDS = Histogram("mcp_pool_wait_seconds", "Wait for a pooled MCP session")
+ADMISSION_WAIT_SECONDS = Histogram("admission_wait_seconds", "Wait in the admission queue")
+MCP_CONNECT_SECONDS = Histogram(
+    "mcp_connect_seconds", "MCP server start-up by step (spawn, initialize, list_tools)"
+)
+LLM_SECONDS = Histogram("llm_request_seconds", "Chat model round-trip")
+TOOL_SECONDS = Histogram("mcp_tool_seconds", "MCP tool call round-trip")
+SERIALIZE_SECONDS = Histogram("response_serialize_seconds", "Response body serialization")
+
+
+# 요청 하나 동안의 단계별 시간 합계 {stage: [seconds, count]}
+_timings = contextvars.ContextVar("timings", default=None)
+
+
+def start_request() -> dict:
+    timings = {}
+    _timings.set(timings)
+    return timings
+
+
+def record(stage: str, seconds: float):
+    timings = _timings.get()
+    if timings is not None:
+        entry = timings.setdefault(stage, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+
+@contextmanager
+def span(histogram: Histogram, stage: str = None, **labels):
+    """Time the block into `histogram` and, if given, the request's `stage` total."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        histogram.observe(elapsed, **labels)
+        if stage is not None:
+            record(stage, elapsed)
+
+
+async def timed_tool(server, tool, call, kwargs):
+    """Tool middleware: time every MCP tool call per server and tool."""
+    started = time.perf_counter()
+    status = "error"
+    try:
+        result = await call(**kwargs)
+        status = "ok"
+        return result
+    finally:
+        elapsed = time.perf_counter() - started
+        TOOL_SECONDS.observe(elapsed, server=server, tool=tool.name, status=status)
+        record("tool", elapsed)
+
+
+class LLMTimer(BaseCallbackHandler):
+    """Callback handler timing every chat model round-trip."""
+
+    run_inline = True
+
+    def __init__(self, model: str):
+        self.model = model
+        self._started = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._finish(run_id, "ok")
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, "error")
+
+    def _finish(self, run_id, status: str):
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            elapsed = time.perf_counter() - started
+            LLM_SECONDS.observe(elapsed, model=self.model, status=status)
+            record("llm", elapsed)
+
+
+def render(gauges: dict) -> str:
+    """
+    Render all histograms plus numeric values of `gauges`
+    (`{component: {name: value}}`, e.g. the /stats payload) as Prometheus text.
+    """
+    lines = []
+    for histogram in REGISTRY:
+        lines.extend(histogram.render())
+    for component, values in gauges.items():
+        for name, value in _flatten(values or {}):
+            metric = f"{component}_{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {float(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def _flatten(values: dict, prefix: str = ""):
+    for name, value in values.items():
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{prefix}{name}_")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield f"{prefix}{name}", value
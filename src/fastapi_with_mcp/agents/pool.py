@@ -0,0 +1,318 @@
+# agents/pool.py
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+
+import anyio
+from langchain_mcp_adapters.client import (
+    DEFAULT_HTTP_TIMEOUT,
+    DEFAULT_SSE_READ_TIMEOUT,
+    MultiServerMCPClient,
+)
+from langchain_mcp_adapters.tools import load_mcp_tools
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.sse import sse_client
+from mcp.client.stdio import stdio_client
+
+from .metrics import MCP_CONNECT_SECONDS, POOL_WAIT_SECONDS, record, span
+
+logger = logging.getLogger(__name__)
+
+# 서버 프로세스가 죽었거나 연결이 끊겼을 때 나는 오류 (도구 자체의 오류와 구분)
+TRANSPORT_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    ConnectionError,
+)
+
+
+class MCPSession:
+    """
+    One warm MultiServerMCPClient: its server subprocesses, initialized
+    sessions and loaded tools.
+
+    The client is entered and exited by a dedicated task, because the stdio
+    transport opens anyio task groups that must be closed by the task that
+    opened them (requests come and go on other tasks).
+    """
+
+    def __init__(self, connections: dict):
+        self.connections = connections
+        self.client = None
+        self.tools = []
+        self.tools_by_server = {}
+        self.uses = 0
+        self.broken = False
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._error = None
+        self._task = None
+
+    async def start(self, timeout: float):
+        """Spawn the servers and wait until handshake and list_tools are done."""
+        self._task = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            # _run은 연결이 끝나야 _closing을 보므로 기다리지 않고 바로 취소한다
+            self.broken = True
+            await self.close(grace=0)
+            raise
+        if self._error is not None:
+            raise self._error
+
+    async def _run(self):
+        try:
+            async with MultiServerMCPClient() as client:
+                for name, connection in self.connections.items():
+                    await self._connect(client, name, dict(connection))
+                self.client = client
+                self.tools = client.get_tools()
+                self.tools_by_server = dict(client.server_name_to_tools)
+                self._ready.set()
+                await self._closing.wait()
+        except Exception as e:
+            self._error = e
+            self.broken = True
+            logger.warning("MCP session failed: %r", e)
+        finally:
+            self._ready.set()
+
+    async def _connect(self, client: MultiServerMCPClient, name: str, connection: dict):
+        """Same steps as MultiServerMCPClient.connect_to_server, timed one by one."""
+        transport = connection.pop("transport")
+        with span(MCP_CONNECT_SECONDS, server=name, step="spawn"):
+            if transport == "sse":
+                read, write = await client.exit_stack.enter_async_context(
+                    sse_client(
+                        connection["url"],
+                        connection.get("headers"),
+                        connection.get("timeout", DEFAULT_HTTP_TIMEOUT),
+                        connection.get("sse_read_timeout", DEFAULT_SSE_READ_TIMEOUT),
+                    )
+                )
+            else:
+                read, write = await client.exit_stack.enter_async_context(
+                    stdio_client(StdioServerParameters(**connection))
+                )
+        session = await client.exit_stack.enter_async_context(ClientSession(read, write))
+        with span(MCP_CONNECT_SECONDS, server=name, step="initialize"):
+            await session.initialize()
+        with span(MCP_CONNECT_SECONDS, server=name, step="list_tools"):
+            tools = await load_mcp_tools(session)
+        client.sessions[name] = session
+        client.server_name_to_tools[name] = tools
+
+    async def guard(self, server, tool, call, kwargs):
+        """
+        Tool middleware: mark the session broken when a call fails at the
+        transport level. ToolNode turns the error into a ToolMessage, so the
+        request itself succeeds and `checkout` would otherwise not notice.
+        """
+        try:
+            return await call(**kwargs)
+        except TRANSPORT_ERRORS:
+            logger.warning("MCP server %r is unreachable, recycling its session", server)
+            self.broken = True
+            raise
+
+    async def ping(self, timeout: float) -> bool:
+        """Return True if every server still answers an MCP ping."""
+        if self.broken or self.client is None:
+            return False
+        try:
+            for session in self.client.sessions.values():
+                await asyncio.wait_for(session.send_ping(), timeout)
+        except Exception as e:
+            logger.warning("MCP session health check failed: %r", e)
+            self.broken = True
+            return False
+        return True
+
+    async def close(self, grace: float = 5.0):
+        """
+        Exit the client and its servers. If that takes longer than `grace`
+        seconds (a server that hangs while connecting or ignores its closed
+        stdin), the task is cancelled until it ends, which kills the server
+        processes.
+        """
+        self._closing.set()
+        if self._task is None:
+            return
+        done, _ = await asyncio.wait({self._task}, timeout=grace)
+        while not done:
+            # 취소가 프로세스 종료 대기에 닿으면 anyio가 프로세스를 죽인다
+            self._task.cancel()
+            done, _ = await asyncio.wait({self._task}, timeout=1.0)
+
+
+class MCPSessionPool:
+    """
+    Fixed-size pool of pre-initialized MCP sessions, created once per process.
+
+    Sessions are checked out exclusively per request. A session is recycled
+    (closed and replaced by a fresh one) after `max_uses` checkouts, when a
+    tool call fails at the transport level (`MCPSession.guard`), when a
+    request using it fails and it no longer answers a ping, or when the
+    periodic health check finds it dead.
+
+    Args:
+        connections (dict): MultiServerMCPClient connection config.
+        size (int, optional): Number of warm sessions. Defaults to 2.
+        max_uses (int, optional): Checkouts before a session is recycled. Defaults to 100.
+        health_interval (float, optional): Seconds between idle health checks. Defaults to 30.
+        start_timeout (float, optional): Seconds allowed to spawn one session. Defaults to 30.
+        ping_timeout (float, optional): Seconds allowed for a health-check ping. Defaults to 5.
+        ping_on_checkout (bool, optional): Ping a session before lending it, so a server
+            that died while the session was idle is replaced before a request uses it
+            (about 1 ms per stdio server). Defaults to True.
+    """
+
+    def __init__(
+        self,
+        connections: dict,
+        size: int = 2,
+        max_uses: int = 100,
+        health_interval: float = 30.0,
+        start_timeout: float = 30.0,
+        ping_timeout: float = 5.0,
+        ping_on_checkout: bool = True,
+    ):
+        self.connections = connections
+        self.size = size
+        self.max_uses = max_uses
+        self.health_interval = health_interval
+        self.start_timeout = start_timeout
+        self.ping_timeout = ping_timeout
+        self.ping_on_checkout = ping_on_checkout
+
+        self._idle = asyncio.Queue()
+        self._background = set()
+        self._health_task = None
+        self._closed = False
+
+        self.in_use = 0
+        self.checkouts = 0
+        self.recycled = 0
+        self.start_failures = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    async def start(self):
+        sessions = await asyncio.gather(
+            *(self._spawn() for _ in range(self.size))
+        )
+        for session in sessions:
+            self._idle.put_nowait(session)
+        self._health_task = asyncio.create_task(self._health_loop())
+
+    async def close(self):
+        self._closed = True
+        tasks = list(self._background)
+        if self._health_task is not None:
+            tasks.append(self._health_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        while not self._idle.empty():
+            await self._idle.get_nowait().close()
+
+    @asynccontextmanager
+    async def checkout(self):
+        """Borrow a session for the duration of the block."""
+        started = time.perf_counter()
+        session = await self._idle.get()
+        while self.ping_on_checkout:
+            try:
+                alive = await session.ping(self.ping_timeout)
+            except BaseException:
+                # ping 도중 취소되어도 세션을 잃지 않는다
+                self._idle.put_nowait(session)
+                raise
+            if alive:
+                break
+            self._in_background(self._replace(session))
+            session = await self._idle.get()
+        waited = time.perf_counter() - started
+        POOL_WAIT_SECONDS.observe(waited)
+        record("pool_wait", waited)
+
+        self.checkouts += 1
+        self.in_use += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+        failed = False
+        try:
+            yield session
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            # No awaits here: the request task may already be cancelled.
+            self.in_use -= 1
+            session.uses += 1
+            self._release(session, failed)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "in_use": self.in_use,
+            "checkouts": self.checkouts,
+            "recycled": self.recycled,
+            "start_failures": self.start_failures,
+            "wait_seconds_total": self.wait_seconds_total,
+            "wait_seconds_max": self.wait_seconds_max,
+            "wait_seconds_avg": (
+                self.wait_seconds_total / self.checkouts if self.checkouts else 0.0
+            ),
+        }
+
+    def _release(self, session: MCPSession, failed: bool):
+        if session.broken or session.uses >= self.max_uses:
+            self._in_background(self._replace(session))
+        elif failed:
+            self._in_background(self._check(session))
+        else:
+            self._idle.put_nowait(session)
+
+    def _in_background(self, coro):
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _spawn(self) -> MCPSession:
+        delay = 1.0
+        while True:
+            session = MCPSession(self.connections)
+            try:
+                await session.start(self.start_timeout)
+                return session
+            except Exception as e:
+                self.start_failures += 1
+                logger.error("Could not start MCP session: %r", e)
+                if self._closed:
+                    raise
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+    async def _check(self, session: MCPSession):
+        if await session.ping(self.ping_timeout):
+            self._idle.put_nowait(session)
+        else:
+            await self._replace(session)
+
+    async def _replace(self, session: MCPSession):
+        self.recycled += 1
+        await session.close()
+        self._idle.put_nowait(await self._spawn())
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self.health_interval)
+            for _ in range(self._idle.qsize()):
+                session = self._idle.get_nowait()
+                await self._check(session)
@@ -0,0 +1,88 @@
+# agents/tool_cache.py
+import json
+import time
+from collections import OrderedDict
+
+
+class ToolResultCache:
+    """
+    Client-side LRU cache of MCP tool results with per-tool TTLs.
+
+    Only tools listed in `ttls` are cached, so tools that are cheap (`add`,
+    `multiply`) or not idempotent are never cached unless someone opts them
+    in. Entries are keyed on server + tool name + canonicalized arguments and
+    the cache is bounded by the (approximate) size of the stored results.
+    Failed calls are never cached.
+
+    Use an instance as tool middleware (see `apply_middleware`).
+
+    Args:
+        ttls (dict): `{server: {tool: ttl_seconds}}` for the cacheable tools.
+        max_bytes (int, optional): Size cap of all cached results. Defaults to 8 MiB.
+    """
+
+    def __init__(self, ttls: dict, max_bytes: int = 8 * 1024 * 1024):
+        self.ttls = ttls
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self.bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+
+    @staticmethod
+    def key(server: str, tool: str, kwargs: dict) -> tuple:
+        args = json.dumps(kwargs, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return server, tool, args
+
+    async def __call__(self, server, tool, call, kwargs):
+        ttl = self.ttls.get(server, {}).get(tool.name)
+        if not ttl:
+            return await call(**kwargs)
+
+        key = self.key(server, tool.name, kwargs)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, size, result = entry
+            if expires > time.monotonic():
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return result
+            self.expired += 1
+            self._remove(key)
+
+        self.misses += 1
+        result = await call(**kwargs)
+        self._store(key, result, ttl)
+        return result
+
+    def _store(self, key: tuple, result, ttl: float):
+        size = len(str(result)) + len(key[2])
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl, size, result)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: tuple):
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expired": self.expired,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,34 @@
+# agents/tools.py
+from langchain_core.tools import StructuredTool
+
+
+def wrap_tool(tool: StructuredTool, middleware, server: str = None) -> StructuredTool:
+    """
+    Return a copy of an MCP tool whose calls go through a middleware.
+
+    Args:
+        tool (StructuredTool): A tool loaded by langchain-mcp-adapters.
+        middleware (callable): `async (server, tool, call, kwargs) -> result`,
+            where `await call(**kwargs)` performs the original MCP call.
+        server (str, optional): Name of the MCP server the tool came from.
+    """
+    call = tool.coroutine
+
+    async def coroutine(**kwargs):
+        return await middleware(server, tool, call, kwargs)
+
+    return tool.model_copy(update={"coroutine": coroutine})
+
+
+def apply_middleware(tools_by_server: dict, middleware=()) -> list:
+    """
+    Flatten `{server: [tools]}` into one tool list, running every call
+    through `middleware` (the first one is outermost).
+    """
+    tools = []
+    for server, server_tools in tools_by_server.items():
+        for tool in server_tools:
+            for layer in reversed(middleware):
+                tool = wrap_tool(tool, layer, server)
+            tools.append(tool)
+    return tools
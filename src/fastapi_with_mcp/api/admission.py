@@ -0,0 +1,162 @@
+# api/admission.py
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import HTTPException
+
+from agents.metrics import ADMISSION_WAIT_SECONDS, record
+
+
+class AdmissionController:
+    """
+    Bounded concurrency in front of the agent endpoints.
+
+    At most `max_in_flight` runs execute at once. Up to `max_queue` more
+    requests wait for a slot, each for at most `queue_timeout` seconds.
+    Requests that find the queue full are rejected at once with 429, and
+    requests that time out in the queue get 503, both with Retry-After.
+    A batch runs as many prompts at once as it holds slots: the one it was
+    admitted with plus the free ones `try_acquire` takes on top.
+
+    A request for a conversation thread first waits for the thread's lock
+    (`wait_turn`), so requests queued behind an earlier turn of their own
+    thread do not hold a slot meanwhile.
+
+    Args:
+        max_in_flight (int, optional): Concurrent agent runs. Defaults to 2.
+        max_queue (int, optional): Requests allowed to wait. Defaults to 32.
+        queue_timeout (float, optional): Seconds a request may wait. Defaults to 10.
+    """
+
+    def __init__(self, max_in_flight: int = 2, max_queue: int = 32, queue_timeout: float = 10.0):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._slots = asyncio.Semaphore(max_in_flight)
+
+        self.in_flight = 0
+        self.waiting = 0
+        self.waiting_turn = 0
+        self.admitted = 0
+        self.rejected_full = 0
+        self.rejected_timeout = 0
+        self.rejected_turn_timeout = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    async def acquire(self):
+        """Take a run slot or raise HTTPException (429 queue full, 503 timed out)."""
+        if self._slots.locked() and self.waiting >= self.max_queue:
+            self.rejected_full += 1
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests queued",
+                headers={"Retry-After": "1"},
+            )
+
+        started = time.perf_counter()
+        if self._slots.locked():
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected_timeout += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Timed out waiting for capacity",
+                    headers={"Retry-After": str(max(1, int(self.queue_timeout)))},
+                )
+            finally:
+                self.waiting -= 1
+        else:
+            # 빈 슬롯이 있으면 기다리지 않고 바로 가져간다
+            await self._slots.acquire()
+
+        waited = time.perf_counter() - started
+        ADMISSION_WAIT_SECONDS.observe(waited)
+        record("admission_wait", waited)
+        self.admitted += 1
+        self.in_flight += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    async def wait_turn(self, lock):
+        """Take `lock` (None: nothing to wait for) within `queue_timeout` seconds or raise 503."""
+        if lock is None:
+            return
+        self.waiting_turn += 1
+        try:
+            await asyncio.wait_for(lock.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected_turn_timeout += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Timed out waiting for the previous turn of the thread",
+                headers={"Retry-After": str(max(1, int(self.queue_timeout)))},
+            )
+        finally:
+            self.waiting_turn -= 1
+
+    async def enter(self, lock=None):
+        """`wait_turn(lock)`, then `acquire()`; the lock is released again if no slot is granted."""
+        await self.wait_turn(lock)
+        try:
+            await self.acquire()
+        except BaseException:
+            if lock is not None:
+                lock.release()
+            raise
+
+    async def try_acquire(self, count: int) -> int:
+        """
+        Take up to `count` more slots that are free right now, without
+        queuing or jumping ahead of queued requests; returns how many.
+        """
+        taken = 0
+        while taken < count and not self._slots.locked():
+            # 빈 슬롯이 있으면 acquire는 기다리지 않고 바로 돌아온다
+            await self._slots.acquire()
+            taken += 1
+        self.in_flight += taken
+        return taken
+
+    def release(self, count: int = 1):
+        self.in_flight -= count
+        for _ in range(count):
+            self._slots.release()
+
+    @asynccontextmanager
+    async def admit(self, lock=None):
+        await self.enter(lock)
+        try:
+            yield
+        finally:
+            self.release()
+            if lock is not None:
+                lock.release()
+
+    async def hold(self, stream, slots: int = 1, lock=None):
+        """Pass a response stream through, releasing its `slots` (and `lock`) when it ends."""
+        try:
+            async for chunk in stream:
+                yield chunk
+        finally:
+            self.release(slots)
+            if lock is not None:
+                lock.release()
+
+    def stats(self) -> dict:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "waiting_turn": self.waiting_turn,
+            "admitted": self.admitted,
+            "rejected_full": self.rejected_full,
+            "rejected_timeout": self.rejected_timeout,
+            "rejected_turn_timeout": self.rejected_turn_timeout,
+            "wait_seconds_total": self.wait_seconds_total,
+            "wait_seconds_max": self.wait_seconds_max,
+        }
@@ -0,0 +1,87 @@
+# api/batch.py
+import asyncio
+import json
+import time
+
+from fastapi import HTTPException
+
+from api.responses import dumps, project
+
+
+def parse_prompts(body: bytes, content_type: str) -> list:
+    """
+    Read prompts from a JSON body (`{"prompts": [...]}` or a bare list) or
+    from JSONL, one prompt per line as a string or `{"messages": ...}`.
+    """
+    try:
+        if "ndjson" in content_type or "jsonl" in content_type:
+            items = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            items = json.loads(body)
+            if isinstance(items, dict):
+                items = items["prompts"]
+        prompts = [item["messages"] if isinstance(item, dict) else item for item in items]
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid batch body: {e}")
+    if not all(isinstance(prompt, str) for prompt in prompts):
+        raise HTTPException(status_code=422, detail="Every prompt must be a string")
+    return prompts
+
+
+async def run_batch(graph, prompts: list, concurrency: int, mode: str = "final"):
+    """
+    Run every prompt on one agent (one pooled set of MCP sessions and one
+    model client) with at most `concurrency` runs at once.
+
+    Yields one NDJSON line per prompt in completion order, tagged with its
+    `index`. A failing prompt yields an `error` line and does not stop the
+    batch. The last line is a summary with the concurrency used and
+    throughput in prompts/sec.
+
+    Args:
+        graph: An async context manager yielding the agent, e.g. `make_graph(pool)`.
+        prompts (list): The user messages.
+        concurrency (int): Prompts run at the same time.
+        mode (str, optional): Response mode per item, see `project`. Defaults to "final".
+    """
+    started = time.perf_counter()
+    semaphore = asyncio.Semaphore(concurrency)
+    errors = 0
+
+    async with graph as agent:
+
+        async def run(index, prompt):
+            async with semaphore:
+                item_started = time.perf_counter()
+                try:
+                    result = await agent.ainvoke({"messages": prompt})
+                    item = {"index": index, **project(result, mode)}
+                except Exception as e:
+                    item = {"index": index, "error": repr(e)}
+                item["elapsed"] = time.perf_counter() - item_started
+                return item
+
+        tasks = [asyncio.create_task(run(i, prompt)) for i, prompt in enumerate(prompts)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                item = await next_done
+                errors += "error" in item
+                yield dumps(item) + b"\n"
+        finally:
+            # 클라이언트가 끊기면 남은 작업을 모두 취소
+            for task in tasks:
+                task.cancel()
+            # 취소된 실행이 세션을 돌려줄 때까지 기다린 뒤에 agent를 닫는다
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    elapsed = time.perf_counter() - started
+    yield dumps(
+        {
+            "type": "summary",
+            "items": len(prompts),
+            "errors": errors,
+            "concurrency": concurrency,
+            "elapsed": elapsed,
+            "prompts_per_sec": len(prompts) / elapsed if elapsed else 0.0,
+        }
+    ) + b"\n"
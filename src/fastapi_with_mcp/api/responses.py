@@ -0,0 +1,65 @@
+# api/responses.py
+import orjson
+from fastapi.responses import ORJSONResponse
+from langchain_core.messages import AIMessage, ToolMessage
+from pydantic import BaseModel
+
+from agents.metrics import SERIALIZE_SECONDS, span
+
+
+def _default(obj):
+    # LangChain 메시지 등 pydantic 객체를 dict로 바로 넘긴다
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class MessageJSONResponse(ORJSONResponse):
+    """
+    orjson response that encodes LangChain messages directly.
+
+    Return an instance of it from the endpoint: FastAPI then skips its own
+    jsonable_encoder pass over the whole graph state.
+    """
+
+    def render(self, content) -> bytes:
+        with span(SERIALIZE_SECONDS, "serialize"):
+            return dumps(content)
+
+
+def project(result: dict, mode: str) -> dict:
+    """
+    Project the final LangGraph state onto the response body for `mode`.
+
+    Args:
+        result (dict): The state returned by `agent.ainvoke`.
+        mode (str): "final", "final+tool_summary" or "full".
+    """
+    if mode == "full":
+        return {"response": result}
+
+    messages = result["messages"]
+    body = {"response": messages[-1].content if messages else ""}
+    if mode == "final":
+        return body
+
+    args = {}
+    for message in messages:
+        if isinstance(message, AIMessage):
+            for call in message.tool_calls:
+                args[call["id"]] = call["args"]
+    body["tool_calls"] = [
+        {
+            "name": message.name,
+            "args": args.get(message.tool_call_id),
+            "status": message.status,
+            "chars": len(str(message.content)),
+        }
+        for message in messages
+        if isinstance(message, ToolMessage)
+    ]
+    return body
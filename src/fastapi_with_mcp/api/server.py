@@ -1,18 +1,212 @@
 # api/server.py
-from fastapi import FastAPI
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Literal, Optional
+from fastapi import FastAPI, Header, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from agents.graph import make_graph
+from agents.graph import make_graph, make_model, MCP_SERVERS, TOOL_CACHE_TTLS
+from agents.pool import MCPSessionPool
+from agents.checkpoint import ThreadStore
+from agents.limits import UpstreamBudgets
+from agents.tool_cache import ToolResultCache
+from agents.llm_cache import SQLiteLLMCache
+from agents import metrics
+from api.admission import AdmissionController
+from api.batch import parse_prompts, run_batch
+from api.responses import MessageJSONResponse, project
+from api.streaming import MEDIA_TYPES, stream_agent
+from api.timing import RequestTimingMiddleware
 
-app = FastAPI()
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # MCP 서버 프로세스는 요청마다 띄우지 않고 프로세스 수명 동안 재사용
+    pool_size = int(os.environ.get("MCP_POOL_SIZE", "2"))
+    pool = MCPSessionPool(
+        MCP_SERVERS,
+        size=pool_size,
+        max_uses=int(os.environ.get("MCP_POOL_MAX_USES", "100")),
+        health_interval=float(os.environ.get("MCP_POOL_HEALTH_INTERVAL", "30")),
+        ping_on_checkout=os.environ.get("MCP_POOL_PING_ON_CHECKOUT", "1").lower() in ("1", "true", "yes"),
+    )
+    # 동시 실행 수와 대기열, 업스트림별 동시 호출 수 제한
+    admission = AdmissionController(
+        max_in_flight=int(os.environ.get("MAX_IN_FLIGHT", str(pool_size))),
+        max_queue=int(os.environ.get("MAX_QUEUE", "32")),
+        queue_timeout=float(os.environ.get("QUEUE_TIMEOUT", "10")),
+    )
+    budgets = UpstreamBudgets(
+        llm=int(os.environ.get("LLM_CONCURRENCY", "8")),
+        math=int(os.environ.get("MATH_CONCURRENCY", "16")),
+        naver_api=int(os.environ.get("NAVER_CONCURRENCY", "4")),
+    )
+    tool_cache = ToolResultCache(
+        TOOL_CACHE_TTLS,
+        max_bytes=int(os.environ.get("TOOL_CACHE_MAX_BYTES", str(8 * 1024 * 1024))),
+    )
+    app.state.pool = pool
+    app.state.admission = admission
+    app.state.budgets = budgets
+    app.state.tool_cache = tool_cache
+    # 캐시 적중이면 업스트림 예산을 쓰지 않도록 캐시를 바깥에 두고,
+    # 도구 실행 시간은 예산 대기를 뺀 순수 호출 시간만 잰다
+    app.state.tool_middleware = [tool_cache, budgets, metrics.timed_tool]
+    # LLM_CACHE_DB를 지정하면 같은 대화/도구/모델 설정의 응답을 재사용
+    llm_cache = None
+    if os.environ.get("LLM_CACHE_DB"):
+        llm_cache = SQLiteLLMCache(
+            os.environ["LLM_CACHE_DB"],
+            ttl=float(os.environ.get("LLM_CACHE_TTL", str(24 * 3600))),
+            max_entries=int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "10000")),
+        )
+    app.state.llm_cache = llm_cache
+    # 모든 요청이 하나의 ChatOpenAI 클라이언트를 공유
+    app.state.model = make_model(budgets, llm_cache)
+    try:
+        await pool.start()
+        # thread_id가 있는 대화는 SQLite 체크포인트로 이어간다
+        async with ThreadStore.open(
+            os.environ.get("CHECKPOINT_DB", "checkpoints.sqlite"),
+            max_messages=int(os.environ.get("THREAD_MAX_MESSAGES", "40")),
+            max_idle=float(os.environ.get("THREAD_MAX_IDLE", str(7 * 24 * 3600))),
+        ) as threads:
+            app.state.threads = threads
+            yield
+    finally:
+        await budgets.aclose()
+        await pool.close()
+        if llm_cache is not None:
+            llm_cache.close()
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(RequestTimingMiddleware)
 
 class MessageRequest(BaseModel):
     messages: str
+    mode: Literal["final", "final+tool_summary", "full"] = "full"
+    thread_id: Optional[str] = None
+
+def thread_args(request: MessageRequest):
+    """
+    Return (checkpointer, config, after, lock) for the request's conversation
+    thread; `lock` is taken before admission and held around the run and
+    `after`, so turns of one thread run one at a time.
+    """
+    if request.thread_id is None:
+        return None, None, None, None
+    threads = app.state.threads
+
+    async def compact(agent):
+        await threads.compact(agent, request.thread_id)
+
+    return threads.saver, threads.config(request.thread_id), compact, threads.lock(request.thread_id)
+
+def request_model(x_llm_cache: Optional[str]):
+    """The shared model, or a copy without the LLM cache for `X-LLM-Cache: bypass`."""
+    model = app.state.model
+    if x_llm_cache == "bypass" and app.state.llm_cache is not None:
+        return model.model_copy(update={"cache": False})
+    return model
+
+@app.post("/chat", response_class=MessageJSONResponse)
+async def chat(request: MessageRequest, x_llm_cache: Optional[str] = Header(None)):
+    checkpointer, config, after, lock = thread_args(request)
+    async with app.state.admission.admit(lock):
+        async with make_graph(
+            app.state.pool,
+            checkpointer,
+            model=request_model(x_llm_cache),
+            middleware=app.state.tool_middleware,
+        ) as agent:
+            result = await agent.ainvoke(
+                {"messages": request.messages}, config, checkpoint_during=False
+            )
+            if after is not None:
+                await after(agent)
+    return MessageJSONResponse(project(result, request.mode))
+
+@app.post("/chat/stream")
+async def chat_stream(
+    request: MessageRequest,
+    http_request: Request,
+    format: Literal["ndjson", "sse"] = "ndjson",
+    x_llm_cache: Optional[str] = Header(None),
+):
+    # 토큰, 도구 호출, 도구 결과를 생성되는 즉시 전송
+    checkpointer, config, after, lock = thread_args(request)
+    await app.state.admission.enter(lock)
+    stream = stream_agent(
+        make_graph(
+            app.state.pool,
+            checkpointer,
+            model=request_model(x_llm_cache),
+            middleware=app.state.tool_middleware,
+        ),
+        request.messages,
+        http_request,
+        format,
+        config=config,
+        after=after,
+    )
+    return StreamingResponse(
+        app.state.admission.hold(stream, lock=lock),
+        media_type=MEDIA_TYPES[format],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.post("/chat/batch")
+async def chat_batch(
+    http_request: Request,
+    concurrency: int = Query(4, ge=1, le=64),
+    mode: Literal["final", "final+tool_summary", "full"] = "final",
+):
+    # JSON {"prompts": [...]} 또는 JSONL 업로드를 받아 결과를 끝나는 순서대로 전송
+    prompts = parse_prompts(
+        await http_request.body(), http_request.headers.get("content-type", "")
+    )
+    await app.state.admission.acquire()
+    # 배치의 동시 실행도 하나하나 슬롯을 차지하도록, 지금 남은 슬롯만큼만 더 돌린다
+    slots = 1 + await app.state.admission.try_acquire(concurrency - 1)
+    stream = run_batch(
+        make_graph(
+            app.state.pool,
+            model=app.state.model,
+            middleware=app.state.tool_middleware,
+        ),
+        prompts,
+        slots,
+        mode,
+    )
+    return StreamingResponse(
+        app.state.admission.hold(stream, slots),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/stats")
+async def stats():
+    return collect_stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    # Prometheus text format: 단계별 히스토그램 + /stats 수치를 gauge로
+    return PlainTextResponse(
+        metrics.render(collect_stats()),
+        media_type="text/plain; version=0.0.4",
+    )
 
-@app.post("/chat")
-async def chat(request: MessageRequest):
-    async with make_graph() as agent:
-        result = await agent.ainvoke({"messages": request.messages})
-        return {"response": result}
+def collect_stats() -> dict:
+    return {
+        "pool": app.state.pool.stats(),
+        "admission": app.state.admission.stats(),
+        "budgets": app.state.budgets.stats(),
+        "tool_cache": app.state.tool_cache.stats(),
+        "llm_cache": app.state.llm_cache.stats() if app.state.llm_cache else None,
+    }
 
 # run by 'python -m api.server' at root(fastapi_with_mcp)
 if __name__ == "__main__":
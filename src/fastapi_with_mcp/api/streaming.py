@@ -0,0 +1,128 @@
+# api/streaming.py
+import asyncio
+import json
+import time
+
+from fastapi import Request
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+
+def encode_event(event: dict, format: str) -> str:
+    """Encode one event as an NDJSON line or an SSE frame."""
+    data = json.dumps(event, ensure_ascii=False, default=str)
+    if format == "sse":
+        return f"event: {event['type']}\ndata: {data}\n\n"
+    return data + "\n"
+
+
+async def agent_events(agent, messages, config=None, **kwargs):
+    """
+    Run the agent and translate LangGraph `astream_events` into small
+    client-facing events: `token`, `tool_start`, `tool_end` and a final `done`.
+    """
+    started = time.perf_counter()
+    first_token = None
+    tool_calls = 0
+
+    async for event in agent.astream_events(
+        {"messages": messages}, config, version="v2", **kwargs
+    ):
+        kind = event["event"]
+        if kind == "on_chat_model_stream":
+            content = event["data"]["chunk"].content
+            if content:
+                if first_token is None:
+                    first_token = time.perf_counter() - started
+                yield {"type": "token", "content": content}
+        elif kind == "on_tool_start":
+            tool_calls += 1
+            yield {
+                "type": "tool_start",
+                "name": event["name"],
+                "input": event["data"].get("input"),
+            }
+        elif kind == "on_tool_end":
+            output = event["data"].get("output")
+            yield {
+                "type": "tool_end",
+                "name": event["name"],
+                "output": getattr(output, "content", output),
+            }
+        elif kind == "on_chain_end" and not event["parent_ids"]:
+            messages = event["data"]["output"]["messages"]
+            yield {
+                "type": "done",
+                "response": messages[-1].content if messages else "",
+                "tool_calls": tool_calls,
+                "time_to_first_token": first_token,
+                "elapsed": time.perf_counter() - started,
+            }
+
+
+async def stream_agent(
+    graph,
+    messages: str,
+    request: Request,
+    format: str = "ndjson",
+    config: dict = None,
+    after=None,
+    max_buffer: int = 64,
+    poll_interval: float = 1.0,
+):
+    """
+    Stream agent events to an HTTP client.
+
+    The run happens in its own task and hands encoded events over a bounded
+    queue, so a slow client pauses the run instead of growing a buffer. The
+    run is cancelled (releasing its pooled MCP session) as soon as the client
+    disconnects, including while a tool or LLM call is still in flight, and
+    the stream only ends once the run has, so whatever the caller releases
+    after it (the thread's lock) is not released under a running turn.
+
+    Args:
+        graph: An async context manager yielding the agent, e.g. `make_graph(pool)`.
+        messages (str): The user message.
+        request (Request): The incoming request, used to detect disconnects.
+        format (str, optional): "ndjson" or "sse". Defaults to "ndjson".
+        config (dict, optional): Run config, e.g. the conversation thread. Defaults to None.
+        after (callable, optional): Coroutine function called with the agent after a successful run. Defaults to None.
+        max_buffer (int, optional): Events buffered ahead of the client. Defaults to 64.
+        poll_interval (float, optional): Seconds between disconnect checks while idle. Defaults to 1.0.
+    """
+    queue = asyncio.Queue(maxsize=max_buffer)
+    done = object()
+
+    async def produce():
+        try:
+            async with graph as agent:
+                async for event in agent_events(
+                    agent, messages, config, checkpoint_during=False
+                ):
+                    await queue.put(encode_event(event, format))
+                if after is not None:
+                    await after(agent)
+        except Exception as e:
+            await queue.put(encode_event({"type": "error", "error": repr(e)}, format))
+        await queue.put(done)
+
+    task = asyncio.create_task(produce())
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), poll_interval)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                if format == "sse":
+                    yield ": keep-alive\n\n"
+                continue
+            if item is done:
+                break
+            yield item
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,45 @@
+# api/timing.py
+import logging
+import time
+
+from agents.metrics import REQUEST_SECONDS, start_request
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTimingMiddleware:
+    """
+    ASGI middleware that collects the per-stage timings of a request
+    (admission wait, pool wait, LLM, tools, serialization) and logs the
+    breakdown once the response, including a streamed body, has been sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        timings = start_request()
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            path = scope["path"]
+            REQUEST_SECONDS.observe(elapsed, path=path, status=status)
+            if timings:
+                stages = " ".join(
+                    f"{stage}={seconds:.3f}s/{count}"
+                    for stage, (seconds, count) in sorted(timings.items())
+                )
+                logger.info("%s %s %s total=%.3fs %s", scope["method"], path, status, elapsed, stages)
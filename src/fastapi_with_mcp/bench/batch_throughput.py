@@ -0,0 +1,66 @@
+# bench/batch_throughput.py
+"""
+Throughput of /chat/batch against one-at-a-time /chat calls.
+
+Needs a running server ('python -m api.server').
+
+run by 'python -m bench.batch_throughput' at root(fastapi_with_mcp)
+"""
+import argparse
+import json
+import time
+
+import httpx
+
+PROMPTS = [
+    "what's (3 + 5) x 12?",
+    "what's 17 x 23?",
+    "what's (4 + 6) x 10?",
+    "what's 128 + 256?",
+]
+
+
+def sequential(url: str, prompts: list) -> float:
+    started = time.perf_counter()
+    with httpx.Client(timeout=None) as client:
+        for prompt in prompts:
+            client.post(f"{url}/chat", json={"messages": prompt, "mode": "final"}).raise_for_status()
+    return time.perf_counter() - started
+
+
+def batch(url: str, prompts: list, concurrency: int) -> tuple:
+    started = time.perf_counter()
+    errors = 0
+    with httpx.Client(timeout=None) as client:
+        with client.stream(
+            "POST",
+            f"{url}/chat/batch",
+            params={"concurrency": concurrency},
+            json={"prompts": prompts},
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line:
+                    errors += "error" in json.loads(line)
+    return time.perf_counter() - started, errors
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8008")
+    parser.add_argument("-n", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    prompts = [PROMPTS[i % len(PROMPTS)] for i in range(args.n)]
+    seconds = sequential(args.url, prompts)
+    print(f"/chat x{args.n}: {seconds:.2f}s, {args.n / seconds:.2f} prompts/sec")
+    seconds, errors = batch(args.url, prompts, args.concurrency)
+    print(
+        f"/chat/batch (concurrency={args.concurrency}): {seconds:.2f}s, "
+        f"{args.n / seconds:.2f} prompts/sec, {errors} errors"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+# bench/loadtest.py
+"""
+Offline end-to-end load test for api.server:app.
+
+Boots the Naver stand-in (bench/naver_stub.py) and the FastAPI server with
+the scripted fake chat model (CHAT_MODEL=fake), so no OpenAI or Naver
+credentials are needed, then drives /chat with a configurable request mix
+and concurrency. Reports latency percentiles, throughput, MCP subprocess
+count, RSS and CPU, and writes the results as JSON.
+
+run by 'python -m bench.loadtest -n 200 -c 8 --output bench_results.json'
+at root(fastapi_with_mcp)
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+import psutil
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 요청 종류별 프롬프트 (ScriptedChatModel이 도구 호출을 결정하는 문장)
+PROMPTS = {
+    "math": "what's (3 + 5)?",
+    "multiply": "what's 12 x 34?",
+    "blog": "네이버에서 'MCP' 블로그 글을 찾아줘",
+    "news": "'MCP' 관련 뉴스를 찾아줘",
+    "echo": "hello",
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def parse_mix(text: str) -> list:
+    """'math=2,blog=1' -> ['math', 'math', 'blog']"""
+    kinds = []
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in PROMPTS:
+            raise SystemExit(f"Unknown request kind {name!r}, choose from {sorted(PROMPTS)}")
+        kinds.extend([name] * int(weight or 1))
+    return kinds
+
+
+def percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+async def wait_ready(url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not become ready")
+
+
+class ProcessSampler:
+    """Samples RSS, CPU and child process count of the server process tree."""
+
+    def __init__(self, pid: int, interval: float = 0.5):
+        self.process = psutil.Process(pid)
+        self.interval = interval
+        self.samples = []
+        self._task = None
+
+    def _tree(self) -> list:
+        return [self.process, *self.process.children(recursive=True)]
+
+    async def _run(self):
+        for proc in self._tree():
+            proc.cpu_percent(None)
+        while True:
+            await asyncio.sleep(self.interval)
+            rss = cpu = 0.0
+            tree = self._tree()
+            for proc in tree:
+                try:
+                    rss += proc.memory_info().rss
+                    cpu += proc.cpu_percent(None)
+                except psutil.NoSuchProcess:
+                    pass
+            self.samples.append({"rss": rss, "cpu": cpu, "children": len(tree) - 1})
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> dict:
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        if not self.samples:
+            return {}
+        return {
+            "rss_mb_max": max(s["rss"] for s in self.samples) / 2**20,
+            "rss_mb_avg": statistics.fmean(s["rss"] for s in self.samples) / 2**20,
+            "cpu_percent_avg": statistics.fmean(s["cpu"] for s in self.samples),
+            "cpu_percent_max": max(s["cpu"] for s in self.samples),
+            "subprocesses_max": max(s["children"] for s in self.samples),
+        }
+
+
+async def drive(url: str, kinds: list, requests: int, concurrency: int, mode: str) -> dict:
+    latencies = []
+    by_kind = {kind: [] for kind in set(kinds)}
+    statuses = Counter()
+    next_index = 0
+
+    async with httpx.AsyncClient(timeout=None, limits=httpx.Limits(max_connections=concurrency)) as client:
+
+        async def worker():
+            nonlocal next_index
+            while next_index < requests:
+                kind = kinds[next_index % len(kinds)]
+                next_index += 1
+                started = time.perf_counter()
+                try:
+                    response = await client.post(
+                        f"{url}/chat", json={"messages": PROMPTS[kind], "mode": mode}
+                    )
+                    statuses[response.status_code] += 1
+                except httpx.TransportError as e:
+                    statuses[type(e).__name__] += 1
+                    continue
+                elapsed = time.perf_counter() - started
+                latencies.append(elapsed)
+                by_kind[kind].append(elapsed)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        wall = time.perf_counter() - started
+
+    def summary(values):
+        return {
+            "count": len(values),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "p99": percentile(values, 99),
+            "mean": statistics.fmean(values) if values else 0.0,
+        }
+
+    return {
+        "wall_seconds": wall,
+        "throughput_rps": requests / wall if wall else 0.0,
+        "statuses": {str(k): v for k, v in statuses.items()},
+        "latency": summary(latencies),
+        "latency_by_kind": {kind: summary(values) for kind, values in by_kind.items()},
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--requests", type=int, default=200)
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("--mix", default="math=2,multiply=1,blog=1,news=1,echo=1")
+    parser.add_argument("--mode", default="final", choices=["final", "final+tool_summary", "full"])
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--naver-latency", type=float, default=0.05)
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument(
+        "--env",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="extra environment for the server, e.g. --env MAX_QUEUE=64",
+    )
+    args = parser.parse_args()
+    kinds = parse_mix(args.mix)
+
+    stub_port, app_port = free_port(), free_port()
+    env = {
+        **os.environ,
+        "CHAT_MODEL": "fake",
+        "FAKE_LLM_LATENCY": str(args.llm_latency),
+        "NAVER_API_ENDPOINT": f"http://127.0.0.1:{stub_port}/v1",
+        "NAVER_CLIENT_ID": "bench",
+        "NAVER_CLIENT_SECRET": "bench",
+        # 대역 호출은 실제 일일 쿼터 파일에 세지 않는다
+        "NAVER_QUOTA_DB": "",
+        "MCP_POOL_SIZE": str(args.pool_size),
+        "MAX_QUEUE": str(max(args.concurrency * 2, 32)),
+        "QUEUE_TIMEOUT": "120",
+        "CHECKPOINT_DB": str(ROOT / "bench_checkpoints.sqlite"),
+        "LANGCHAIN_TRACING_V2": "false",
+        **dict(item.split("=", 1) for item in args.env),
+    }
+    stub = subprocess.Popen(
+        [sys.executable, "-m", "bench.naver_stub", "--port", str(stub_port), "--latency", str(args.naver_latency)],
+        cwd=ROOT,
+        env=env,
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.server:app", "--port", str(app_port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=env,
+    )
+    url = f"http://127.0.0.1:{app_port}"
+    try:
+        await wait_ready(f"http://127.0.0.1:{stub_port}/stats")
+        await wait_ready(f"{url}/stats")
+        if args.warmup:
+            await drive(url, kinds, args.warmup, min(args.concurrency, args.warmup), args.mode)
+
+        sampler = ProcessSampler(server.pid)
+        sampler.start()
+        result = await drive(url, kinds, args.requests, args.concurrency, args.mode)
+        result["process"] = await sampler.stop()
+
+        async with httpx.AsyncClient() as client:
+            result["server_stats"] = (await client.get(f"{url}/stats")).json()
+            result["naver_requests"] = (await client.get(f"http://127.0.0.1:{stub_port}/stats")).json()
+    finally:
+        for proc in (server, stub):
+            proc.terminate()
+        for proc in (server, stub):
+            proc.wait(timeout=30)
+
+    result["config"] = {**vars(args), "python": platform.python_version()}
+    result["timestamp"] = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    Path(args.output).write_text(json.dumps(result, indent=2, ensure_ascii=False))
+
+    latency = result["latency"]
+    print(
+        f"{args.requests} requests, concurrency {args.concurrency}: "
+        f"{result['throughput_rps']:.1f} req/s, "
+        f"p50 {latency['p50'] * 1000:.0f} ms, p95 {latency['p95'] * 1000:.0f} ms, "
+        f"p99 {latency['p99'] * 1000:.0f} ms, statuses {result['statuses']}"
+    )
+    print(
+        f"subprocesses {result['process'].get('subprocesses_max')}, "
+        f"RSS max {result['process'].get('rss_mb_max', 0):.0f} MB, "
+        f"CPU avg {result['process'].get('cpu_percent_avg', 0):.0f}%"
+    )
+    print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+# bench/naver_http_client.py
+"""
+Per-call latency of the Naver tools' HTTP layer: a new httpx client per call
+(what every tool used to do) against the shared keep-alive client
+(with_naver_api/naver_http.py, which servers/naver_api.py runs on).
+
+Boots bench/naver_stub.py on a free port. The stand-in is plain HTTP on
+localhost, so the gap shown here is only TCP connect and client setup;
+against openapi.naver.com each new client also pays a TLS handshake.
+
+run by 'python -m bench.naver_http_client -n 200' at root(fastapi_with_mcp)
+"""
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from bench.loadtest import ROOT, free_port, percentile, wait_ready
+
+sys.path.insert(0, str(ROOT.parent / "with_naver_api"))
+from naver_http import SharedClient  # noqa: E402
+
+
+async def per_call_client(url: str, params: dict) -> float:
+    started = time.perf_counter()
+    async with httpx.AsyncClient() as client:
+        (await client.get(url, params=params)).raise_for_status()
+    return time.perf_counter() - started
+
+
+async def shared_client(http: SharedClient, url: str, params: dict) -> float:
+    started = time.perf_counter()
+    (await http.get(url, params=params)).raise_for_status()
+    return time.perf_counter() - started
+
+
+def report(name: str, latencies: list):
+    print(
+        f"{name:<16} mean {statistics.fmean(latencies) * 1000:6.2f} ms  "
+        f"p50 {percentile(latencies, 50) * 1000:6.2f} ms  "
+        f"p95 {percentile(latencies, 95) * 1000:6.2f} ms  "
+        f"p99 {percentile(latencies, 99) * 1000:6.2f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--calls", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0, help="stand-in response latency")
+    args = parser.parse_args()
+
+    port = free_port()
+    stub = subprocess.Popen(
+        [sys.executable, "-m", "bench.naver_stub", "--port", str(port), "--latency", str(args.latency)],
+        cwd=ROOT,
+    )
+    url = f"http://127.0.0.1:{port}/v1/search/news.json"
+    params = {"query": "MCP", "display": 10, "start": 1, "sort": "sim"}
+    try:
+        await wait_ready(f"http://127.0.0.1:{port}/stats")
+
+        before = [await per_call_client(url, params) for _ in range(args.calls)]
+
+        http = SharedClient()
+        try:
+            after = [await shared_client(http, url, params) for _ in range(args.calls)]
+        finally:
+            await http.aclose()
+    finally:
+        stub.terminate()
+        stub.wait(timeout=30)
+
+    print(f"{args.calls} sequential calls, stand-in latency {args.latency * 1000:.0f} ms")
+    report("client per call", before)
+    report("shared client", after)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,18 @@
+# bench/naver_stub.py
+"""
+Runs the offline Naver stand-in shared with with_naver_api
+(../with_naver_api/bench/naver_stub.py): recorded fixtures for every search
+endpoint, latency distributions, 429/500 injection and request counters.
+All its options apply, see that file.
+
+Point the MCP server at it with NAVER_API_ENDPOINT=http://127.0.0.1:<port>/v1
+
+run by 'python -m bench.naver_stub --port 8900 --latency 0.05' at root(fastapi_with_mcp)
+"""
+import runpy
+from pathlib import Path
+
+STAND_IN = Path(__file__).resolve().parents[2] / "with_naver_api" / "bench" / "naver_stub.py"
+
+if __name__ == "__main__":
+    runpy.run_path(str(STAND_IN), run_name="__main__")
@@ -0,0 +1,127 @@
+# bench/pool_recovery.py
+"""
+Checks that the MCP session pool replaces a session whose server process
+died, instead of lending it out until the periodic health check.
+
+Runs agent turns in-process with the scripted fake model over a pool of
+one math_server session, kills the server process and checks:
+
+- idle death: with ping-on-checkout the very next turn gets a fresh
+  session and a correct answer;
+- death seen by a tool call (ping-on-checkout off): that turn gets the
+  transport error as a tool message, the session is marked broken and
+  recycled, and the following turn answers correctly;
+- a server that hangs before the MCP handshake: starting a session times
+  out on time and the hung process is killed, so startup and replacement
+  do not wait on it forever.
+
+Exits with status 1 if any check fails.
+
+run by 'python -m bench.pool_recovery' at root(fastapi_with_mcp)
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import psutil
+
+ROOT = Path(__file__).resolve().parent.parent
+PROMPT = "what's (3 + 5)?"
+EXPECTED = "Result: 8"
+
+
+def kill_math_server() -> int:
+    killed = 0
+    for child in psutil.Process().children(recursive=True):
+        if any("math_server.py" in part for part in child.cmdline()):
+            child.kill()
+            killed += 1
+    return killed
+
+
+async def turn(pool) -> str:
+    from agents.fake_model import ScriptedChatModel
+    from agents.graph import make_graph
+
+    async with make_graph(pool, model=ScriptedChatModel()) as agent:
+        result = await agent.ainvoke({"messages": PROMPT})
+    return str(result["messages"][-1].content)
+
+
+async def scenario(ping_on_checkout: bool) -> list:
+    from agents.pool import MCPSessionPool
+
+    failures = []
+    pool = MCPSessionPool(
+        {"math": {"command": sys.executable, "args": ["servers/math_server.py"], "transport": "stdio"}},
+        size=1,
+        health_interval=3600,
+        ping_on_checkout=ping_on_checkout,
+    )
+    await pool.start()
+    try:
+        if (answer := await turn(pool)) != EXPECTED:
+            failures.append(f"warm session answered {answer!r}")
+        if not kill_math_server():
+            failures.append("no math_server process to kill")
+        await asyncio.sleep(0.2)
+
+        if not ping_on_checkout:
+            # 죽은 세션을 받은 요청: 도구 오류로 끝나지만 세션은 broken으로 표시된다
+            answer = await turn(pool)
+            if "ClosedResourceError" not in answer:
+                failures.append(f"turn on the dead session answered {answer!r}")
+
+        answer = await asyncio.wait_for(turn(pool), 60)
+        if answer != EXPECTED:
+            failures.append(f"turn after the kill answered {answer!r}")
+        if pool.recycled != 1:
+            failures.append(f"recycled {pool.recycled} sessions, expected 1")
+    finally:
+        await pool.close()
+    return failures
+
+
+async def hung_start(timeout: float = 1.0) -> list:
+    from agents.pool import MCPSession
+
+    failures = []
+    session = MCPSession(
+        {"hung": {"command": sys.executable, "args": ["-c", "import time; time.sleep(60)"], "transport": "stdio"}}
+    )
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(session.start(timeout), timeout + 10)
+        failures.append("a session on a hung server started")
+    except asyncio.TimeoutError:
+        elapsed = time.perf_counter() - started
+        if elapsed > timeout + 5:
+            failures.append(f"start(timeout={timeout:g}) returned after {elapsed:.1f}s")
+    # 남아 있으면 세션이 멈춘 서버를 정리하지 못한 것
+    if any("time.sleep(60)" in " ".join(child.cmdline()) for child in psutil.Process().children(recursive=True)):
+        failures.append("the hung server process is still running")
+    return failures
+
+
+async def main():
+    sys.path.insert(0, str(ROOT))
+    failed = False
+    failures = await hung_start()
+    failed |= bool(failures)
+    print(f"{'hung server start':18s} {'FAIL' if failures else 'ok'}")
+    for failure in failures:
+        print(f"  - {failure}")
+    for ping_on_checkout in (True, False):
+        name = "ping on checkout" if ping_on_checkout else "tool call guard"
+        failures = await scenario(ping_on_checkout)
+        failed |= bool(failures)
+        print(f"{name:18s} {'FAIL' if failures else 'ok'}")
+        for failure in failures:
+            print(f"  - {failure}")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
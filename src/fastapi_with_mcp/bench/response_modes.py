@@ -0,0 +1,103 @@
+# bench/response_modes.py
+"""
+Payload size and serialization time of the /chat response modes.
+
+Compares FastAPI's default path (jsonable_encoder + json.dumps) with
+MessageJSONResponse on a synthetic agent state shaped like a real Naver
+search turn.
+
+run by 'python -m bench.response_modes' at root(fastapi_with_mcp)
+"""
+import argparse
+import json
+import time
+
+from fastapi.encoders import jsonable_encoder
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from api.responses import MessageJSONResponse, project
+
+MODES = ["final", "final+tool_summary", "full"]
+
+
+def naver_blob(items: int) -> str:
+    return json.dumps(
+        {
+            "lastBuildDate": "Fri, 18 Oct 2026 12:00:00 +0900",
+            "total": 123456,
+            "start": 1,
+            "display": items,
+            "items": [
+                {
+                    "title": f"<b>MCP</b> 활용기 {i}",
+                    "link": f"https://blog.naver.com/example/{i}",
+                    "description": "Model Context Protocol <b>MCP</b> 서버를 " * 8,
+                    "bloggername": f"blogger{i}",
+                    "bloggerlink": f"blog.naver.com/blogger{i}",
+                    "postdate": "20261018",
+                }
+                for i in range(items)
+            ],
+        },
+        ensure_ascii=False,
+    )
+
+
+def make_state(turns: int, items: int) -> dict:
+    messages = [HumanMessage(content="네이버에서 MCP 블로그 글을 찾아 요약해줘")]
+    for turn in range(turns):
+        call_id = f"call_{turn}"
+        messages.append(
+            AIMessage(
+                content="",
+                tool_calls=[
+                    {"name": "search_blog", "args": {"query": "MCP", "start": turn * items + 1}, "id": call_id}
+                ],
+            )
+        )
+        messages.append(
+            ToolMessage(content=naver_blob(items), name="search_blog", tool_call_id=call_id)
+        )
+    messages.append(AIMessage(content="MCP 관련 블로그 글 요약입니다. " * 10))
+    return {"messages": messages}
+
+
+def default_render(content) -> bytes:
+    # FastAPI의 기본 JSONResponse 경로
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def orjson_render(content) -> bytes:
+    return MessageJSONResponse(content).body
+
+
+def timed(render, content, repeat: int):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        body = render(content)
+    return len(body), (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    state = make_state(args.turns, args.items)
+    print(f"{'mode':<20}{'serializer':<12}{'bytes':>10}{'ms':>10}")
+    for mode in MODES:
+        for name, render in (("default", default_render), ("orjson", orjson_render)):
+            size, seconds = timed(render, project(state, mode), args.repeat)
+            print(f"{mode:<20}{name:<12}{size:>10}{seconds * 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
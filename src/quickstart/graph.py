@@ -4,9 +4,12 @@ from langchain_mcp_adapters.client import MultiServerMCPClient
 from langgraph.prebuilt import create_react_agent
 from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
+from tool_cache import ToolResultCache
 
 load_dotenv()
 model = ChatOpenAI(model="gpt-4o")
+# 같은 인자의 get_weather 호출은 10분간 재사용, math 도구는 캐시하지 않음
+tool_cache = ToolResultCache({"weather": {"get_weather": 600}})
 
 @asynccontextmanager
 async def make_graph():
@@ -21,5 +24,6 @@ async def make_graph():
             "transport": "sse",
         }
     }) as client:
-        agent = create_react_agent(model, client.get_tools())
+        tools = tool_cache.wrap_tools(client.server_name_to_tools)
+        agent = create_react_agent(model, tools)
         yield agent
@@ -0,0 +1,80 @@
+# tool_cache.py
+# fastapi_with_mcp/agents/tool_cache.py의 ToolResultCache를 quickstart에 필요한 만큼만 줄인 것
+# (그쪽은 도구 미들웨어로 쓰이고, 여기서는 MultiServerMCPClient의 도구를 직접 감싼다)
+import json
+import time
+from collections import OrderedDict
+
+
+class ToolResultCache:
+    """
+    LRU cache of MCP tool results with per-tool TTLs, bounded by the
+    (approximate) size of the stored results. Only the tools listed in
+    `ttls` are cached, keyed on server + tool name + arguments; failed calls
+    are never cached.
+
+    Args:
+        ttls (dict): `{server: {tool: ttl_seconds}}` for the cacheable tools.
+        max_bytes (int, optional): Size cap of all cached results. Defaults to 8 MiB.
+    """
+
+    def __init__(self, ttls: dict, max_bytes: int = 8 * 1024 * 1024):
+        self.ttls = ttls
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def wrap_tools(self, tools_by_server: dict) -> list:
+        """Flatten `client.server_name_to_tools`, routing the cacheable tools through the cache."""
+        tools = []
+        for server, server_tools in tools_by_server.items():
+            for tool in server_tools:
+                ttl = self.ttls.get(server, {}).get(tool.name)
+                tools.append(self._wrap(server, tool, ttl) if ttl else tool)
+        return tools
+
+    def _wrap(self, server, tool, ttl):
+        call = tool.coroutine
+
+        async def coroutine(**kwargs):
+            key = (server, tool.name, json.dumps(kwargs, sort_keys=True, ensure_ascii=False))
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[2]
+            self.misses += 1
+            result = await call(**kwargs)
+            self._store(key, result, ttl)
+            return result
+
+        return tool.model_copy(update={"coroutine": coroutine})
+
+    def _store(self, key: tuple, result, ttl: float):
+        size = len(str(result)) + len(key[2])
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        self._entries[key] = (time.monotonic() + ttl, size, result)
+        self.bytes += size
+        # 가장 오래 쓰이지 않은 결과부터 버린다
+        while self.bytes > self.max_bytes:
+            _, (_, evicted, _) = self._entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
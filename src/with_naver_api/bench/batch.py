@@ -0,0 +1,96 @@
+# bench/batch.py
+"""
+Items per second for adult_check / fix_spelling over a document's worth of
+short strings: one tool call per string (what the content pipeline did)
+against one `<tool>_batch` call.
+
+Runs the server in-process against the offline stand-in; each run uses its
+own strings so the response cache does not carry over. `--unique` of the
+`--items` strings are distinct, the rest repeat, as headings and names do
+in a document. The rate limiter is set to `--rate` calls/s.
+
+run by 'python -m bench.batch --items 300 --unique 200 --latency 0.05' at root(with_naver_api)
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+from bench.concurrency import ROOT, free_port, wait_ready
+
+
+def strings(prefix: str, items: int, unique: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    distinct = [f"{prefix} 문장 {n} 몇일 됬다" for n in range(unique)]
+    return distinct + rng.choices(distinct, k=items - unique)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tool", choices=("fix_spelling", "adult_check"), default="fix_spelling")
+    parser.add_argument("--items", type=int, default=300)
+    parser.add_argument("--unique", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=100.0, help="rate limiter calls/s")
+    args = parser.parse_args()
+
+    port = free_port()
+    os.environ.update(
+        NAVER_API_ENDPOINT=f"http://127.0.0.1:{port}/v1",
+        NAVER_CLIENT_ID="bench",
+        NAVER_CLIENT_SECRET="bench",
+        NAVER_QUOTA_DB="",
+        NAVER_RATE=str(args.rate),
+        NAVER_BURST=str(int(args.rate)),
+    )
+    sys.path.insert(0, str(ROOT))
+    from naver_endpoints import ENDPOINTS
+    from naver_server import NaverService, make_batch_tool, make_tool
+
+    service = NaverService.from_env()
+    single = make_tool(service, ENDPOINTS[args.tool])
+    batch = make_batch_tool(service, ENDPOINTS[args.tool])
+
+    stub = subprocess.Popen(
+        [sys.executable, "-m", "bench.naver_stub", "--port", str(port), "--latency", str(args.latency)],
+        cwd=ROOT,
+    )
+    stats_url = f"http://127.0.0.1:{port}/stats/detail"
+    try:
+        await wait_ready(stats_url)
+
+        queries = strings("per-item", args.items, args.unique)
+        started = time.perf_counter()
+        for query in queries:
+            await single(query)
+        per_item = time.perf_counter() - started
+        upstream_before = (await service.http.get(stats_url)).json()["total"]
+
+        queries = strings("batch", args.items, args.unique)
+        started = time.perf_counter()
+        result = json.loads(await batch(queries, args.concurrency))
+        batched = time.perf_counter() - started
+        upstream = (await service.http.get(stats_url)).json()["total"] - upstream_before
+    finally:
+        await service.http.aclose()
+        stub.terminate()
+        stub.wait(timeout=30)
+
+    print(
+        f"{args.tool}: {args.items} strings ({args.unique} distinct), "
+        f"{args.latency * 1000:.0f} ms upstream, limiter {args.rate:.0f}/s"
+    )
+    print(f"one call per item  {per_item:6.2f}s  {args.items / per_item:7.1f} items/s  {upstream_before} upstream")
+    print(
+        f"batch (x{args.concurrency})        {batched:6.2f}s  {args.items / batched:7.1f} items/s  "
+        f"{upstream} upstream  {result['errors']} errors  {per_item / batched:.1f}x faster"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
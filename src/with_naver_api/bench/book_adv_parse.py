@@ -0,0 +1,97 @@
+# bench/book_adv_parse.py
+"""
+Parse time and peak memory of the get_book_adv response paths on the
+book_adv.xml fixture (100 items, display=100), optionally scaled up by
+repeating its items:
+
+- xmltodict: decode the whole body, xmltodict.parse into a dict tree,
+  json.dumps the tree (the previous path, still used for format="raw")
+- iterparse: feed the body in network-sized chunks to naver_xml.BookAdvParser
+  and json.dumps the compact records (the default path)
+
+run by 'python -m bench.book_adv_parse --copies 10' at root(with_naver_api)
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from pathlib import Path
+
+import xmltodict
+
+from naver_xml import BookAdvParser
+
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "book_adv.xml"
+
+
+def load(copies: int) -> bytes:
+    text = FIXTURE.read_text(encoding="utf-8")
+    head, _, rest = text.partition("<item>")
+    items, _, tail = ("<item>" + rest).rpartition("</item>")
+    return (head + (items + "</item>\n") * copies + tail).encode("utf-8")
+
+
+def with_xmltodict(body: bytes, chunk_size: int):
+    return xmltodict.parse(body.decode("utf-8"))
+
+
+def with_iterparse(body: bytes, chunk_size: int):
+    parser = BookAdvParser()
+    for i in range(0, len(body), chunk_size):
+        parser.feed(body[i : i + chunk_size])
+    return parser.close()
+
+
+def measure(parse, body: bytes, chunk_size: int, repeat: int) -> dict:
+    """Best-of-`repeat` time and traced peak memory, for parsing and for parsing + json.dumps."""
+    parse_times, total_times = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parsed = parse(body, chunk_size)
+        parsed_at = time.perf_counter()
+        json.dumps(parsed, ensure_ascii=False)
+        parse_times.append(parsed_at - started)
+        total_times.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    parsed = parse(body, chunk_size)
+    parse_peak = tracemalloc.get_traced_memory()[1]
+    output = json.dumps(parsed, ensure_ascii=False)
+    total_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "parse": min(parse_times),
+        "total": min(total_times),
+        "parse_peak": parse_peak,
+        "total_peak": total_peak,
+        "output": len(output.encode("utf-8")),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--copies", type=int, default=1, help="repeat the fixture's items")
+    parser.add_argument("--chunk-size", type=int, default=65536)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    body = load(args.copies)
+    items = body.count(b"<item>")
+    print(f"{items} items, {len(body) / 1024:.0f} KiB body, {args.chunk_size // 1024} KiB chunks")
+    print(f"{'':<10} {'parse':>9} {'+dumps':>9} {'parse peak':>11} {'total peak':>11} {'output':>8}")
+    results = {}
+    for name, parse in (("xmltodict", with_xmltodict), ("iterparse", with_iterparse)):
+        r = results[name] = measure(parse, body, args.chunk_size, args.repeat)
+        print(
+            f"{name:<10} {r['parse'] * 1000:7.2f}ms {r['total'] * 1000:7.2f}ms "
+            f"{r['parse_peak'] / 2**20:8.2f}MiB {r['total_peak'] / 2**20:8.2f}MiB "
+            f"{r['output'] / 1024:5.0f}KiB"
+        )
+    old, new = results["xmltodict"], results["iterparse"]
+    print(
+        f"iterparse: {old['total'] / new['total']:.1f}x faster end to end, "
+        f"{old['parse_peak'] / new['parse_peak']:.1f}x less peak memory while parsing"
+    )
+
+if __name__ == "__main__":
+    main()
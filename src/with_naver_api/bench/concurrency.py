@@ -0,0 +1,137 @@
+# bench/concurrency.py
+"""
+Checks that the SSE Naver server does not serialize tool calls.
+
+Starts a stand-in upstream that answers after `--latency` seconds and
+naver_api.py on the SSE transport, then has N separate SSE clients call a
+tool at the same time. With non-blocking tools all N calls finish in about
+one upstream latency; a blocking tool would take about N latencies, because
+each call holds the server's event loop for the whole upstream round-trip.
+
+Measures the calls from the moment every client is connected to the last
+answer, and exits with status 1 when that takes more than `--max-ratio`
+upstream latencies.
+
+run by 'python -m bench.concurrency -n 20 --latency 0.5' at root(with_naver_api)
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 모든 도구가 골고루 호출되도록 순서대로 돌아가며 사용
+CALLS = [
+    ("search_news", {"query": "MCP"}),
+    ("search_book", {"query": "MCP"}),
+    ("get_book_adv", {"query": "MCP", "d_titl": "MCP"}),
+    ("search_kin", {"query": "MCP"}),
+    ("search_shop", {"query": "MCP"}),
+    ("search_encyc", {"query": "MCP"}),
+    ("search_blog", {"query": "MCP"}),
+    ("search_local", {"query": "MCP"}),
+]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_ready(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url, timeout=1.0)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not become ready")
+
+
+async def call(url: str, name: str, arguments: dict, ready: asyncio.Barrier) -> tuple:
+    async with sse_client(url) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            # 연결이 모두 준비된 다음 동시에 호출
+            await ready.wait()
+            started = time.perf_counter()
+            result = await session.call_tool(name, arguments)
+            if result.isError:
+                raise RuntimeError(f"{name}: {result.content}")
+            return started, time.perf_counter()
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--clients", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--max-ratio", type=float, default=2.5, help="allowed call time in upstream latencies")
+    args = parser.parse_args()
+
+    stub_port, mcp_port = free_port(), free_port()
+    env = {
+        **os.environ,
+        "NAVER_API_ENDPOINT": f"http://127.0.0.1:{stub_port}/v1",
+        "NAVER_CLIENT_ID": "bench",
+        "NAVER_CLIENT_SECRET": "bench",
+        "NAVER_QUOTA_DB": "",
+        "NAVER_CACHE_DB": "",
+        "FASTMCP_PORT": str(mcp_port),
+        "FASTMCP_HOST": "127.0.0.1",
+    }
+    stub = subprocess.Popen(
+        [sys.executable, "-m", "bench.naver_stub", "--port", str(stub_port), "--latency", str(args.latency)],
+        cwd=ROOT,
+        env=env,
+    )
+    server = subprocess.Popen(
+        [sys.executable, "naver_api.py"], cwd=ROOT, env=env, stdout=subprocess.DEVNULL
+    )
+    try:
+        await wait_ready(f"http://127.0.0.1:{stub_port}/stats")
+        await wait_ready(f"http://127.0.0.1:{mcp_port}/messages/")
+
+        ready = asyncio.Barrier(args.clients)
+        url = f"http://127.0.0.1:{mcp_port}/sse"
+        started = time.perf_counter()
+        spans = await asyncio.gather(
+            *(call(url, *CALLS[i % len(CALLS)], ready) for i in range(args.clients))
+        )
+        wall = time.perf_counter() - started
+    finally:
+        for proc in (server, stub):
+            proc.terminate()
+        for proc in (server, stub):
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                # uvicorn waits for open SSE streams on shutdown
+                proc.kill()
+
+    # 모든 클라이언트가 호출을 시작한 때부터 마지막 응답까지
+    calls = max(end for _, end in spans) - min(start for start, _ in spans)
+    print(
+        f"{args.clients} concurrent tool calls, upstream latency {args.latency:.2f}s: "
+        f"calls took {calls:.2f}s ({calls / args.latency:.1f}x upstream latency), "
+        f"wall {wall:.2f}s including connects"
+    )
+    print(f"a serialized server would need about {args.clients * args.latency:.2f}s")
+    if calls > args.max_ratio * args.latency:
+        print(f"FAIL: calls took more than {args.max_ratio:g}x the upstream latency")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,142 @@
+# bench/fetched_index.py
+"""
+Cost of the local full-text index of fetched items (naver_index.py): how
+fast pages of results are added, and how long search_fetched's query takes
+once the index is full, against one upstream search round-trip.
+
+Fills a temporary SQLite file with `--items` items built from the recorded
+fixtures (every vertical, distinct links), 100 per page as search_many
+adds them, then times `--searches` queries mixing common and rare words.
+
+Before that, checks the delivered tool end to end: builds the MCP server
+with an index, calls search_news against the offline stand-in and then
+search_fetched for the query's word, which must return the fetched news
+items. Exits with status 1 if the check fails.
+
+run by 'python -m bench.fetched_index --items 50000' at root(with_naver_api)
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bench.concurrency import ROOT, free_port, wait_ready
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+WORDS = ("MCP", "서버", "설정", "쿠버네티스", "11번가", "튜닝 방법", "파이썬 입문", "없는단어")
+
+
+def pages(items: int, page_size: int = 100):
+    """(vertical, items) pages cycling through the fixtures with distinct links."""
+    fixtures = {f.stem: json.loads(f.read_text(encoding="utf-8"))["items"] for f in FIXTURES.glob("*.json")}
+    verticals = sorted(fixtures)
+    made = 0
+    while made < items:
+        vertical = verticals[(made // page_size) % len(verticals)]
+        page = []
+        for n in range(made, min(made + page_size, items)):
+            item = dict(fixtures[vertical][n % len(fixtures[vertical])])
+            item["link"] = f"{item.get('link', '')}#{n}"
+            page.append(item)
+        made += len(page)
+        yield vertical, page
+
+
+async def tool_check(tmp: str) -> list:
+    """Failures of search_news -> search_fetched through the MCP server's tools."""
+    port = free_port()
+    os.environ.update(
+        NAVER_API_ENDPOINT=f"http://127.0.0.1:{port}/v1",
+        NAVER_CLIENT_ID="bench",
+        NAVER_CLIENT_SECRET="bench",
+        NAVER_QUOTA_DB="",
+        NAVER_CACHE_DB="",
+        NAVER_INDEX_DB=str(Path(tmp) / "tool.sqlite"),
+    )
+    from naver_server import NaverService, build_server
+
+    service = NaverService.from_env()
+    mcp = build_server(service)
+    stub = subprocess.Popen(
+        [sys.executable, "-m", "bench.naver_stub", "--port", str(port), "--latency", "0", "--synthetic"],
+        cwd=ROOT,
+    )
+    failures = []
+    try:
+        await wait_ready(f"http://127.0.0.1:{port}/stats")
+        names = {tool.name for tool in await mcp.list_tools()}
+        if "search_fetched" not in names:
+            return ["search_fetched is not registered with NAVER_INDEX_DB set"]
+
+        async def fetched(word: str) -> dict:
+            content = await mcp.call_tool("search_fetched", {"query": word, "format": "raw"})
+            return json.loads(content[0].text)
+
+        # 가져오기 전에는 없고, search_news 뒤에는 그 결과가 색인에서 나와야 한다
+        if (before := await fetched("색인점검"))["total"]:
+            failures.append(f"search_fetched found {before['total']} items before any fetch")
+        await mcp.call_tool("search_news", {"query": "색인점검", "display": 20})
+        after = await fetched("색인점검")
+        if not after["total"] or {item["vertical"] for item in after["items"]} != {"news"}:
+            failures.append(f"search_fetched after search_news returned {after}")
+        service.index.close()
+    finally:
+        await service.http.aclose()
+        await service.links.http.aclose()
+        stub.terminate()
+        stub.wait(timeout=30)
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=50000)
+    parser.add_argument("--searches", type=int, default=400)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT))
+    from naver_index import FetchedIndex
+
+    with tempfile.TemporaryDirectory() as tmp:
+        failures = asyncio.run(tool_check(tmp))
+        print(f"search_fetched tool after search_news: {'FAIL' if failures else 'ok'}")
+        for failure in failures:
+            print(f"  - {failure}")
+        if failures:
+            raise SystemExit(1)
+
+        index = FetchedIndex(str(Path(tmp) / "index.sqlite"), max_items=args.items)
+
+        started = time.perf_counter()
+        for vertical, page in pages(args.items):
+            index.add(vertical, "bench", page)
+        filled = time.perf_counter() - started
+
+        latencies = []
+        for n in range(args.searches):
+            started = time.perf_counter()
+            index.search(WORDS[n % len(WORDS)], limit=10)
+            latencies.append(time.perf_counter() - started)
+        stats = index.stats()
+        index.close()
+
+    cuts = statistics.quantiles(latencies, n=100)
+    print(
+        f"index of {stats['items']} items, {stats['bytes'] / 2**20:.1f} MiB: "
+        f"filled in {filled:.2f}s ({args.items / filled:,.0f} items/s, "
+        f"{filled / (args.items / 100) * 1000:.2f} ms per 100-item page)"
+    )
+    print(
+        f"search_fetched query  p50 {cuts[49] * 1000:.2f} ms  p95 {cuts[94] * 1000:.2f} ms  "
+        f"p99 {cuts[98] * 1000:.2f} ms  (no upstream call, no quota)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# bench/link_check.py
+"""
+Wall time to check `--links` result links with check_links against what an
+agent could do with a plain client: one GET per link, one after another,
+following redirects with httpx's default 5s timeout.
+
+Runs the link stand-in (bench/link_stub.py) on `--hosts` ports plus one
+port that never answers and one nobody listens on. The links mix pages
+that answer at once, slow pages, redirects, HEAD-refusing pages, 404s,
+a redirect loop and links to the two dead hosts. check_links is timed
+cold and then again on the same links, answered from its cache.
+
+Then checks that one busy host does not starve the others: with
+concurrency 8 and 2 probes per host, 16 slow links on one host must not
+delay a link on another host, which should come back at once. Exits with
+status 1 if it waits for the slow ones.
+
+run by 'python -m bench.link_check --links 60 --hosts 4 --slow 1' at root(with_naver_api)
+"""
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+
+import httpx
+
+from bench.concurrency import ROOT, free_port, wait_ready
+
+# (경로, 비율): 대부분은 바로 응답하는 페이지
+PATHS = (
+    ("/ok", 0.45),
+    ("/slow", 0.1),
+    ("/redirect/2", 0.15),
+    ("/nohead", 0.1),
+    ("/missing", 0.06),
+    ("/loop", 0.02),
+    ("dead", 0.06),
+    ("blackhole", 0.06),
+)
+
+
+def links(count: int, hosts: list, dead: int, hole: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    paths, weights = zip(*PATHS)
+    urls = []
+    for n, path in enumerate(rng.choices(paths, weights, k=count)):
+        if path == "dead":
+            urls.append(f"http://127.0.0.1:{dead}/post/{n}")
+        elif path == "blackhole":
+            urls.append(f"http://127.0.0.1:{hole}/post/{n}")
+        else:
+            urls.append(f"http://127.0.0.1:{rng.choice(hosts)}{path}?n={n}")
+    return urls
+
+
+async def naive(urls: list) -> list:
+    ok = []
+    async with httpx.AsyncClient(follow_redirects=True) as client:
+        for url in urls:
+            try:
+                response = await client.get(url)
+                ok.append(response.is_success)
+            except httpx.HTTPError:
+                ok.append(False)
+    return ok
+
+
+async def busy_host(slow_port: int, fast_port: int) -> float:
+    """Seconds a fast host's link takes while 16 slow links to another host are checked."""
+    from naver_links import LinkChecker
+
+    checker = LinkChecker(concurrency=8, per_host=2, allow_private=True)
+    try:
+        slow_links = asyncio.gather(
+            *(checker.check(f"http://127.0.0.1:{slow_port}/slow?busy={n}") for n in range(16))
+        )
+        await asyncio.sleep(0.05)
+        started = time.perf_counter()
+        await checker.check(f"http://127.0.0.1:{fast_port}/ok?busy=fast")
+        elapsed = time.perf_counter() - started
+        await slow_links
+    finally:
+        await checker.http.aclose()
+    return elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--links", type=int, default=60)
+    parser.add_argument("--hosts", type=int, default=4)
+    parser.add_argument("--slow", type=float, default=1.0, help="seconds the slow pages take")
+    parser.add_argument("--skip-naive", action="store_true")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT))
+    from naver_links import LinkChecker
+
+    hosts = [free_port() for _ in range(args.hosts)]
+    dead, hole = free_port(), free_port()
+    command = [sys.executable, "-m", "bench.link_stub", "--slow", str(args.slow), "--blackhole", str(hole)]
+    for port in hosts:
+        command += ["--port", str(port)]
+    stub = subprocess.Popen(command, cwd=ROOT)
+
+    # 스탠드인은 루프백 주소에 있으므로 사설 주소 차단을 끈다
+    checker = LinkChecker(allow_private=True)
+    urls = links(args.links, hosts, dead, hole)
+    try:
+        for port in hosts:
+            await wait_ready(f"http://127.0.0.1:{port}/stats")
+
+        if not args.skip_naive:
+            started = time.perf_counter()
+            naive_ok = await naive(urls)
+            naive_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        results = await checker.check_many(urls)
+        cold = time.perf_counter() - started
+
+        started = time.perf_counter()
+        await checker.check_many(urls)
+        warm = time.perf_counter() - started
+
+        fast = await busy_host(hosts[0], hosts[-1]) if len(hosts) > 1 else None
+    finally:
+        await checker.http.aclose()
+        stub.terminate()
+        stub.wait(timeout=30)
+
+    outcomes = Counter(
+        str(result["status"]) if result["ok"] else result.get("error") or str(result["status"])
+        for result in results
+    )
+    print(f"{args.links} links on {args.hosts} hosts + 2 dead, slow pages {args.slow:.1f}s")
+    print(f"outcomes: {dict(sorted(outcomes.items()))}")
+    if not args.skip_naive:
+        agree = sum(ok == result["ok"] for ok, result in zip(naive_ok, results))
+        print(
+            f"sequential GET  {naive_time:6.2f}s  {args.links / naive_time:7.1f} links/s  "
+            f"{sum(naive_ok)} reachable"
+        )
+    print(
+        f"check_links     {cold:6.2f}s  {args.links / cold:7.1f} links/s  "
+        f"{sum(result['ok'] for result in results)} reachable"
+        + (f"  {naive_time / cold:.1f}x faster, {agree}/{args.links} agree" if not args.skip_naive else "")
+    )
+    print(f"check_links (cached) {warm * 1000:6.2f} ms")
+    print(f"checker {json.dumps(checker.stats())}")
+    if fast is not None:
+        # 바쁜 호스트의 느린 링크를 기다렸다면 slow 초 가까이 걸린다
+        starved = fast > args.slow / 2
+        print(f"link to an idle host next to 16 slow links on a busy one: {fast * 1000:.0f} ms")
+        if starved:
+            print("FAIL: it waited for the busy host's links")
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+# bench/link_stub.py
+"""
+Local stand-in for the web hosts that search result links point at, for
+benchmarking check_links without touching the network.
+
+The same app listens on every `--port` given (each port is a separate host
+to the link checker):
+
+- /ok answers 200, /missing 404 and /redirect/<n> redirects n times to /ok
+  (/loop redirects to itself forever);
+- /slow answers 200 after `--slow` seconds;
+- /nohead refuses HEAD with 405 and answers GET (206 with a Range).
+
+`--blackhole` ports accept connections and never answer, so only a read
+timeout ends a request; a port nobody listens on is a dead host.
+
+run by 'python -m bench.link_stub --port 8950 --port 8951 --blackhole 8960' at root(with_naver_api)
+"""
+import argparse
+import asyncio
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import RedirectResponse
+
+app = FastAPI()
+app.state.slow = 1.0
+app.state.requests = 0
+
+PAGE = b"<html><body>" + b"link stand-in " * 500 + b"</body></html>"
+
+
+def page(request: Request) -> Response:
+    if request.method == "HEAD":
+        return Response(headers={"Content-Length": str(len(PAGE))}, media_type="text/html")
+    if request.headers.get("range"):
+        return Response(
+            PAGE[:1],
+            status_code=206,
+            headers={"Content-Range": f"bytes 0-0/{len(PAGE)}"},
+            media_type="text/html",
+        )
+    return Response(PAGE, media_type="text/html")
+
+
+@app.middleware("http")
+async def count(request: Request, call_next):
+    app.state.requests += 1
+    return await call_next(request)
+
+
+@app.api_route("/ok", methods=["GET", "HEAD"])
+async def ok(request: Request):
+    return page(request)
+
+
+@app.api_route("/slow", methods=["GET", "HEAD"])
+async def slow(request: Request):
+    await asyncio.sleep(app.state.slow)
+    return page(request)
+
+
+@app.api_route("/nohead", methods=["GET", "HEAD"])
+async def nohead(request: Request):
+    if request.method == "HEAD":
+        return Response(status_code=405, headers={"Allow": "GET"})
+    return page(request)
+
+
+@app.api_route("/missing", methods=["GET", "HEAD"])
+async def missing():
+    return Response(status_code=404)
+
+
+@app.api_route("/redirect/{n}", methods=["GET", "HEAD"])
+async def redirect(n: int):
+    return RedirectResponse(f"/redirect/{n - 1}" if n > 1 else "/ok", status_code=302)
+
+
+@app.api_route("/loop", methods=["GET", "HEAD"])
+async def loop():
+    return RedirectResponse("/loop", status_code=302)
+
+
+@app.get("/stats")
+async def stats():
+    return {"requests": app.state.requests}
+
+
+async def blackhole(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    # 연결은 받고 응답은 하지 않는다 (클라이언트가 끊을 때까지 읽기만)
+    while await reader.read(4096):
+        pass
+    writer.close()
+
+
+async def serve(ports: list, blackholes: list):
+    import uvicorn
+
+    servers = [
+        uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+        for port in ports
+    ]
+    holes = [await asyncio.start_server(blackhole, "127.0.0.1", hole) for hole in blackholes]
+    try:
+        await asyncio.gather(*(server.serve() for server in servers))
+    finally:
+        for hole in holes:
+            hole.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, action="append", default=[], help="host port (repeat for more hosts)")
+    parser.add_argument("--slow", type=float, default=1.0, help="seconds /slow takes to answer")
+    parser.add_argument("--blackhole", type=int, action="append", default=[], help="port that never answers")
+    args = parser.parse_args()
+    app.state.slow = args.slow
+    asyncio.run(serve(args.port or [8950], args.blackhole))
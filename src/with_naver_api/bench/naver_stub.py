@@ -0,0 +1,390 @@
+# bench/naver_stub.py
+"""
+Offline stand-in for the openapi.naver.com search endpoints the Naver tools
+use, for load tests and benchmarks that must not spend real quota.
+
+- blog, news, book, encyc, cafearticle, kin, local, webkr, image, shop, doc
+  and book_adv.xml serve the recorded fixtures in bench/fixtures, paged by
+  display/start (items past the fixture repeat with distinct links);
+  --synthetic generates items that echo the query instead.
+- adult and errata answer from small built-in word lists.
+- Each response waits for a latency drawn from --latency-dist
+  (fixed, uniform, exponential or lognormal around --latency, spread by
+  --jitter), with per-vertical means from --vertical-latency.
+- --error-rate and --throttle-rate inject 500 and 429 answers,
+  --rate-limit answers 429 above that many calls per second, like the real
+  API, and --require-auth answers 401 without client headers.
+- GET /stats counts requests per vertical, GET /stats/detail adds status
+  codes, injected failures and latency; POST /reset clears the counters and
+  POST /config changes settings of a running stand-in.
+
+Point either MCP server at it with NAVER_API_ENDPOINT=http://127.0.0.1:<port>/v1
+(NAVER_CLIENT_ID and NAVER_CLIENT_SECRET can be any value).
+
+run by 'python -m bench.naver_stub --port 8900 --latency 0.2 --latency-dist lognormal --throttle-rate 0.05' at root(with_naver_api)
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter, deque
+from pathlib import Path
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+from fastapi import FastAPI, Request, Response
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+VERTICALS = (
+    "blog", "news", "book", "book_adv", "adult", "encyc", "cafearticle",
+    "kin", "local", "errata", "webkr", "image", "shop", "doc",
+)
+DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+# 실제 API의 요청 제한: display 최대 100, start 최대 1000
+MAX_DISPLAY = 100
+MAX_START = 1000
+
+ADULT_WORDS = ("성인", "야동", "adult", "porn")
+# errata가 고쳐 주는 흔한 맞춤법 오류
+SPELLING = {"됬": "됐", "몇일": "며칠", "어떻해": "어떡해", "않되": "안 되", "웬지": "왠지", "금새": "금세"}
+
+
+def parse_overrides(text: str) -> dict:
+    """'book_adv=0.5,shop=0.2' -> {'book_adv': 0.5, 'shop': 0.2}"""
+    overrides = {}
+    for part in filter(None, text.split(",")):
+        name, _, value = part.partition("=")
+        overrides[name.strip()] = float(value)
+    return overrides
+
+
+class Config:
+    """
+    Behaviour of the stand-in; every field can be changed at runtime
+    through POST /config.
+
+    Args:
+        latency (float, optional): Mean (median for lognormal) response latency in seconds. Defaults to 0.05.
+        latency_dist (str, optional): One of DISTRIBUTIONS. Defaults to "fixed".
+        jitter (float, optional): Spread: relative half-width for uniform, sigma for lognormal. Defaults to 0.5.
+        vertical_latency (dict, optional): Latency per vertical, overriding `latency`. Defaults to {}.
+        error_rate (float, optional): Share of requests answered 500. Defaults to 0.
+        throttle_rate (float, optional): Share of requests answered 429. Defaults to 0.
+        rate_limit (float, optional): Calls per second before answering 429, 0 for no limit. Defaults to 0.
+        retry_after (int, optional): Retry-After seconds sent with 429, 0 for none. Defaults to 0.
+        require_auth (bool, optional): Answer 401 without X-Naver-Client-Id/Secret. Defaults to False.
+        synthetic (bool, optional): Generate items instead of serving fixtures. Defaults to False.
+        total (int, optional): `total` reported by searches. Defaults to each fixture's own.
+    """
+
+    FIELDS = (
+        "latency", "latency_dist", "jitter", "vertical_latency", "error_rate", "throttle_rate",
+        "rate_limit", "retry_after", "require_auth", "synthetic", "total",
+    )
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        latency_dist: str = "fixed",
+        jitter: float = 0.5,
+        vertical_latency: dict = None,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        rate_limit: float = 0.0,
+        retry_after: int = 0,
+        require_auth: bool = False,
+        synthetic: bool = False,
+        total: int = None,
+    ):
+        self.update(
+            latency=latency,
+            latency_dist=latency_dist,
+            jitter=jitter,
+            vertical_latency=vertical_latency or {},
+            error_rate=error_rate,
+            throttle_rate=throttle_rate,
+            rate_limit=rate_limit,
+            retry_after=retry_after,
+            require_auth=require_auth,
+            synthetic=synthetic,
+            total=total,
+        )
+
+    def update(self, **values):
+        unknown = set(values) - set(self.FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown settings {sorted(unknown)}")
+        if values.get("latency_dist", DISTRIBUTIONS[0]) not in DISTRIBUTIONS:
+            raise ValueError(f"latency_dist must be one of {DISTRIBUTIONS}")
+        for name, value in values.items():
+            setattr(self, name, value)
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def sample_latency(self, vertical: str) -> float:
+        mean = self.vertical_latency.get(vertical, self.latency)
+        if mean <= 0:
+            return 0.0
+        if self.latency_dist == "uniform":
+            return random.uniform(mean * max(1 - self.jitter, 0), mean * (1 + self.jitter))
+        if self.latency_dist == "exponential":
+            return random.expovariate(1 / mean)
+        if self.latency_dist == "lognormal":
+            return mean * random.lognormvariate(0, self.jitter)
+        return mean
+
+
+class Fixtures:
+    """Recorded responses per vertical, served page by page."""
+
+    def __init__(self, path: Path = FIXTURES):
+        self.json = {}
+        for file in path.glob("*.json"):
+            self.json[file.stem] = json.loads(file.read_text(encoding="utf-8"))
+
+        self.xml_channel, self.xml_items = {}, []
+        xml_path = path / "book_adv.xml"
+        if xml_path.exists():
+            channel = ElementTree.parse(xml_path).getroot().find("channel")
+            for child in channel:
+                if child.tag == "item":
+                    self.xml_items.append({field.tag: field.text or "" for field in child})
+                else:
+                    self.xml_channel[child.tag] = child.text or ""
+
+    @staticmethod
+    def page(items: list, start: int, display: int, total: int) -> list:
+        """Items start..start+display-1; past the fixture they repeat with a `p=` on the link."""
+        page = []
+        for n in range(start - 1, min(start - 1 + display, total)):
+            item = items[n % len(items)]
+            cycle = n // len(items)
+            if cycle:
+                item = dict(item)
+                for key in ("link", "originallink"):
+                    if item.get(key):
+                        item[key] += f"{'&' if '?' in item[key] else '?'}p={cycle}"
+            page.append(item)
+        return page
+
+
+def synthetic_items(vertical: str, query: str, start: int, count: int) -> list:
+    return [
+        {
+            "title": f"<b>{query}</b> {vertical} {start + i}",
+            "link": f"https://example.com/{vertical}/{start + i}",
+            "description": f"{query} 관련 {vertical} 결과 {start + i}",
+        }
+        for i in range(count)
+    ]
+
+
+def error(status: int, code: str, message: str, headers: dict = None) -> Response:
+    body = json.dumps({"errorMessage": message, "errorCode": code}, ensure_ascii=False)
+    return Response(body, status_code=status, media_type="application/json", headers=headers)
+
+
+app = FastAPI()
+app.state.config = Config()
+fixtures = Fixtures()
+
+requests = Counter()
+statuses = Counter()
+injected = Counter()
+latency_seconds = Counter()
+_recent = deque()  # rate_limit 계산용 최근 1초의 요청 시각
+
+
+def throttled(rate_limit: float) -> bool:
+    now = time.monotonic()
+    while _recent and now - _recent[0] >= 1.0:
+        _recent.popleft()
+    if len(_recent) >= rate_limit:
+        return True
+    _recent.append(now)
+    return False
+
+
+@app.get("/v1/search/{path:path}")
+async def search(
+    path: str,
+    request: Request,
+    query: str = None,
+    display: int = 10,
+    start: int = 1,
+    sort: str = "sim",
+    d_titl: str = None,
+    d_isbn: str = None,
+):
+    vertical = path.split(".")[0]
+    requests[vertical] += 1
+    # 상세 검색은 query 대신 d_titl/d_isbn만으로도 된다
+    if vertical == "book_adv":
+        query = query or d_titl or d_isbn
+    response = await answer(vertical, path, request, query, display, start)
+    statuses[str(response.status_code)] += 1
+    return response
+
+
+async def answer(vertical: str, path: str, request: Request, query: str, display: int, start: int) -> Response:
+    config = app.state.config
+    if vertical not in VERTICALS:
+        return error(404, "SE05", "Invalid search api (검색 API 대상에 오타가 없는지 확인해 보세요.)")
+    headers = request.headers
+    if config.require_auth and not (
+        headers.get("X-Naver-Client-Id") and headers.get("X-Naver-Client-Secret")
+    ):
+        return error(401, "024", "Authentication failed. (인증에 실패했습니다.)")
+    if not query:
+        return error(400, "SE01", "Incorrect query request (잘못된 쿼리요청입니다.)")
+    if not 1 <= display <= MAX_DISPLAY:
+        return error(400, "SE02", "Invalid display value (부적절한 display 값입니다.)")
+    if not 1 <= start <= MAX_START:
+        return error(400, "SE03", "Invalid start value (부적절한 start 값입니다.)")
+
+    retry_after = {"Retry-After": str(config.retry_after)} if config.retry_after else None
+    if config.rate_limit and throttled(config.rate_limit):
+        injected["rate_limit"] += 1
+        return error(429, "012", "Rate limit exceeded. (속도 제한을 초과했습니다.)", retry_after)
+
+    delay = config.sample_latency(vertical)
+    latency_seconds[vertical] += delay
+    await asyncio.sleep(delay)
+
+    roll = random.random()
+    if roll < config.error_rate:
+        injected["error"] += 1
+        return error(500, "SE99", "System Error (시스템 에러)")
+    if roll < config.error_rate + config.throttle_rate:
+        injected["throttle"] += 1
+        return error(429, "012", "Rate limit exceeded. (속도 제한을 초과했습니다.)", retry_after)
+
+    if vertical == "adult":
+        adult = any(word in query.lower() for word in ADULT_WORDS)
+        return Response(json.dumps({"adult": "1" if adult else "0"}), media_type="application/json")
+    if vertical == "errata":
+        corrected = query
+        for wrong, right in SPELLING.items():
+            corrected = corrected.replace(wrong, right)
+        body = json.dumps({"errata": corrected if corrected != query else ""}, ensure_ascii=False)
+        return Response(body, media_type="application/json")
+    if path.endswith(".xml"):
+        return Response(book_adv_xml(config, query, display, start), media_type="text/xml")
+    return Response(
+        json.dumps(search_json(config, vertical, query, display, start), ensure_ascii=False),
+        media_type="application/json",
+    )
+
+
+def search_json(config: Config, vertical: str, query: str, display: int, start: int) -> dict:
+    recorded = fixtures.json.get(vertical)
+    if config.synthetic or not recorded:
+        total = config.total or 1000
+        items = synthetic_items(vertical, query, start, max(min(display, total - start + 1), 0))
+        last_build = "Sat, 18 Oct 2026 12:00:00 +0900"
+    else:
+        total = config.total or int(recorded.get("total", 1000))
+        items = fixtures.page(recorded["items"], start, display, total)
+        last_build = recorded.get("lastBuildDate", "")
+    return {
+        "lastBuildDate": last_build,
+        "total": total,
+        "start": start,
+        "display": len(items),
+        "items": items,
+    }
+
+
+def book_adv_xml(config: Config, query: str, display: int, start: int) -> str:
+    if config.synthetic or not fixtures.xml_items:
+        total = config.total or 1000
+        items = [
+            {"title": f"{query} {n}", "isbn": str(9780000000000 + n)}
+            for n in range(start, min(start + display, total + 1))
+        ]
+        channel = {}
+    else:
+        total = config.total or int(fixtures.xml_channel.get("total", 1000))
+        items = fixtures.page(fixtures.xml_items, start, display, total)
+        channel = dict(fixtures.xml_channel)
+    channel.update(total=str(total), start=str(start), display=str(len(items)))
+
+    parts = ['<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>']
+    parts.extend(f"<{tag}>{escape(value)}</{tag}>" for tag, value in channel.items())
+    for item in items:
+        parts.append("<item>")
+        parts.extend(f"<{tag}>{escape(value)}</{tag}>" for tag, value in item.items())
+        parts.append("</item>")
+    parts.append("</channel></rss>")
+    return "".join(parts)
+
+
+@app.get("/stats")
+async def stats():
+    return dict(requests)
+
+
+@app.get("/stats/detail")
+async def stats_detail():
+    return {
+        "requests": dict(requests),
+        "total": sum(requests.values()),
+        "status": dict(statuses),
+        "injected": dict(injected),
+        "latency_seconds": dict(latency_seconds),
+        "config": app.state.config.to_dict(),
+    }
+
+
+@app.post("/reset")
+async def reset():
+    for counter in (requests, statuses, injected, latency_seconds):
+        counter.clear()
+    _recent.clear()
+    return {"reset": True}
+
+
+@app.post("/config")
+async def configure(request: Request):
+    try:
+        app.state.config.update(**(await request.json()))
+    except ValueError as e:
+        return error(400, "config", str(e))
+    return app.state.config.to_dict()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=float, default=0.05, help="mean response latency (s)")
+    parser.add_argument("--latency-dist", choices=DISTRIBUTIONS, default="fixed")
+    parser.add_argument("--jitter", type=float, default=0.5, help="uniform half-width ratio or lognormal sigma")
+    parser.add_argument("--vertical-latency", default="", help="per-vertical latency, e.g. 'book_adv=0.5,shop=0.2'")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of requests answered 429")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="calls/s before answering 429")
+    parser.add_argument("--retry-after", type=int, default=0, help="Retry-After seconds sent with 429")
+    parser.add_argument("--require-auth", action="store_true")
+    parser.add_argument("--synthetic", action="store_true", help="generate items instead of fixtures")
+    parser.add_argument("--total", type=int, default=None, help="total reported by searches")
+    args = parser.parse_args()
+    app.state.config = Config(
+        latency=args.latency,
+        latency_dist=args.latency_dist,
+        jitter=args.jitter,
+        vertical_latency=parse_overrides(args.vertical_latency),
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after,
+        require_auth=args.require_auth,
+        synthetic=args.synthetic,
+        total=args.total,
+    )
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
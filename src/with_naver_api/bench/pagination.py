@@ -0,0 +1,78 @@
+# bench/pagination.py
+"""
+Wall time to collect `--count` results from one vertical: search_many
+(concurrent pages through the rate limiter) against paging sequentially
+with one search call per page, as the agent did one LLM turn at a time
+(the LLM turns themselves are not included).
+
+Runs naver_api.py in-process against bench/naver_stub.py with the
+response cache's memory tier cleared between runs.
+
+run by 'python -m bench.pagination --count 500 --latency 0.3' at root(with_naver_api)
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+from bench.concurrency import ROOT, free_port, wait_ready
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--vertical", default="shop")
+    parser.add_argument("--count", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    port = free_port()
+    os.environ.update(
+        NAVER_API_ENDPOINT=f"http://127.0.0.1:{port}/v1",
+        NAVER_CLIENT_ID="bench",
+        NAVER_CLIENT_SECRET="bench",
+        NAVER_QUOTA_DB="",
+    )
+    sys.path.insert(0, str(ROOT))
+    import naver_api
+    import naver_server
+
+    stub = subprocess.Popen(
+        [sys.executable, "-m", "bench.naver_stub", "--port", str(port), "--latency", str(args.latency)],
+        cwd=ROOT,
+    )
+    try:
+        await wait_ready(f"http://127.0.0.1:{port}/stats")
+
+        started = time.perf_counter()
+        items, start = [], 1
+        while len(items) < args.count and start <= naver_server.MAX_START:
+            page = await naver_api.service.fetch(
+                args.vertical, query="sequential", display=naver_server.PAGE_SIZE, start=start
+            )
+            items.extend(page["items"])
+            start += naver_server.PAGE_SIZE
+        sequential = time.perf_counter() - started
+
+        started = time.perf_counter()
+        result = json.loads(
+            await naver_api.service.search_many(args.vertical, "concurrent", args.count, format="raw")
+        )
+        concurrent = time.perf_counter() - started
+    finally:
+        await naver_api.service.http.aclose()
+        stub.terminate()
+        stub.wait(timeout=30)
+
+    print(f"{args.count} {args.vertical} results, {args.latency * 1000:.0f} ms per page")
+    print(f"sequential paging  {sequential:.2f}s  ({len(items[:args.count])} items)")
+    print(
+        f"search_many        {concurrent:.2f}s  ({result['count']} items, "
+        f"{result['pages_fetched']} pages)  {sequential / concurrent:.1f}x faster"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+# bench/projection.py
+"""
+Token reduction of the projected tool output (naver_projection.project,
+the tools' default) against the raw API response, on the fixture corpus
+in bench/fixtures/ (one search response per vertical, shaped like real
+openapi.naver.com responses: <b> highlights, entities, tab-indented JSON).
+
+Also checks that nothing an answer is built from is lost: every item's
+title and link from the raw response must appear in the projected text.
+
+Tokens are counted with tiktoken's o200k_base (the GPT-4o encoding) when
+it can be loaded, otherwise roughly estimated from the character counts.
+
+run by 'python -m bench.projection --max-chars 200' at root(with_naver_api)
+"""
+import argparse
+import json
+from pathlib import Path
+
+from naver_projection import clean, project
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+def token_counter():
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("o200k_base")
+        return (lambda text: len(encoding.encode(text))), "o200k_base"
+    except Exception:
+        # 인코딩 파일을 받을 수 없는 환경: ASCII 4글자당 1토큰, 한글 등은 글자당 1토큰으로 어림
+        def estimate(text: str) -> int:
+            ascii_chars = sum(ch.isascii() for ch in text)
+            return max(1, ascii_chars // 4 + len(text) - ascii_chars)
+
+        return estimate, "estimate (ASCII/4 + non-ASCII chars)"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-chars", type=int, default=200)
+    parser.add_argument("--format", default="compact", choices=["compact", "json"])
+    args = parser.parse_args()
+
+    count, counter = token_counter()
+    print(f"tokens: {counter}, format {args.format}, max_chars {args.max_chars}")
+    print(f"{'vertical':<12} {'raw':>7} {'projected':>10} {'saved':>7}  answer fields kept")
+
+    raw_total = projected_total = 0
+    for path in sorted(FIXTURES.glob("*.json")):
+        raw = path.read_text(encoding="utf-8")
+        data = json.loads(raw)
+        projected = project(path.stem, data, max_chars=args.max_chars, format=args.format)
+
+        kept = all(
+            clean(item.get("title")) in projected and (item.get("link") or "") in projected
+            for item in data["items"]
+        )
+        raw_tokens, projected_tokens = count(raw), count(projected)
+        raw_total += raw_tokens
+        projected_total += projected_tokens
+        print(
+            f"{path.stem:<12} {raw_tokens:>7} {projected_tokens:>10} "
+            f"{1 - projected_tokens / raw_tokens:>6.0%}  {'yes' if kept else 'NO'}"
+        )
+
+    print(
+        f"{'total':<12} {raw_total:>7} {projected_total:>10} "
+        f"{1 - projected_total / raw_total:>6.0%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+# bench/shop_prices.py
+"""
+Cost of shop_price_stats' aggregation (naver_prices.py) on large synthetic
+search_shop result sets: the columnar NumPy version against the same
+statistics computed item by item in plain Python (dicts, sorted(),
+statistics.quantiles), at each of `--sizes` items. Both must agree.
+
+Synthetic items have lognormal prices, a Zipf spread over `--malls` malls,
+a category tree and an hprice on one item in five, like real results.
+
+With `--e2e` the tool is also called in-process against the offline
+stand-in for `--count` results, and the size of its answer is compared
+with the raw pages the model would otherwise have to read.
+
+run by 'python -m bench.shop_prices --sizes 1000 100000 1000000 --e2e' at root(with_naver_api)
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+from bench.concurrency import ROOT, free_port, wait_ready
+
+CATEGORIES = {
+    "디지털/가전": ("노트북", "모니터", "이어폰", "태블릿PC"),
+    "도서": ("컴퓨터/IT", "소설", "경제/경영"),
+    "생활/건강": ("주방용품", "욕실용품"),
+    "패션잡화": ("가방", "지갑", "시계"),
+}
+
+
+def synthetic_items(count: int, malls: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    names = [f"쇼핑몰{n}" for n in range(malls)]
+    weights = [1 / (n + 1) for n in range(malls)]
+    paths = [(top, sub) for top, subs in CATEGORIES.items() for sub in subs]
+    items = []
+    for mall, (category1, category2) in zip(rng.choices(names, weights, k=count), rng.choices(paths, k=count)):
+        lprice = round(rng.lognormvariate(10.5, 0.8), -1)
+        items.append(
+            {
+                "title": f"상품 {len(items)}",
+                "lprice": str(int(lprice)) if rng.random() > 0.01 else "",
+                "hprice": str(int(lprice * rng.uniform(1.1, 2))) if rng.random() < 0.2 else "",
+                "mallName": mall,
+                "category1": category1,
+                "category2": category2,
+                "category3": "",
+                "category4": "",
+            }
+        )
+    return items
+
+
+def python_stats(items: list, bins: int = 10, top: int = 10) -> dict:
+    """The same numbers with a loop over the items and lists: the baseline."""
+    from naver_projection import clean
+
+    lprices, hprices, by_mall, by_category = [], [], {}, {}
+    for item in items:
+        if item.get("hprice") and float(item["hprice"]) > 0:
+            hprices.append(float(item["hprice"]))
+        if not item.get("lprice") or float(item["lprice"]) <= 0:
+            continue
+        price = float(item["lprice"])
+        lprices.append(price)
+        by_mall.setdefault(clean(item.get("mallName")) or "?", []).append(price)
+        path = " > ".join(filter(None, (item.get("category1"), item.get("category2")))) or "?"
+        by_category.setdefault(path, []).append(price)
+
+    def summary(values: list) -> dict:
+        values = sorted(values)
+        cuts = statistics.quantiles(values, n=100, method="inclusive")
+        return {
+            "min": values[0],
+            **{f"p{p}": cuts[p - 1] for p in (10, 25, 50, 75, 90)},
+            "max": values[-1],
+            "mean": statistics.fmean(values),
+        }
+
+    def histogram(values: list) -> list:
+        cuts = statistics.quantiles(values, n=100, method="inclusive")
+        low, width = cuts[0], (cuts[98] - cuts[0]) / bins
+        counts = [0] * bins
+        for value in values:
+            counts[min(bins - 1, max(0, int((value - low) / width)))] += 1
+        return counts
+
+    def aggregate(groups: dict) -> list:
+        ranked = sorted(groups.items(), key=lambda entry: -len(entry[1]))[:top]
+        return [
+            {
+                "name": name,
+                "count": len(values),
+                "min": min(values),
+                "median": statistics.median(values),
+                "mean": statistics.fmean(values),
+                "max": max(values),
+            }
+            for name, values in ranked
+        ]
+
+    return {
+        "lprice": summary(lprices),
+        "hprice": summary(hprices),
+        "histogram": histogram(lprices),
+        "malls": aggregate(by_mall),
+        "categories": aggregate(by_category),
+    }
+
+
+def timed(function, *args, repeat: int = 3) -> tuple:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+async def end_to_end(count: int, latency: float):
+    port = free_port()
+    os.environ.update(
+        NAVER_API_ENDPOINT=f"http://127.0.0.1:{port}/v1",
+        NAVER_CLIENT_ID="bench",
+        NAVER_CLIENT_SECRET="bench",
+        NAVER_QUOTA_DB="",
+    )
+    from naver_server import NaverService
+
+    service = NaverService.from_env()
+    stub = subprocess.Popen(
+        [sys.executable, "-m", "bench.naver_stub", "--port", str(port), "--latency", str(latency)],
+        cwd=ROOT,
+    )
+    try:
+        await wait_ready(f"http://127.0.0.1:{port}/stats")
+        started = time.perf_counter()
+        answer = await service.shop_price_stats("MCP", count=count)
+        elapsed = time.perf_counter() - started
+        # 같은 결과를 원본 페이지로 읽는다면 (캐시에서 바로 나온다)
+        raw = await service.search_many("shop", "MCP", count, format="raw")
+    finally:
+        await service.http.aclose()
+        stub.terminate()
+        stub.wait(timeout=30)
+    pages = -(-count // 100)
+    print(
+        f"\nshop_price_stats over {count} results ({pages} pages, {latency * 1000:.0f} ms upstream): "
+        f"{elapsed:.2f}s, answer {len(answer):,} chars vs {len(raw):,} chars of raw pages"
+    )
+    print(answer)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--malls", type=int, default=500)
+    parser.add_argument("--e2e", action="store_true", help="also call the tool against the stand-in")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.1)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT))
+    from naver_prices import price_stats
+
+    for size in args.sizes:
+        items = synthetic_items(size, args.malls)
+        repeat = 3 if size <= 100000 else 1
+        python_time, expected = timed(python_stats, items, repeat=repeat)
+        numpy_time, stats = timed(price_stats, items, repeat=repeat)
+        agree = (
+            all(
+                stats[key][name] == round(expected[key][name])
+                for key in ("lprice", "hprice")
+                for name in ("min", "p10", "p50", "p90", "max")
+            )
+            and [b["count"] for b in stats["histogram"]] == expected["histogram"]
+            and all(
+                [(g["name"], g["count"], g["median"]) for g in stats[key]["top"]]
+                == [(g["name"], g["count"], round(g["median"])) for g in expected[key]]
+                for key in ("malls", "categories")
+            )
+        )
+        print(
+            f"{size:>9,} items  python {python_time * 1000:9.1f} ms  numpy {numpy_time * 1000:8.1f} ms  "
+            f"{python_time / numpy_time:4.1f}x  {'agree' if agree else 'DIFFER'}  "
+            f"({stats['malls']['total']} malls, {stats['categories']['total']} categories, "
+            f"json {len(json.dumps(stats, ensure_ascii=False)):,} chars)"
+        )
+
+    if args.e2e:
+        asyncio.run(end_to_end(args.count, args.latency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# bench/singleflight.py
+"""
+Single-flight checks for the Naver tools against a slow local stand-in.
+
+Calls one tool from N tasks at the same time and checks:
+
+- the N identical calls reach the upstream exactly once and all get the
+  same result;
+- the key is freed once the call is done: the next identical call goes
+  upstream again;
+- with half of the callers cancelled mid-flight the rest still get the
+  result, from one upstream request;
+- with every caller cancelled, a caller that comes right after starts a
+  new call and gets the result instead of the cancellation;
+- with an unreachable upstream every caller gets the error, from one
+  shared call.
+
+The response cache is turned off so every call that is not coalesced
+reaches the stand-in, and the daily quota is counted in memory (no quota
+or cache file is touched). Exits with status 1 if any check fails.
+
+run by 'python -m bench.singleflight -n 50 --latency 1.0' at root(with_naver_api)
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+from bench.concurrency import ROOT, free_port, wait_ready
+
+
+async def upstream_hits(service, stats_url: str) -> int:
+    return sum((await service.http.get(stats_url)).json().values())
+
+
+async def checks(service, search_news, stats_url: str, callers: int, latency: float) -> list:
+    failures = []
+
+    # 1. N개의 동일한 동시 호출 -> 업스트림 1회
+    before = await upstream_hits(service, stats_url)
+    started = time.perf_counter()
+    results = await asyncio.gather(*(search_news("single flight") for _ in range(callers)))
+    wall = time.perf_counter() - started
+    hits = await upstream_hits(service, stats_url) - before
+    print(f"{callers} identical calls: {hits} upstream request(s), {len(set(results))} distinct result(s), {wall:.2f}s")
+    if hits != 1:
+        failures.append(f"{callers} identical calls made {hits} upstream requests, expected 1")
+    if len(set(results)) != 1:
+        failures.append(f"{callers} identical calls got {len(set(results))} distinct results")
+
+    # 2. 끝난 호출의 키는 풀려서 다음 호출은 다시 업스트림으로 간다
+    in_flight = service.inflight.stats()["in_flight"]
+    before = await upstream_hits(service, stats_url)
+    await search_news("single flight")
+    hits = await upstream_hits(service, stats_url) - before
+    print(f"after the call: {in_flight} key(s) in flight, the next call made {hits} upstream request(s)")
+    if in_flight:
+        failures.append(f"{in_flight} key(s) still in flight after the calls returned")
+    if hits != 1:
+        failures.append(f"the call after the shared one made {hits} upstream requests, expected 1")
+
+    # 3. 절반이 중간에 취소돼도 나머지는 결과를 받는다
+    before = await upstream_hits(service, stats_url)
+    tasks = [asyncio.create_task(search_news("cancelled callers")) for _ in range(callers)]
+    await asyncio.sleep(latency / 4)
+    for task in tasks[::2]:
+        task.cancel()
+    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+    cancelled = sum(isinstance(o, asyncio.CancelledError) for o in outcomes)
+    succeeded = sum(isinstance(o, str) for o in outcomes)
+    hits = await upstream_hits(service, stats_url) - before
+    print(f"{cancelled} callers cancelled, {succeeded} still got the result, {hits} upstream request(s)")
+    if succeeded != callers - len(tasks[::2]):
+        failures.append(f"{succeeded} of {callers - len(tasks[::2])} remaining callers got the result")
+    if hits != 1:
+        failures.append(f"cancelled callers: {hits} upstream requests, expected 1")
+
+    # 4. 모두 취소된 직후에 온 호출자는 취소된 호출에 합류하지 않는다
+    tasks = [asyncio.create_task(search_news("abandoned")) for _ in range(callers)]
+    await asyncio.sleep(latency / 4)
+    for task in tasks:
+        task.cancel()
+    await asyncio.sleep(0)
+    try:
+        await search_news("abandoned")
+        print("caller after every caller was cancelled: got the result")
+    except asyncio.CancelledError:
+        print("caller after every caller was cancelled: CancelledError")
+        failures.append("a caller that came after every caller was cancelled got CancelledError")
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    # 5. 업스트림 오류는 모든 호출자에게 전달된다
+    calls_before = service.inflight.calls
+    service.transport.api_endpoint = f"http://127.0.0.1:{free_port()}/v1"
+    outcomes = await asyncio.gather(
+        *(search_news("unreachable") for _ in range(callers)),
+        return_exceptions=True,
+    )
+    errors = {type(o).__name__ for o in outcomes if isinstance(o, Exception)}
+    failed = sum(isinstance(o, Exception) for o in outcomes)
+    shared = service.inflight.calls - calls_before
+    print(f"unreachable upstream: {failed}/{callers} callers got {', '.join(sorted(errors))} from {shared} shared call(s)")
+    if failed != callers:
+        failures.append(f"only {failed} of {callers} callers got the upstream error")
+    if shared != 1:
+        failures.append(f"unreachable upstream: {shared} shared calls, expected 1")
+    if service.inflight.stats()["in_flight"]:
+        failures.append("the failed call's key is still in flight")
+    return failures
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--callers", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=1.0)
+    args = parser.parse_args()
+
+    port = free_port()
+    os.environ.update(
+        NAVER_API_ENDPOINT=f"http://127.0.0.1:{port}/v1",
+        NAVER_CLIENT_ID="bench",
+        NAVER_CLIENT_SECRET="bench",
+        NAVER_QUOTA_DB="",
+        NAVER_CACHE_DB="",
+        NAVER_INDEX_DB="",
+    )
+    sys.path.insert(0, str(ROOT))
+    from naver_endpoints import ENDPOINTS
+    from naver_server import NaverService, make_tool
+
+    service = NaverService.from_env()
+    # 캐시가 답하면 병합 여부를 알 수 없으므로 끈다
+    service.cache.ttls = {}
+    search_news = make_tool(service, ENDPOINTS["search_news"])
+
+    stub = subprocess.Popen(
+        [sys.executable, "-m", "bench.naver_stub", "--port", str(port), "--latency", str(args.latency)],
+        cwd=ROOT,
+    )
+    stats_url = f"http://127.0.0.1:{port}/stats"
+    try:
+        await wait_ready(stats_url)
+        failures = await checks(service, search_news, stats_url, args.callers, args.latency)
+    finally:
+        await service.http.aclose()
+        await service.links.http.aclose()
+        stub.terminate()
+        stub.wait(timeout=30)
+
+    print("FAIL" if failures else "ok")
+    for failure in failures:
+        print(f"  - {failure}")
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
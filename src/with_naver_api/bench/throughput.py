@@ -0,0 +1,119 @@
+# bench/throughput.py
+"""
+Throughput and cache effectiveness of the Naver tools against the offline
+stand-in (bench/naver_stub.py), with optional 429/500 injection.
+
+Replays `--calls` tool calls from `--concurrency` workers through the
+in-process server. Queries are drawn Zipf-like from `--queries` distinct
+strings over several verticals, so popular queries repeat the way agent
+traffic does. Reports calls/s and latency percentiles, upstream requests
+by status (the stand-in's counters), cache hit ratio and retries.
+
+The rate limiter is set to `--rate` calls/s (default far above the real
+API's 10/s) so the pipeline, not the limiter, is what gets measured.
+
+run by 'python -m bench.throughput --calls 2000 --concurrency 50 --throttle-rate 0.05' at root(with_naver_api)
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+from bench.concurrency import ROOT, free_port, wait_ready
+
+TOOLS = ("search_news", "search_blog", "search_book", "search_kin", "search_shop", "search_encyc")
+
+
+def workload(calls: int, queries: int, skew: float, seed: int = 0) -> list:
+    """(tool, query) pairs; the k-th most popular query has weight 1 / k**skew."""
+    rng = random.Random(seed)
+    weights = [1 / (rank**skew) for rank in range(1, queries + 1)]
+    picks = rng.choices(range(queries), weights, k=calls)
+    return [(TOOLS[n % len(TOOLS)], f"query {n}") for n in picks]
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=200, help="distinct queries")
+    parser.add_argument("--skew", type=float, default=1.0, help="Zipf exponent of query popularity")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--latency-dist", default="lognormal")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--rate", type=float, default=1000.0, help="rate limiter calls/s")
+    args = parser.parse_args()
+
+    port = free_port()
+    os.environ.update(
+        NAVER_API_ENDPOINT=f"http://127.0.0.1:{port}/v1",
+        NAVER_CLIENT_ID="bench",
+        NAVER_CLIENT_SECRET="bench",
+        NAVER_QUOTA_DB="",
+        NAVER_RATE=str(args.rate),
+        NAVER_BURST=str(int(args.rate)),
+        NAVER_DAILY_QUOTA=str(10**9),
+    )
+    sys.path.insert(0, str(ROOT))
+    from naver_endpoints import ENDPOINTS
+    from naver_server import NaverService, make_tool
+
+    service = NaverService.from_env()
+    service.retry.base = 0.05
+    tools = {name: make_tool(service, ENDPOINTS[name]) for name in TOOLS}
+    calls = workload(args.calls, args.queries, args.skew)
+
+    stub = subprocess.Popen(
+        [
+            sys.executable, "-m", "bench.naver_stub", "--port", str(port),
+            "--latency", str(args.latency), "--latency-dist", args.latency_dist,
+            "--error-rate", str(args.error_rate), "--throttle-rate", str(args.throttle_rate),
+        ],
+        cwd=ROOT,
+    )
+    latencies, errors = [], 0
+    try:
+        await wait_ready(f"http://127.0.0.1:{port}/stats")
+        queue = iter(calls)
+
+        async def worker():
+            nonlocal errors
+            for tool, query in queue:
+                started = time.perf_counter()
+                try:
+                    await tools[tool](query)
+                except Exception:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        wall = time.perf_counter() - started
+        upstream = (await service.http.get(f"http://127.0.0.1:{port}/stats/detail")).json()
+    finally:
+        await service.http.aclose()
+        stub.terminate()
+        stub.wait(timeout=30)
+
+    cache = service.cache.stats()
+    cuts = statistics.quantiles(latencies, n=100)
+    print(
+        f"{args.calls} calls over {args.queries} queries (skew {args.skew}), "
+        f"concurrency {args.concurrency}, upstream {args.latency * 1000:.0f} ms {args.latency_dist}"
+    )
+    print(f"throughput      {args.calls / wall:8.1f} calls/s  ({wall:.2f}s, {errors} errors)")
+    print(f"latency         p50 {cuts[49] * 1000:.1f} ms  p95 {cuts[94] * 1000:.1f} ms  p99 {cuts[98] * 1000:.1f} ms")
+    print(f"upstream        {upstream['total']} requests  status {upstream['status']}")
+    print(
+        f"cache           hit ratio {cache['hit_ratio']:.1%}  "
+        f"coalesced {service.inflight.stats()['coalesced']}  retried {service.retry.stats()['retried']}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
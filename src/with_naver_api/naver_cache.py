@@ -0,0 +1,222 @@
+# naver_cache.py
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import anyio
+
+# 엔드포인트별 캐시 유효 시간(초). 0이면 캐시하지 않는다
+DEFAULT_TTLS = {
+    "encyc": 7 * 24 * 3600,
+    "book": 24 * 3600,
+    "book_adv": 24 * 3600,
+    "adult": 24 * 3600,
+    "local": 6 * 3600,
+    "image": 3600,
+    "webkr": 3600,
+    "doc": 3600,
+    "kin": 1800,
+    "cafearticle": 1800,
+    "shop": 600,
+    "blog": 300,
+    "news": 300,
+    "errata": 0,
+}
+
+
+def vertical(path: str) -> str:
+    """'search/book_adv.xml' -> 'book_adv'"""
+    return path.rsplit("/", 1)[-1].split(".", 1)[0]
+
+
+class ResponseCache:
+    """
+    Two-tier cache for Naver OpenAPI responses, keyed by endpoint and the
+    canonicalized request parameters (None values dropped, keys sorted,
+    values as strings).
+
+    The memory tier is an LRU bounded by the total size of the cached
+    bodies. The optional SQLite tier keeps entries across restarts; disk
+    hits are promoted to memory. Only successful responses are stored, and
+    each endpoint has its own TTL (`ttls`, by vertical name such as "encyc"
+    or "book_adv"); endpoints with a TTL of 0 are never cached.
+
+    Every hit is one upstream call, and one unit of the daily quota, saved.
+
+    Args:
+        ttls (dict, optional): Seconds per vertical. Defaults to DEFAULT_TTLS.
+        max_bytes (int, optional): Size bound of the memory tier. Defaults to 16 MiB.
+        path (str, optional): SQLite file for the disk tier. Defaults to None (memory only).
+        max_entries (int, optional): Entries kept in the disk tier. Defaults to 100000.
+    """
+
+    def __init__(
+        self,
+        ttls: dict = None,
+        max_bytes: int = 16 * 2**20,
+        path: str = None,
+        max_entries: int = 100000,
+    ):
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._memory = OrderedDict()  # key -> (expires, text, size)
+        self.bytes = 0
+
+        self._conn = None
+        self._lock = threading.Lock()
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.executescript(
+                """
+                PRAGMA journal_mode=WAL;
+                CREATE TABLE IF NOT EXISTS naver_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires REAL NOT NULL,
+                    last_used REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS naver_cache_last_used ON naver_cache (last_used);
+                """
+            )
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.uncached = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        """
+        Build from NAVER_CACHE_MAX_BYTES, NAVER_CACHE_DB and NAVER_CACHE_SPELLING
+        (a TTL in seconds for fix_spelling results, off by default).
+        """
+        ttls = dict(DEFAULT_TTLS)
+        ttls["errata"] = int(os.environ.get("NAVER_CACHE_SPELLING", "0"))
+        return cls(
+            ttls,
+            max_bytes=int(os.environ.get("NAVER_CACHE_MAX_BYTES", 16 * 2**20)),
+            path=os.environ.get("NAVER_CACHE_DB") or None,
+        )
+
+    @staticmethod
+    def key(path: str, params: dict, variant: str = "") -> str:
+        canonical = {k: str(v) for k, v in params.items() if v is not None}
+        key = path + "?" + json.dumps(canonical, sort_keys=True, ensure_ascii=False)
+        return f"{key}#{variant}" if variant else key
+
+    async def fetch(self, path: str, params: dict, call, variant: str = "") -> str:
+        """
+        Return the cached body for the request, or await `call()` and store it.
+        `variant` tells apart different representations of the same response.
+        """
+        ttl = self.ttls.get(vertical(path), 0)
+        if not ttl:
+            self.uncached += 1
+            return await call()
+
+        key = self.key(path, params, variant)
+        text = self._get_memory(key)
+        if text is not None:
+            self.memory_hits += 1
+            return text
+        if self._conn is not None:
+            row = await anyio.to_thread.run_sync(self._get_disk, key)
+            if row is not None:
+                self.disk_hits += 1
+                self._put_memory(key, row[0], row[1])
+                return row[0]
+
+        self.misses += 1
+        text = await call()
+        expires = time.time() + ttl
+        self._put_memory(key, text, expires)
+        if self._conn is not None:
+            await anyio.to_thread.run_sync(self._put_disk, key, text, expires)
+        return text
+
+    def _get_memory(self, key: str):
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.time():
+            self._drop(key)
+            return None
+        self._memory.move_to_end(key)
+        return entry[1]
+
+    def _put_memory(self, key: str, text: str, expires: float):
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        if key in self._memory:
+            self._drop(key)
+        self._memory[key] = (expires, text, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            self._drop(next(iter(self._memory)))
+            self.evictions += 1
+
+    def _drop(self, key: str):
+        self.bytes -= self._memory.pop(key)[2]
+
+    def _get_disk(self, key: str):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires FROM naver_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._conn.execute("DELETE FROM naver_cache WHERE key = ?", (key,))
+            else:
+                self._conn.execute(
+                    "UPDATE naver_cache SET last_used = ? WHERE key = ?", (now, key)
+                )
+            self._conn.commit()
+        return row if row[1] >= now else None
+
+    def _put_disk(self, key: str, text: str, expires: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO naver_cache (key, value, expires, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, text, expires, time.time()),
+            )
+            self._conn.execute(
+                "DELETE FROM naver_cache WHERE key IN (SELECT key FROM naver_cache "
+                "ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+
+    def stats(self) -> dict:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        stats = {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "uncached": self.uncached,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            # 캐시 적중 한 번이 일일 호출 한도 한 번
+            "quota_saved": hits,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self.bytes,
+            "evictions": self.evictions,
+        }
+        if self._conn is not None:
+            with self._lock:
+                stats["disk_entries"] = self._conn.execute(
+                    "SELECT COUNT(*) FROM naver_cache"
+                ).fetchone()[0]
+        return stats
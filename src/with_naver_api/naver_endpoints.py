@@ -0,0 +1,208 @@
+# naver_endpoints.py
+from inspect import Parameter
+
+from naver_cache import vertical
+from naver_xml import parse_book_adv
+
+REQUIRED = Parameter.empty
+
+# 검색 도구에 공통으로 붙는 파라미터 (name, type, default, doc)
+QUERY = ("query", str, REQUIRED, "The query to search for.")
+DISPLAY = ("display", int, 10, "The number of items to display. Defaults to 10.")
+START = ("start", int, 1, "The start index for the search. Defaults to 1.")
+SORT = ("sort", str, "sim", 'The sorting method. Defaults to "sim".')
+
+# 응답을 LLM용으로 줄이는 옵션. projected 엔드포인트에만 붙고 API로는 보내지 않는다
+PROJECTION_PARAMS = (
+    ("fields", list[str], None, "Fields to return. Defaults to the tool's usual fields."),
+    ("max_chars", int, 200, "Truncate descriptions to this many characters, 0 for no limit. Defaults to 200."),
+    ("format", str, "compact", '"compact" lines, projected "json", or the "raw" API response. Defaults to "compact".'),
+)
+
+
+class Endpoint:
+    """
+    One Naver OpenAPI endpoint and the MCP tool generated for it.
+
+    Every tool built from an Endpoint runs through the same pipeline
+    (naver_pipeline.py), so a new entry in ENDPOINTS gets timing, caching,
+    single-flight, retries, rate limiting and projection without any code.
+
+    Args:
+        name (str): Tool name.
+        path (str): Path under the API root, e.g. "search/blog.json".
+        description (str): Tool description shown to the model.
+        params (tuple): API parameters as (name, type, default, doc); REQUIRED marks a required one.
+        projected (bool, optional): Project the response for the LLM and accept
+            `fields`, `max_chars` and `format`. Defaults to True.
+        parse (callable, optional): Async parser streamed the body's byte chunks,
+            returning JSON text; used unless format is "raw". Defaults to None.
+        require_any (tuple, optional): Parameters of which at least one must be given. Defaults to ().
+        batch (str, optional): Response field collected per query by a generated
+            `<name>_batch` tool taking a list of queries. Defaults to None (no batch tool).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        description: str,
+        params: tuple,
+        projected: bool = True,
+        parse=None,
+        require_any: tuple = (),
+        batch: str = None,
+    ):
+        self.name = name
+        self.path = path
+        self.description = description
+        self.params = params
+        self.projected = projected
+        self.parse = parse
+        self.require_any = require_any
+        self.batch = batch
+
+    @property
+    def vertical(self) -> str:
+        return vertical(self.path)
+
+    @property
+    def xml(self) -> bool:
+        return self.path.endswith(".xml")
+
+    def tool_params(self) -> tuple:
+        return self.params + (PROJECTION_PARAMS if self.projected else ())
+
+    def defaults(self) -> dict:
+        """API parameters with their defaults, e.g. for a page of search_many."""
+        return {name: default for name, _, default, _ in self.params if default is not REQUIRED}
+
+    def docstring(self) -> str:
+        lines = [self.description, "", "Args:"]
+        for name, annotation, default, doc in self.tool_params():
+            type_name = getattr(annotation, "__name__", None)
+            if getattr(annotation, "__args__", None):
+                type_name = str(annotation)
+            optional = "" if default is REQUIRED else ", optional"
+            lines.append(f"    {name} ({type_name}{optional}): {doc}")
+        return "\n".join(lines)
+
+
+ENDPOINTS = {
+    endpoint.name: endpoint
+    for endpoint in (
+        Endpoint(
+            "search_blog",
+            "search/blog.json",
+            "Search blog posts on Naver",
+            (QUERY, DISPLAY, START, SORT),
+        ),
+        Endpoint(
+            "search_news",
+            "search/news.json",
+            "Search news articles on Naver",
+            (QUERY, DISPLAY, START, SORT),
+        ),
+        Endpoint(
+            "search_book",
+            "search/book.json",
+            "Search books on Naver",
+            (QUERY, DISPLAY, START, SORT),
+        ),
+        Endpoint(
+            "get_book_adv",
+            "search/book_adv.xml",
+            "Get book information from Naver",
+            (
+                ("query", str, None, "The query to search for."),
+                DISPLAY,
+                START,
+                SORT,
+                ("d_titl", str, None, "Title of the book."),
+                ("d_isbn", str, None, "ISBN of the book."),
+            ),
+            # 받는 대로 조금씩 파싱해서 필요한 필드만 레코드로 만든다
+            parse=parse_book_adv,
+            require_any=("d_titl", "d_isbn"),
+        ),
+        Endpoint(
+            "adult_check",
+            "search/adult.json",
+            "Check if the search term is adult content",
+            (("query", str, REQUIRED, "The query to check."),),
+            projected=False,
+            batch="adult",
+        ),
+        Endpoint(
+            "search_encyc",
+            "search/encyc.json",
+            "Search encyclopedia on Naver",
+            (QUERY, DISPLAY, START),
+        ),
+        Endpoint(
+            "search_cafe_article",
+            "search/cafearticle.json",
+            "Search cafe articles on Naver",
+            (QUERY, DISPLAY, START, SORT),
+        ),
+        Endpoint(
+            "search_kin",
+            "search/kin.json",
+            "Search Q&A on Naver",
+            (QUERY, DISPLAY, START, SORT),
+        ),
+        Endpoint(
+            "search_local",
+            "search/local.json",
+            "Search local information on Naver",
+            (QUERY, DISPLAY, START, ("sort", str, "random", 'The sorting method. Defaults to "random".')),
+        ),
+        Endpoint(
+            "fix_spelling",
+            "search/errata.json",
+            "Correct spelling errors in a given text",
+            (("query", str, REQUIRED, "The text to correct."),),
+            projected=False,
+            batch="errata",
+        ),
+        Endpoint(
+            "search_webkr",
+            "search/webkr.json",
+            "Search web pages on Naver",
+            (QUERY, DISPLAY, START),
+        ),
+        Endpoint(
+            "search_image",
+            "search/image",
+            "Search images on Naver",
+            (QUERY, DISPLAY, START, SORT, ("filter", str, "all", 'The filter for the search. Defaults to "all".')),
+        ),
+        Endpoint(
+            "search_shop",
+            "search/shop.json",
+            "Search shopping items on Naver",
+            (
+                QUERY,
+                DISPLAY,
+                START,
+                SORT,
+                ("filter", str, None, "The filter for the search. Defaults to None."),
+                ("exclude", str, None, "The exclude filter for the search. Defaults to None."),
+            ),
+        ),
+        Endpoint(
+            "search_doc",
+            "search/doc.json",
+            "Search documents on Naver",
+            (QUERY, DISPLAY, START),
+        ),
+    )
+}
+
+
+def by_vertical(name: str) -> Endpoint:
+    """The endpoint of a vertical such as "news" or "cafearticle"."""
+    for endpoint in ENDPOINTS.values():
+        if endpoint.vertical == name:
+            return endpoint
+    raise KeyError(name)
@@ -0,0 +1,105 @@
+# naver_http.py
+import logging
+import os
+from contextlib import asynccontextmanager
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class SharedClient:
+    """
+    One pooled httpx.AsyncClient shared by every Naver tool in the process.
+
+    Connections to the API host are kept alive and reused across tool calls,
+    so only the first call pays for the TCP/TLS handshake. The client is
+    created lazily on first use and closed when the last MCP session using
+    it ends (`lifespan`): the stdio transport runs one session per process,
+    the SSE transport runs one per connected client.
+
+    Settings default to the NAVER_HTTP_* environment variables.
+
+    Args:
+        http2 (bool, optional): Use HTTP/2 if the `h2` package is installed. Defaults to NAVER_HTTP2 or False.
+        max_connections (int, optional): Connection limit. Defaults to NAVER_HTTP_MAX_CONNECTIONS or 20.
+        max_keepalive (int, optional): Idle connections kept open. Defaults to NAVER_HTTP_MAX_KEEPALIVE or 10.
+        keepalive_expiry (float, optional): Seconds an idle connection is kept. Defaults to NAVER_HTTP_KEEPALIVE_EXPIRY or 30.
+        timeout (float, optional): Read/write timeout in seconds. Defaults to NAVER_HTTP_TIMEOUT or 10.
+        connect_timeout (float, optional): Connect timeout in seconds. Defaults to NAVER_HTTP_CONNECT_TIMEOUT or 5.
+        pool_timeout (float, optional): Seconds to wait for a free connection. Defaults to NAVER_HTTP_POOL_TIMEOUT or 10.
+    """
+
+    def __init__(
+        self,
+        http2: bool = None,
+        max_connections: int = None,
+        max_keepalive: int = None,
+        keepalive_expiry: float = None,
+        timeout: float = None,
+        connect_timeout: float = None,
+        pool_timeout: float = None,
+    ):
+        if http2 is None:
+            http2 = os.environ.get("NAVER_HTTP2", "").lower() in ("1", "true", "yes")
+        if http2 and not _http2_available():
+            logger.warning("NAVER_HTTP2 is set but the 'h2' package is missing, using HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections or int(_env_float("NAVER_HTTP_MAX_CONNECTIONS", 20)),
+            max_keepalive_connections=max_keepalive or int(_env_float("NAVER_HTTP_MAX_KEEPALIVE", 10)),
+            keepalive_expiry=keepalive_expiry or _env_float("NAVER_HTTP_KEEPALIVE_EXPIRY", 30.0),
+        )
+        self.timeout = httpx.Timeout(
+            timeout or _env_float("NAVER_HTTP_TIMEOUT", 10.0),
+            connect=connect_timeout or _env_float("NAVER_HTTP_CONNECT_TIMEOUT", 5.0),
+            pool=pool_timeout or _env_float("NAVER_HTTP_POOL_TIMEOUT", 10.0),
+        )
+        self._client = None
+        self._sessions = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=self.http2, limits=self.limits, timeout=self.timeout
+            )
+        return self._client
+
+    async def request(self, method: str, url: str, stream: bool = False, **kwargs) -> httpx.Response:
+        """Send a request; with `stream=True` the body is left unread (close the response after use)."""
+        client = self.client
+        return await client.send(client.build_request(method, url, **kwargs), stream=stream)
+
+    async def get(self, url: str, stream: bool = False, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, stream=stream, **kwargs)
+
+    async def aclose(self):
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    @asynccontextmanager
+    async def lifespan(self, server):
+        """FastMCP lifespan: close the client when the last session ends."""
+        self._sessions += 1
+        try:
+            yield {"http": self}
+        finally:
+            self._sessions -= 1
+            if self._sessions == 0:
+                await self.aclose()
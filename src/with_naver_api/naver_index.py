@@ -0,0 +1,189 @@
+# naver_index.py
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from naver_merge import item_url
+from naver_projection import FIELDS, clean
+
+_SCHEMA = """
+PRAGMA journal_mode=WAL;
+CREATE TABLE IF NOT EXISTS fetched_items (
+    id INTEGER PRIMARY KEY,
+    -- 검색 때 거르는 작은 열을 앞에 둬야 긴 item을 읽지 않는다
+    vertical TEXT NOT NULL,
+    fetched REAL NOT NULL,
+    key TEXT UNIQUE NOT NULL,
+    query TEXT,
+    title TEXT,
+    description TEXT,
+    details TEXT,
+    item TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS fetched_items_fetched ON fetched_items (fetched);
+CREATE VIRTUAL TABLE IF NOT EXISTS fetched_fts USING fts5(
+    title, description, details,
+    content='fetched_items', content_rowid='id', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS fetched_items_ai AFTER INSERT ON fetched_items BEGIN
+    INSERT INTO fetched_fts (rowid, title, description, details)
+    VALUES (new.id, new.title, new.description, new.details);
+END;
+CREATE TRIGGER IF NOT EXISTS fetched_items_ad AFTER DELETE ON fetched_items BEGIN
+    INSERT INTO fetched_fts (fetched_fts, rowid, title, description, details)
+    VALUES ('delete', old.id, old.title, old.description, old.details);
+END;
+CREATE TRIGGER IF NOT EXISTS fetched_items_au AFTER UPDATE ON fetched_items BEGIN
+    INSERT INTO fetched_fts (fetched_fts, rowid, title, description, details)
+    VALUES ('delete', old.id, old.title, old.description, old.details);
+    INSERT INTO fetched_fts (rowid, title, description, details)
+    VALUES (new.id, new.title, new.description, new.details);
+END;
+"""
+
+
+def match_expression(text: str) -> str:
+    """
+    'mcp 서버' -> '"mcp"* AND "서버"*': every word must appear, as a word
+    prefix, so Korean words match with their particles ('서버를').
+    """
+    words = [word.replace('"', '""') for word in text.split()]
+    return " AND ".join(f'"{word}"*' for word in words)
+
+
+class FetchedIndex:
+    """
+    Local SQLite FTS5 index of the items Naver searches returned, so that
+    follow-up questions about them are answered without an upstream call.
+
+    Items are keyed by URL and title; fetching one again refreshes it. Title,
+    description and the vertical's other text fields are searchable, and
+    the original item is kept for projection. Items older than `max_age`
+    are evicted, and beyond `max_items` the oldest go first.
+
+    Args:
+        path (str): SQLite file, or ":memory:" for the process lifetime.
+        max_items (int, optional): Items kept. Defaults to 50000.
+        max_age (float, optional): Seconds an item is kept. Defaults to 7 days.
+    """
+
+    def __init__(self, path: str, max_items: int = 50000, max_age: float = 7 * 24 * 3600):
+        self.max_items = max_items
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+        self.added = 0
+        self.evicted = 0
+        self.searches = 0
+
+    @classmethod
+    def from_env(cls):
+        """
+        Build from NAVER_INDEX_DB, NAVER_INDEX_MAX_ITEMS and NAVER_INDEX_MAX_AGE
+        (seconds), or return None when NAVER_INDEX_DB is not set.
+        """
+        path = os.environ.get("NAVER_INDEX_DB")
+        if not path:
+            return None
+        return cls(
+            path,
+            max_items=int(os.environ.get("NAVER_INDEX_MAX_ITEMS", 50000)),
+            max_age=float(os.environ.get("NAVER_INDEX_MAX_AGE", 7 * 24 * 3600)),
+        )
+
+    def add_response(self, vertical: str, query: str, text: str) -> int:
+        """Index the items of a JSON search response; returns how many."""
+        items = json.loads(text).get("items") or []
+        return self.add(vertical, query, items)
+
+    def add(self, vertical: str, query: str, items: list) -> int:
+        searchable = [f for f in FIELDS.get(vertical, ()) if f not in ("title", "link", "description")]
+        now = time.time()
+        rows = []
+        for item in items:
+            url = item_url(item)
+            title = clean(item.get("title"))
+            rows.append(
+                (
+                    vertical,
+                    now,
+                    # 같은 링크라도 제목이 다르면 다른 항목 (예: 링크가 같은 책의 판본들)
+                    f"{url or vertical}\n{title}",
+                    query,
+                    title,
+                    clean(item.get("description")),
+                    " ".join(filter(None, (clean(item.get(field)) for field in searchable))),
+                    json.dumps(item, ensure_ascii=False),
+                )
+            )
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO fetched_items (vertical, fetched, key, query, title, description, details, item) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET vertical = excluded.vertical, fetched = excluded.fetched, query = excluded.query, "
+                "title = excluded.title, description = excluded.description, details = excluded.details, "
+                "item = excluded.item",
+                rows,
+            )
+            self._evict(now)
+            self._conn.commit()
+        self.added += len(rows)
+        return len(rows)
+
+    def _evict(self, now: float):
+        evicted = self._conn.execute(
+            "DELETE FROM fetched_items WHERE fetched < ?", (now - self.max_age,)
+        ).rowcount
+        evicted += self._conn.execute(
+            "DELETE FROM fetched_items WHERE id IN (SELECT id FROM fetched_items "
+            "ORDER BY fetched DESC, id DESC LIMIT -1 OFFSET ?)",
+            (self.max_items,),
+        ).rowcount
+        self.evicted += evicted
+
+    def search(self, text: str, verticals: list = None, limit: int = 10) -> list:
+        """Best matches first (BM25), as the original items plus "vertical" and "fetched"."""
+        expression = match_expression(text)
+        if not expression:
+            return []
+        # 순위는 작은 열만으로 매기고, 원본 item은 상위 limit개만 읽는다
+        where = "fetched_fts MATCH ? AND fetched_items.fetched >= ?"
+        params = [expression, time.time() - self.max_age]
+        if verticals:
+            where += f" AND fetched_items.vertical IN ({', '.join('?' * len(verticals))})"
+            params += list(verticals)
+        sql = (
+            "SELECT items.vertical, items.item, items.fetched FROM ("
+            "SELECT fetched_items.id AS id, bm25(fetched_fts) AS score "
+            "FROM fetched_fts JOIN fetched_items ON fetched_items.id = fetched_fts.rowid "
+            f"WHERE {where} ORDER BY score LIMIT ?"
+            ") AS top JOIN fetched_items AS items ON items.id = top.id ORDER BY top.score"
+        )
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        self.searches += 1
+        return [
+            {**json.loads(item), "vertical": vertical, "fetched": round(fetched)}
+            for vertical, item, fetched in rows
+        ]
+
+    def close(self):
+        self._conn.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            items = self._conn.execute("SELECT COUNT(*) FROM fetched_items").fetchone()[0]
+            pages = self._conn.execute("PRAGMA page_count").fetchone()[0]
+            page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+        return {
+            "items": items,
+            "bytes": pages * page_size,
+            "added": self.added,
+            "evicted": self.evicted,
+            "searches": self.searches,
+        }
@@ -0,0 +1,296 @@
+# naver_limits.py
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import anyio
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# 네이버 일일 호출 한도는 한국 시간 자정에 초기화된다
+KST = timezone(timedelta(hours=9))
+
+# 먼저 처리되는 순서대로
+LANES = ("interactive", "batch")
+current_lane = contextvars.ContextVar("lane", default="interactive")
+
+
+@contextmanager
+def lane(name: str):
+    """Run the Naver calls made inside the block in the given priority lane."""
+    token = current_lane.set(name)
+    try:
+        yield
+    finally:
+        current_lane.reset(token)
+
+
+class QuotaExceeded(Exception):
+    """The daily Naver API quota is used up."""
+
+
+def parse_weights(text: str) -> dict:
+    """'book_adv=2,shop=1' -> {'book_adv': 2, 'shop': 1}"""
+    weights = {}
+    for part in filter(None, text.split(",")):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = int(weight)
+    return weights
+
+
+class DailyQuota:
+    """
+    Calls used against the daily Naver quota, per KST day.
+
+    With a `path` the counter lives in SQLite, so it survives restarts and
+    is shared by every server process using the same file; each call adds
+    to the stored count and reads the total back.
+
+    Args:
+        limit (int): Calls allowed per day.
+        path (str, optional): SQLite file for the counter. Defaults to None (memory only).
+    """
+
+    def __init__(self, limit: int, path: str = None):
+        self.limit = limit
+        self.day = self._today()
+        self.used = 0
+        self._conn = None
+        self._lock = threading.Lock()
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.executescript(
+                """
+                PRAGMA journal_mode=WAL;
+                CREATE TABLE IF NOT EXISTS naver_quota (
+                    day TEXT PRIMARY KEY,
+                    used INTEGER NOT NULL
+                );
+                """
+            )
+            self.used = self._add(self.day, 0)
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(KST).strftime("%Y-%m-%d")
+
+    def remaining(self) -> int:
+        if self.day != self._today():
+            self.day, self.used = self._today(), 0
+        return max(self.limit - self.used, 0)
+
+    def check(self, cost: int):
+        if self.remaining() < cost:
+            raise QuotaExceeded(
+                f"Daily Naver API quota of {self.limit} calls is used up (resets at 00:00 KST)"
+            )
+
+    async def consume(self, cost: int):
+        self.check(cost)
+        self.used += cost
+        if self._conn is not None:
+            self.used = await anyio.to_thread.run_sync(self._add, self.day, cost)
+
+    def _add(self, day: str, cost: int) -> int:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO naver_quota (day, used) VALUES (?, ?) "
+                "ON CONFLICT(day) DO UPDATE SET used = used + excluded.used",
+                (day, cost),
+            )
+            self._conn.commit()
+            return self._conn.execute(
+                "SELECT used FROM naver_quota WHERE day = ?", (day,)
+            ).fetchone()[0]
+
+    def stats(self) -> dict:
+        remaining = self.remaining()
+        return {"day": self.day, "limit": self.limit, "used": self.used, "remaining": remaining}
+
+
+class RateLimiter:
+    """
+    Token bucket in front of every upstream Naver call, plus the daily quota.
+
+    Each endpoint costs `weights[vertical]` tokens and quota units (1 by
+    default). Callers that cannot be served right away wait in priority
+    order: every waiting "interactive" call goes before any "batch" call,
+    and calls within a lane go first-come first-served. The lane comes from
+    `lane()` around the call.
+
+    Args:
+        rate (float): Tokens added per second.
+        burst (int): Bucket size.
+        quota (DailyQuota): Daily quota counter.
+        weights (dict, optional): Cost per vertical, e.g. {"book_adv": 2}. Defaults to 1 each.
+    """
+
+    def __init__(self, rate: float, burst: int, quota: DailyQuota, weights: dict = None):
+        # _pump은 rate로 나눠 기다릴 시간을 구한다
+        if rate <= 0:
+            raise ValueError(f"NAVER_RATE must be > 0 calls/s, got {rate}")
+        if burst < 1:
+            raise ValueError(f"NAVER_BURST must be >= 1, got {burst}")
+        self.rate = rate
+        self.burst = burst
+        self.quota = quota
+        self.weights = weights or {}
+        self.tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters = []
+        self._seq = itertools.count()
+        self._pump_task = None
+
+        self.acquired = {name: 0 for name in LANES}
+        self.waited = {name: 0 for name in LANES}
+        self.wait_seconds = {name: 0.0 for name in LANES}
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        """
+        Build from NAVER_RATE (calls/s), NAVER_BURST, NAVER_DAILY_QUOTA,
+        NAVER_QUOTA_DB and NAVER_WEIGHTS ('book_adv=2,shop=1'). The quota
+        is persisted in NAVER_QUOTA_DB (naver_quota.sqlite by default), so
+        it survives restarts and is shared by the processes using the file;
+        an empty NAVER_QUOTA_DB counts it in memory, e.g. against a stand-in.
+        """
+        quota = DailyQuota(
+            int(os.environ.get("NAVER_DAILY_QUOTA", 25000)),
+            os.environ.get("NAVER_QUOTA_DB", "naver_quota.sqlite") or None,
+        )
+        return cls(
+            float(os.environ.get("NAVER_RATE", 10)),
+            int(os.environ.get("NAVER_BURST", 10)),
+            quota,
+            parse_weights(os.environ.get("NAVER_WEIGHTS", "")),
+        )
+
+    def weight(self, vertical: str) -> int:
+        return min(self.weights.get(vertical, 1), self.burst)
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def level(self) -> float:
+        self._refill()
+        return self.tokens
+
+    async def acquire(self, vertical: str):
+        """Wait for tokens for one call to `vertical` and count it against the quota."""
+        cost = self.weight(vertical)
+        name = current_lane.get()
+        self.quota.check(cost)
+
+        self._refill()
+        if not self._waiters and self.tokens >= cost:
+            self.tokens -= cost
+        else:
+            started = time.perf_counter()
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (LANES.index(name), next(self._seq), cost, future))
+            if self._pump_task is None:
+                self._pump_task = asyncio.create_task(self._pump())
+            await future
+            self.waited[name] += 1
+            self.wait_seconds[name] += time.perf_counter() - started
+
+        self.acquired[name] += 1
+        await self.quota.consume(cost)
+
+    async def _pump(self):
+        try:
+            while self._waiters:
+                cost, future = self._waiters[0][2:]
+                if future.done():  # 기다리던 쪽이 취소됨
+                    heapq.heappop(self._waiters)
+                    continue
+                self._refill()
+                if self.tokens >= cost:
+                    heapq.heappop(self._waiters)
+                    self.tokens -= cost
+                    future.set_result(None)
+                else:
+                    await asyncio.sleep((cost - self.tokens) / self.rate)
+        finally:
+            self._pump_task = None
+
+    def stats(self) -> dict:
+        waiting = {name: 0 for name in LANES}
+        for rank, _, _, future in self._waiters:
+            if not future.done():
+                waiting[LANES[rank]] += 1
+        return {
+            "bucket_level": self.level(),
+            "bucket_size": self.burst,
+            "rate_per_second": self.rate,
+            "waiting": waiting,
+            "acquired": dict(self.acquired),
+            "waited": dict(self.waited),
+            "wait_seconds": dict(self.wait_seconds),
+            "quota": self.quota.stats(),
+        }
+
+
+class Retry:
+    """
+    Retries upstream calls answered with 429 or 5xx, with full-jitter
+    exponential backoff (a random delay up to `base * 2**attempt`, capped),
+    or the server's Retry-After when it sends one.
+
+    Args:
+        retries (int, optional): Retries after the first attempt. Defaults to 3.
+        base (float, optional): Backoff base in seconds. Defaults to 0.5.
+        cap (float, optional): Longest delay in seconds. Defaults to 8.
+    """
+
+    def __init__(self, retries: int = 3, base: float = 0.5, cap: float = 8.0):
+        self.retries = retries
+        self.base = base
+        self.cap = cap
+        self.attempts = 0
+        self.retried = 0
+
+    @staticmethod
+    def retryable(response: httpx.Response) -> bool:
+        return response.status_code == 429 or response.status_code >= 500
+
+    def delay(self, attempt: int, response: httpx.Response) -> float:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.cap)
+        return random.uniform(0, min(self.cap, self.base * 2**attempt))
+
+    async def __call__(self, send):
+        """
+        Await `send()`, again while it raises httpx.HTTPStatusError with a
+        retryable status, until it succeeds or retries run out.
+        """
+        for attempt in range(self.retries + 1):
+            self.attempts += 1
+            try:
+                return await send()
+            except httpx.HTTPStatusError as error:
+                response = error.response
+                if not self.retryable(response) or attempt == self.retries:
+                    raise
+            self.retried += 1
+            delay = self.delay(attempt, response)
+            logger.warning(
+                "Naver API answered %s, retrying in %.2fs", response.status_code, delay
+            )
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        return {"attempts": self.attempts, "retried": self.retried}
@@ -0,0 +1,319 @@
+# naver_links.py
+import asyncio
+import ipaddress
+import os
+import socket
+import time
+from collections import OrderedDict
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+import httpx
+
+from naver_http import SharedClient
+from singleflight import SingleFlight
+
+# HEAD를 거부하거나 잘못 답하는 서버가 많아서, 이 상태면 Range GET으로 다시 확인한다
+HEAD_FALLBACK_STATUSES = {400, 403, 404, 405, 406, 429, 500, 501, 502, 503}
+
+# 한 번의 check_links 호출에서 확인하는 링크 수의 상한
+MAX_LINKS = 200
+
+# 기억해 두는 '죽은 호스트' 수의 상한
+MAX_DOWN_HOSTS = 4096
+
+
+class HostDown(Exception):
+    """The host timed out or refused a connection moments ago."""
+
+
+class BlockedAddress(Exception):
+    """The host resolves to a loopback, private, link-local or otherwise non-public address."""
+
+
+def is_public(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if ip.version == 6 and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+class _Host:
+    """Per-host probe limit, dropped once no probe holds or waits for it."""
+
+    __slots__ = ("semaphore", "users")
+
+    def __init__(self, limit: int):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.users = 0
+
+
+class LinkChecker:
+    """
+    Checks whether URLs are reachable, many at a time, over its own pooled
+    client (the links point anywhere, not at the Naver API host).
+
+    Each link is probed with HEAD, and with a one-byte ranged GET when HEAD
+    fails or is refused; redirects are followed by hand up to
+    `max_redirects`. At most `per_host` probes run against one host and
+    `concurrency` in total, with short timeouts so a dead host costs
+    seconds, not the whole call. A host that timed out or refused a
+    connection is marked down for `failure_ttl` seconds, and its other links
+    fail at once instead of queuing for their own timeouts. Results are
+    cached for `ttl` seconds (`failure_ttl` for unreachable links), and
+    concurrent checks of one URL share one probe.
+
+    The URLs come from the model, so unless `allow_private` is set every
+    hop's host is resolved first and refused when any of its addresses is
+    loopback, private, link-local or otherwise not public; the request then
+    goes to the address that was checked (the Host header and TLS SNI keep
+    the name), so a second DNS answer cannot point it elsewhere.
+
+    Args:
+        http (SharedClient, optional): Pooled client. Defaults to one with a 5s read and 3s connect timeout.
+        concurrency (int, optional): Probes in flight at once. Defaults to 32.
+        per_host (int, optional): Probes in flight per host. Defaults to 4.
+        max_redirects (int, optional): Redirects followed per link. Defaults to 5.
+        ttl (float, optional): Seconds a reachable result is cached. Defaults to 600.
+        failure_ttl (float, optional): Seconds an unreachable result is cached. Defaults to 60.
+        max_entries (int, optional): Results kept in the cache. Defaults to 10000.
+        allow_private (bool, optional): Also probe non-public addresses, e.g. for a local
+            stand-in. Defaults to False.
+    """
+
+    def __init__(
+        self,
+        http: SharedClient = None,
+        concurrency: int = 32,
+        per_host: int = 4,
+        max_redirects: int = 5,
+        ttl: float = 600.0,
+        failure_ttl: float = 60.0,
+        max_entries: int = 10000,
+        allow_private: bool = False,
+    ):
+        self.http = http or SharedClient(max_connections=64, max_keepalive=32, timeout=5.0, connect_timeout=3.0)
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.max_redirects = max_redirects
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.max_entries = max_entries
+        self.allow_private = allow_private
+        self.inflight = SingleFlight()
+        self._cache = OrderedDict()
+        self._hosts = {}
+        self._down = OrderedDict()
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+        self.checks = 0
+        self.hits = 0
+        self.probes = 0
+        self.fallbacks = 0
+        self.unreachable = 0
+        self.host_down = 0
+        self.blocked = 0
+
+    @classmethod
+    def from_env(cls) -> "LinkChecker":
+        """
+        Build from NAVER_LINK_TIMEOUT, NAVER_LINK_CONNECT_TIMEOUT (seconds),
+        NAVER_LINK_CONCURRENCY, NAVER_LINK_PER_HOST, NAVER_LINK_MAX_REDIRECTS
+        NAVER_LINK_CACHE_TTL / NAVER_LINK_FAILURE_TTL (seconds) and
+        NAVER_LINK_ALLOW_PRIVATE ("1" to allow non-public addresses).
+        """
+        concurrency = int(os.environ.get("NAVER_LINK_CONCURRENCY", 32))
+        return cls(
+            SharedClient(
+                max_connections=2 * concurrency,
+                max_keepalive=concurrency,
+                timeout=float(os.environ.get("NAVER_LINK_TIMEOUT", 5.0)),
+                connect_timeout=float(os.environ.get("NAVER_LINK_CONNECT_TIMEOUT", 3.0)),
+            ),
+            concurrency=concurrency,
+            per_host=int(os.environ.get("NAVER_LINK_PER_HOST", 4)),
+            max_redirects=int(os.environ.get("NAVER_LINK_MAX_REDIRECTS", 5)),
+            ttl=float(os.environ.get("NAVER_LINK_CACHE_TTL", 600)),
+            failure_ttl=float(os.environ.get("NAVER_LINK_FAILURE_TTL", 60)),
+            allow_private=os.environ.get("NAVER_LINK_ALLOW_PRIVATE", "").lower() in ("1", "true", "yes"),
+        )
+
+    async def check_many(self, urls: list) -> list:
+        """Results aligned with `urls`; repeated URLs are probed once."""
+        unique = list(dict.fromkeys(urls))
+        results = dict(zip(unique, await asyncio.gather(*(self.check(url) for url in unique))))
+        return [results[url] for url in urls]
+
+    async def check(self, url: str) -> dict:
+        """
+        {"url", "ok", "status", "final_url", "redirects", "ms"} for one URL,
+        plus "error" when it could not be reached. Never raises.
+        """
+        self.checks += 1
+        url = url.strip()
+        now = time.monotonic()
+        entry = self._cache.get(url)
+        if entry is not None:
+            expires, result = entry
+            if expires > now:
+                self._cache.move_to_end(url)
+                self.hits += 1
+                return {**result, "cached": True}
+            del self._cache[url]
+
+        result = await self.inflight.do(url, lambda: self._probe(url))
+        ttl = self.ttl if result["ok"] else self.failure_ttl
+        self._cache[url] = (time.monotonic() + ttl, result)
+        self._cache.move_to_end(url)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return result
+
+    async def _probe(self, url: str) -> dict:
+        started = time.perf_counter()
+        result = {"url": url, "ok": False, "status": None, "final_url": url, "redirects": 0}
+        current = url
+        try:
+            while True:
+                if urlsplit(current).scheme not in ("http", "https"):
+                    result["error"] = "invalid_url"
+                    break
+                status, location = await self._request(current)
+                result["status"], result["final_url"] = status, current
+                if location is None:
+                    result["ok"] = 200 <= status < 400
+                    break
+                if result["redirects"] >= self.max_redirects:
+                    result["error"] = "too_many_redirects"
+                    break
+                result["redirects"] += 1
+                current = urljoin(current, location)
+        except HostDown as error:
+            self.host_down += 1
+            result["error"] = str(error)
+        except BlockedAddress:
+            self.blocked += 1
+            result["error"] = "blocked_address"
+        except socket.gaierror:
+            result["error"] = "dns_error"
+            self._mark_down(current, "dns_error")
+        except httpx.TimeoutException:
+            result["error"] = "timeout"
+            self._mark_down(current, "timeout")
+        except httpx.ConnectError:
+            result["error"] = "connect_error"
+            self._mark_down(current, "connect_error")
+        except Exception as error:
+            # 잘못된 URL·Location(InvalidURL), 범위 밖 포트 등: 이 링크만 실패로 돌려준다
+            result["error"] = type(error).__name__
+        result["ms"] = round((time.perf_counter() - started) * 1000)
+        self.unreachable += not result["ok"]
+        return result
+
+    async def _request(self, url: str) -> tuple:
+        """(status, redirect location or None) of one hop: HEAD, then a ranged GET if needed."""
+        host = urlsplit(url).netloc.lower()
+        slot = self._hosts.get(host)
+        if slot is None:
+            slot = self._hosts[host] = _Host(self.per_host)
+        slot.users += 1
+        try:
+            # 호스트 슬롯을 먼저 잡는다: 바쁜 호스트의 링크가 전체 슬롯을 쥐고 기다리면 다른 호스트가 밀린다
+            async with slot.semaphore, self._semaphore:
+                # 기다리는 동안 같은 호스트의 다른 링크가 실패했을 수 있다
+                down = self._down.get(host)
+                if down is not None and down[0] > time.monotonic():
+                    raise HostDown(down[1])
+                target, options = await self._pin(url)
+                self.probes += 1
+                try:
+                    status, location = await self._send("HEAD", target, options)
+                except (httpx.TimeoutException, httpx.ConnectError):
+                    # 연결 자체가 안 되는 호스트에 GET을 또 보낼 필요는 없다
+                    raise
+                except httpx.HTTPError:
+                    status, location = None, None
+                if status is None or (location is None and status in HEAD_FALLBACK_STATUSES):
+                    self.fallbacks += 1
+                    status, location = await self._send("GET", target, options, {"Range": "bytes=0-0"})
+        finally:
+            slot.users -= 1
+            if not slot.users:
+                del self._hosts[host]
+        return status, location
+
+    async def _pin(self, url: str) -> tuple:
+        """
+        (URL to send, request options): with private addresses refused, the
+        URL of the checked address, with the name kept in Host and SNI.
+        """
+        if self.allow_private:
+            return url, {}
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        infos = await asyncio.wait_for(
+            asyncio.get_running_loop().getaddrinfo(parts.hostname, port, type=socket.SOCK_STREAM),
+            self.http.timeout.connect,
+        )
+        addresses = [info[4][0] for info in infos]
+        if not addresses or not all(is_public(address) for address in addresses):
+            raise BlockedAddress(parts.hostname)
+        address = addresses[0]
+        netloc = f"[{address}]" if ":" in address else address
+        if parts.port:
+            netloc += f":{parts.port}"
+        options = {"headers": {"Host": parts.netloc.rpartition("@")[2]}}
+        if parts.scheme == "https":
+            options["extensions"] = {"sni_hostname": parts.hostname}
+        return urlunsplit(parts._replace(netloc=netloc)), options
+
+    def _mark_down(self, url: str, error: str):
+        host = urlsplit(url).netloc.lower()
+        now = time.monotonic()
+        self._down.pop(host, None)
+        self._down[host] = (now + self.failure_ttl, error)
+        # 만료 순서가 곧 넣은 순서라 앞에서부터 지운다
+        while self._down and (len(self._down) > MAX_DOWN_HOSTS or next(iter(self._down.values()))[0] <= now):
+            self._down.popitem(last=False)
+
+    async def _send(self, method: str, url: str, options: dict, headers: dict = None) -> tuple:
+        # 본문은 읽지 않고 닫는다 (상태와 Location만 필요)
+        response = await self.http.request(
+            method,
+            url,
+            stream=True,
+            headers={**options.get("headers", {}), **(headers or {})},
+            extensions=options.get("extensions"),
+        )
+        try:
+            location = response.headers.get("location") if response.is_redirect else None
+            return response.status_code, location
+        finally:
+            await response.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._cache),
+            "checks": self.checks,
+            "hits": self.hits,
+            "probes": self.probes,
+            "head_fallbacks": self.fallbacks,
+            "unreachable": self.unreachable,
+            "host_down_skips": self.host_down,
+            "blocked": self.blocked,
+            "active_hosts": len(self._hosts),
+            "down_hosts": len(self._down),
+        }
+
+
+def format_results(results: list) -> str:
+    """'2 of 3 links reachable' and one line per link."""
+    lines = [f"{sum(r['ok'] for r in results)} of {len(results)} links reachable"]
+    for n, r in enumerate(results, 1):
+        state = "ok" if r["ok"] else "dead"
+        line = f"{n}. {state} {r['status'] or r.get('error')} {r['url']}"
+        if r["final_url"] != r["url"]:
+            line += f" -> {r['final_url']} ({r['redirects']} redirects)"
+        if r.get("error") and r["status"]:
+            line += f" [{r['error']}]"
+        lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,46 @@
+# naver_merge.py
+from urllib.parse import urlsplit, urlunsplit
+
+# Reciprocal rank fusion 상수: 클수록 순위 차이의 영향이 작아진다
+RRF_K = 60
+
+
+def normalize_url(url: str) -> str:
+    """Key for URL deduplication: no scheme, no 'www.', no fragment, no trailing slash."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if host.startswith("m."):
+        host = host[2:]
+    return urlunsplit(("", host, parts.path.rstrip("/"), parts.query, ""))
+
+
+def item_url(item: dict) -> str:
+    return item.get("link") or item.get("originallink") or item.get("url") or ""
+
+
+def merge_ranked(results: dict) -> list:
+    """
+    Merge per-vertical result lists into one ranked, URL-deduplicated list.
+
+    Items are scored by reciprocal rank fusion: an item at rank r in a
+    vertical scores 1 / (RRF_K + r), and a URL found in several verticals
+    adds up its scores. Each merged item keeps the fields of its best-ranked
+    copy plus `vertical` (where that copy came from) and `score`.
+
+    Args:
+        results (dict): {vertical: [item, ...]} in each vertical's own order.
+    """
+    merged = {}
+    for name, items in results.items():
+        for rank, item in enumerate(items, start=1):
+            url = item_url(item)
+            key = normalize_url(url) if url else f"{name}:{rank}"
+            score = 1 / (RRF_K + rank)
+            entry = merged.get(key)
+            if entry is None:
+                merged[key] = {**item, "vertical": name, "score": score}
+            else:
+                entry["score"] += score
+    return sorted(merged.values(), key=lambda item: item["score"], reverse=True)
@@ -0,0 +1,211 @@
+# naver_pipeline.py
+import json
+import logging
+import time
+from functools import partial
+
+import anyio
+import xmltodict
+
+from naver_projection import project
+
+logger = logging.getLogger(__name__)
+
+
+class NaverRequest:
+    """
+    One endpoint call going through the pipeline.
+
+    Args:
+        endpoint (Endpoint): The endpoint to call (naver_endpoints.py).
+        params (dict): API parameters.
+        fields (list, optional): Projection fields. Defaults to the vertical's usual fields.
+        max_chars (int, optional): Projection description limit. Defaults to 200.
+        format (str, optional): "compact", "json" or "raw". Defaults to "compact".
+    """
+
+    def __init__(
+        self,
+        endpoint,
+        params: dict,
+        fields: list = None,
+        max_chars: int = 200,
+        format: str = "compact",
+    ):
+        self.endpoint = endpoint
+        self.params = params
+        self.fields = fields
+        self.max_chars = max_chars
+        self.format = format
+        # "raw"는 원본 응답을 돌려주므로 스트리밍 파서를 쓰지 않는다
+        self.parse = endpoint.parse if format != "raw" else None
+
+    @property
+    def variant(self) -> str:
+        """Cache variant: parsed records are cached apart from raw bodies."""
+        return self.parse.__name__ if self.parse is not None else ""
+
+
+def chain(middleware, handler):
+    """
+    Compose `async (request, call_next) -> str` middleware around
+    `async handler(request) -> str` (the first middleware is outermost).
+    """
+    for layer in reversed(middleware):
+        handler = partial(layer, call_next=handler)
+    return handler
+
+
+def xml_to_json(text: str) -> str:
+    return json.dumps(xmltodict.parse(text), ensure_ascii=False)
+
+
+class Timing:
+    """Calls, errors and seconds per endpoint, in total and at worst."""
+
+    def __init__(self):
+        self.endpoints = {}
+
+    async def __call__(self, request: NaverRequest, call_next) -> str:
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = await call_next(request)
+            failed = False
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            entry = self.endpoints.setdefault(
+                request.endpoint.name, {"calls": 0, "errors": 0, "seconds": 0.0, "max_seconds": 0.0}
+            )
+            entry["calls"] += 1
+            entry["errors"] += failed
+            entry["seconds"] += elapsed
+            entry["max_seconds"] = max(entry["max_seconds"], elapsed)
+
+    def stats(self) -> dict:
+        return {name: dict(entry) for name, entry in self.endpoints.items()}
+
+
+class Projection:
+    """Turn the API response into what the tool returns (see naver_projection.project)."""
+
+    async def __call__(self, request: NaverRequest, call_next) -> str:
+        text = await call_next(request)
+        endpoint = request.endpoint
+        if request.format == "raw":
+            if endpoint.xml:
+                # XML 파싱은 CPU 작업이라 이벤트 루프를 막지 않도록 스레드에서 실행
+                return await anyio.to_thread.run_sync(xml_to_json, text)
+            return text
+        if not endpoint.projected:
+            return text
+        return project(
+            endpoint.vertical, json.loads(text), request.fields, request.max_chars, request.format
+        )
+
+
+class Caching:
+    """
+    Answer from the response cache when possible; identical requests
+    already in flight share one upstream call.
+
+    Args:
+        cache (ResponseCache): Response cache (naver_cache.py).
+        inflight (SingleFlight): Call coalescing (singleflight.py).
+    """
+
+    def __init__(self, cache, inflight):
+        self.cache = cache
+        self.inflight = inflight
+
+    async def __call__(self, request: NaverRequest, call_next) -> str:
+        path, params, variant = request.endpoint.path, request.params, request.variant
+        return await self.inflight.do(
+            self.cache.key(path, params, variant),
+            lambda: self.cache.fetch(path, params, lambda: call_next(request), variant),
+        )
+
+
+class Indexing:
+    """
+    Add the items of every search response fetched upstream to the local
+    full-text index (naver_index.py). Indexing failures are logged, never
+    raised to the caller.
+
+    Args:
+        index (FetchedIndex): The index.
+    """
+
+    def __init__(self, index):
+        self.index = index
+
+    async def __call__(self, request: NaverRequest, call_next) -> str:
+        text = await call_next(request)
+        endpoint = request.endpoint
+        # 원본 XML 본문은 색인하지 않는다 (스트리밍 파서를 거친 레코드만)
+        if endpoint.projected and not (endpoint.xml and request.parse is None):
+            try:
+                await anyio.to_thread.run_sync(
+                    self.index.add_response, endpoint.vertical, request.params.get("query"), text
+                )
+            except Exception:
+                logger.exception("Could not index %s results", endpoint.vertical)
+        return text
+
+
+class Retrying:
+    """Retry 429/5xx answers with backoff (naver_limits.Retry)."""
+
+    def __init__(self, retry):
+        self.retry = retry
+
+    async def __call__(self, request: NaverRequest, call_next) -> str:
+        return await self.retry(lambda: call_next(request))
+
+
+class RateLimiting:
+    """Take rate limiter tokens and daily quota for every upstream attempt."""
+
+    def __init__(self, limiter):
+        self.limiter = limiter
+
+    async def __call__(self, request: NaverRequest, call_next) -> str:
+        await self.limiter.acquire(request.endpoint.vertical)
+        return await call_next(request)
+
+
+class Transport:
+    """
+    Innermost handler: GET the endpoint with the shared client. With a
+    `parse` on the request a successful body is streamed into it as it
+    arrives, and its result is returned instead of the body.
+
+    Args:
+        http (SharedClient): Pooled HTTP client (naver_http.py).
+        api_endpoint (str): API root, e.g. "https://openapi.naver.com/v1".
+        headers (dict): Authentication headers.
+    """
+
+    def __init__(self, http, api_endpoint: str, headers: dict):
+        self.http = http
+        self.api_endpoint = api_endpoint
+        self.headers = headers
+
+    async def __call__(self, request: NaverRequest) -> str:
+        response = await self.http.get(
+            f"{self.api_endpoint}/{request.endpoint.path}",
+            stream=True,
+            params={k: v for k, v in request.params.items() if v is not None},
+            headers=self.headers,
+        )
+        try:
+            if request.parse is not None and response.is_success:
+                return await request.parse(response.aiter_bytes())
+            await response.aread()
+
+            response.raise_for_status()  # Raise an error for bad responses
+
+            return response.text
+        finally:
+            await response.aclose()
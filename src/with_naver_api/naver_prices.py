@@ -0,0 +1,185 @@
+# naver_prices.py
+import numpy as np
+
+from naver_projection import clean
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+# 카테고리 경로를 몇 단계까지 묶을지 (category1 ~ category4)
+CATEGORY_LEVELS = 4
+
+
+def prices(values: list) -> np.ndarray:
+    """['15000', '', None, ...] -> float64 array, NaN where there is no price."""
+    column = np.fromiter(map(float, [value or "nan" for value in values]), dtype=np.float64, count=len(values))
+    # 쇼핑 API는 가격이 없을 때 "0"을 보내기도 한다
+    column[column <= 0] = np.nan
+    return column
+
+
+def factorize(values: list) -> tuple:
+    """Values -> (distinct values in first-seen order, int32 code per value)."""
+    index = dict.fromkeys(values)
+    for code, value in enumerate(index):
+        index[value] = code
+    return list(index), np.fromiter(map(index.__getitem__, values), dtype=np.int32, count=len(values))
+
+
+class PriceColumns:
+    """
+    search_shop items as columns: lprice and hprice as float arrays (NaN
+    where the item has none), mallName and the category path as integer
+    codes into `malls` and `categories`. Built once per response, so every
+    statistic after that is a vectorized pass over arrays, not a loop over
+    dicts; names are cleaned and category paths joined once per distinct
+    value, not once per item.
+
+    Args:
+        items (list): Items of search_shop responses.
+        category_level (int, optional): Category levels joined into the path, 1 to 4. Defaults to 2.
+    """
+
+    def __init__(self, items: list, category_level: int = 2):
+        level = max(1, min(category_level, CATEGORY_LEVELS))
+        self.count = len(items)
+        self.category_level = level
+        self.lprice = prices([item.get("lprice") for item in items])
+        self.hprice = prices([item.get("hprice") for item in items])
+
+        malls, codes = factorize([item.get("mallName") for item in items])
+        self.malls, merged = factorize([clean(mall) or "?" for mall in malls])
+        self.mall = merged[codes]
+
+        # 단계별 코드를 하나의 정수로 합쳐서, 서로 다른 경로만 문자열로 만든다
+        combined = np.zeros(self.count, dtype=np.int64)
+        levels = []
+        for key in [f"category{n}" for n in range(1, level + 1)]:
+            names, codes = factorize([item.get(key) for item in items])
+            combined = combined * len(names) + codes
+            levels.append(names)
+        _, first, inverse = np.unique(combined, return_index=True, return_inverse=True)
+        seen = np.argsort(first)
+        paths = []
+        for path in combined[first[seen]]:
+            parts = []
+            for names in reversed(levels):
+                path, code = divmod(int(path), len(names))
+                parts.append(names[code])
+            paths.append(" > ".join(filter(None, reversed(parts))) or "?")
+        # 처음 나온 순서로 번호를 매기고, 같은 문자열이 되는 경로(빈 값과 None 등)는 합친다
+        order = np.empty_like(seen)
+        order[seen] = np.arange(len(seen))
+        self.categories, merged = factorize(paths)
+        self.category = merged[order[inverse]]
+
+
+def summary(values: np.ndarray, percentiles: tuple = PERCENTILES) -> dict:
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return {"count": 0}
+    cuts = np.percentile(values, percentiles)
+    return {
+        "count": len(values),
+        "min": round(float(values.min())),
+        **{f"p{p:g}": round(float(cut)) for p, cut in zip(percentiles, cuts)},
+        "max": round(float(values.max())),
+        "mean": round(float(values.mean())),
+    }
+
+
+def histogram(values: np.ndarray, bins: int = 10) -> list:
+    """
+    Equal-width buckets between the 1st and 99th percentile, so one outlier
+    does not squash every other price into the first bucket; the outer
+    buckets take the prices beyond (their bounds are the real min and max).
+    """
+    values = values[~np.isnan(values)]
+    if not len(values) or bins < 1:
+        return []
+    low, high = np.percentile(values, (1, 99))
+    if high <= low:
+        return [{"from": round(float(values.min())), "to": round(float(values.max())), "count": len(values)}]
+    counts, edges = np.histogram(np.clip(values, low, high), bins=bins, range=(low, high))
+    edges[0], edges[-1] = values.min(), values.max()
+    return [
+        {"from": round(float(edges[n])), "to": round(float(edges[n + 1])), "count": int(count)}
+        for n, count in enumerate(counts)
+    ]
+
+
+def groups(codes: np.ndarray, names: list, values: np.ndarray, top: int = 10) -> list:
+    """
+    Count, min, median, mean and max of `values` per group code, the `top`
+    largest groups first: sorted by price and then stably by group, every
+    group is a contiguous run whose ends and middle are its min, max and median.
+    """
+    priced = ~np.isnan(values)
+    codes, values = codes[priced], values[priced]
+    if not len(values):
+        return []
+    order = np.argsort(values)
+    keys = codes[order]
+    if len(names) <= np.iinfo(np.uint16).max:
+        # 16비트 이하 정수의 stable 정렬은 radix sort라 lexsort보다 몇 배 빠르다
+        keys = keys.astype(np.uint16)
+    order = order[np.argsort(keys, kind="stable")]
+    codes, values = codes[order], values[order]
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    counts = np.diff(np.r_[starts, len(codes)])
+    medians = (values[starts + (counts - 1) // 2] + values[starts + counts // 2]) / 2
+    means = np.add.reduceat(values, starts) / counts
+    result = []
+    for n in np.argsort(-counts, kind="stable")[:top]:
+        start, count = starts[n], counts[n]
+        result.append(
+            {
+                "name": names[codes[start]],
+                "count": int(count),
+                "min": round(float(values[start])),
+                "median": round(float(medians[n])),
+                "mean": round(float(means[n])),
+                "max": round(float(values[start + count - 1])),
+            }
+        )
+    return result
+
+
+def price_stats(items: list, bins: int = 10, top: int = 10, category_level: int = 2) -> dict:
+    """Price summary, histogram and per-mall / per-category aggregates of search_shop items."""
+    columns = PriceColumns(items, category_level)
+    return {
+        "count": columns.count,
+        "lprice": summary(columns.lprice),
+        "hprice": summary(columns.hprice),
+        "histogram": histogram(columns.lprice, bins),
+        "malls": {"total": len(columns.malls), "top": groups(columns.mall, columns.malls, columns.lprice, top)},
+        "categories": {
+            "level": columns.category_level,
+            "total": len(columns.categories),
+            "top": groups(columns.category, columns.categories, columns.lprice, top),
+        },
+    }
+
+
+def format_stats(stats: dict) -> str:
+    """Compact lines of a price_stats result, prices in won."""
+    price = stats["lprice"]
+    lines = [f"{stats['count']} items, {price['count']} with a price"]
+    if price["count"]:
+        lines.append(
+            "lprice " + " | ".join(f"{name} {value:,}" for name, value in price.items() if name != "count")
+        )
+    if stats["hprice"]["count"]:
+        hprice = stats["hprice"]
+        lines.append(f"hprice {hprice['count']} items, median {hprice['p50']:,}, max {hprice['max']:,}")
+    if stats["histogram"]:
+        lines.append("histogram:")
+        lines.extend(f"  {b['from']:,}-{b['to']:,}: {b['count']}" for b in stats["histogram"])
+    for key, title in (("malls", "malls"), ("categories", f"categories (level {stats['categories']['level']})")):
+        group = stats[key]
+        if group["top"]:
+            lines.append(f"{title}, top {len(group['top'])} of {group['total']} (count: min / median / max):")
+            lines.extend(
+                f"  {g['name']}: {g['count']}: {g['min']:,} / {g['median']:,} / {g['max']:,}" for g in group["top"]
+            )
+    return "\n".join(lines)
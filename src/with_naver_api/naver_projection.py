@@ -0,0 +1,113 @@
+# naver_projection.py
+import html
+import json
+import re
+
+# 분야별로 LLM에 넘기는 필드 (순서대로 출력)
+FIELDS = {
+    "blog": ("title", "link", "description", "bloggername", "postdate"),
+    "news": ("title", "link", "description", "pubDate"),
+    "book": ("title", "author", "publisher", "pubdate", "isbn", "discount", "link", "description"),
+    "book_adv": ("title", "author", "publisher", "pubdate", "isbn", "discount", "link", "description"),
+    "encyc": ("title", "link", "description"),
+    "cafearticle": ("title", "link", "description", "cafename"),
+    "kin": ("title", "link", "description"),
+    "local": ("title", "category", "roadAddress", "telephone", "link"),
+    "webkr": ("title", "link", "description"),
+    "image": ("title", "link", "sizewidth", "sizeheight"),
+    "shop": ("title", "link", "lprice", "hprice", "mallName", "brand", "maker", "category1", "category2", "category3"),
+    "doc": ("title", "link", "description"),
+}
+DEFAULT_FIELDS = ("title", "link", "description")
+
+# 목록에서 이름 없이 값만 쓰는 필드. 나머지는 name=value
+_BARE_FIELDS = ("title", "link", "description")
+# max_chars로 자르는 긴 글 필드
+_LONG_FIELDS = ("description",)
+
+FORMATS = ("compact", "json", "raw")
+
+_TAG = re.compile(r"<[^>]+>")
+_SPACE = re.compile(r"\s+")
+
+
+def clean(value) -> str:
+    """Drop HTML tags (e.g. <b> highlights), decode entities and collapse whitespace."""
+    if value is None:
+        return ""
+    return _SPACE.sub(" ", html.unescape(_TAG.sub("", str(value)))).strip()
+
+
+def truncate(text: str, max_chars: int) -> str:
+    if max_chars and len(text) > max_chars:
+        return text[: max_chars - 1].rstrip() + "…"
+    return text
+
+
+def parse_fields(fields) -> tuple:
+    """Accept ["title", "link"] or "title,link"."""
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    return tuple(field.strip() for field in fields if field.strip())
+
+
+def project_item(item: dict, fields: tuple, max_chars: int) -> dict:
+    projected = {}
+    for field in fields:
+        value = clean(item.get(field))
+        if field in _LONG_FIELDS:
+            value = truncate(value, max_chars)
+        if value:
+            projected[field] = value
+    return projected
+
+
+def compact_line(index: int, item: dict) -> str:
+    parts = [value for field, value in item.items() if field in _BARE_FIELDS]
+    parts += [f"{field}={value}" for field, value in item.items() if field not in _BARE_FIELDS]
+    return f"{index}. " + " | ".join(parts)
+
+
+def project(
+    vertical: str,
+    data: dict,
+    fields=None,
+    max_chars: int = 200,
+    format: str = "compact",
+) -> str:
+    """
+    Reduce a Naver search response to what the LLM needs.
+
+    Items keep only the whitelisted `fields` (by default FIELDS of their
+    vertical; merged search_all items name their own in "vertical"), with
+    HTML tags and entities removed and descriptions cut to `max_chars`.
+    Response metadata other than the total and the item range is dropped.
+
+    Args:
+        vertical (str): Vertical name, e.g. "blog" (selects the default fields).
+        data (dict): The parsed response, with "items" and optionally "total" and "start".
+        fields (list[str] | str, optional): Fields to keep. Defaults to FIELDS[vertical].
+        max_chars (int, optional): Description length limit, 0 for none. Defaults to 200.
+        format (str, optional): "compact" (one line per item) or "json". Defaults to "compact".
+    """
+    assert format in FORMATS[:2], f"Unknown format {format!r}, choose from {FORMATS}"
+    fields = parse_fields(fields) if fields else None
+
+    items = []
+    for item in data.get("items") or []:
+        item_vertical = item.get("vertical", vertical)
+        projected = project_item(item, fields or FIELDS.get(item_vertical, DEFAULT_FIELDS), max_chars)
+        if item_vertical != vertical:
+            projected["vertical"] = item_vertical
+        items.append(projected)
+    start = int(data.get("start") or 1)
+    total = data.get("total", len(items))
+
+    if format == "json":
+        return json.dumps({"total": total, "start": start, "items": items}, ensure_ascii=False)
+
+    if not items:
+        return f"total {total}, no items"
+    lines = [f"total {total}, items {start}-{start + len(items) - 1}"]
+    lines += [compact_line(start + i, item) for i, item in enumerate(items)]
+    return "\n".join(lines)
@@ -0,0 +1,612 @@
+# naver_server.py
+import asyncio
+import inspect
+import json
+import os
+from contextlib import asynccontextmanager
+
+import anyio
+from mcp.server.fastmcp import FastMCP
+
+from naver_cache import ResponseCache
+from naver_endpoints import ENDPOINTS, by_vertical
+from naver_http import SharedClient
+from naver_index import FetchedIndex
+from naver_limits import RateLimiter, Retry, lane
+from naver_links import MAX_LINKS, LinkChecker, format_results
+from naver_merge import item_url, merge_ranked, normalize_url
+from naver_prices import format_stats, price_stats
+from naver_pipeline import (
+    Caching,
+    Indexing,
+    NaverRequest,
+    Projection,
+    RateLimiting,
+    Retrying,
+    Timing,
+    Transport,
+    chain,
+)
+from naver_projection import project
+from singleflight import SingleFlight
+
+# search_all에서 함께 검색하는 분야 (개별 도구의 기본 파라미터를 써서 같은 캐시 키가 된다)
+SEARCH_ALL_VERTICALS = ("blog", "news", "cafearticle", "kin", "webkr")
+
+# 네이버 검색 API 페이지 제한: display 최대 100, start 최대 1000
+PAGE_SIZE = 100
+MAX_START = 1000
+
+# search_many로 여러 페이지를 가져올 수 있는 분야
+PAGED_VERTICALS = ("blog", "news", "book", "encyc", "cafearticle", "kin", "webkr", "image", "shop", "doc")
+
+# 배치 도구가 한 번에 보내는 요청 수의 상한 (요청 속도는 어차피 rate limiter가 정한다)
+MAX_BATCH_CONCURRENCY = 32
+
+
+class NaverService:
+    """
+    The Naver OpenAPI client behind the MCP tools. Every endpoint call runs
+    through one middleware chain, outermost first:
+
+        timing → projection → single-flight and cache → retry → rate limit → HTTP
+
+    Projection sits outside the cache, so cached entries are API responses
+    that serve any fields/max_chars/format; rate limiting sits inside retry,
+    so every attempt takes a token and a unit of the daily quota. With an
+    `index`, responses fetched upstream are also added to it, below the cache.
+
+    Links found in results are checked by `links`, which has its own client:
+    they point at any host, not at the API.
+
+    Args:
+        http (SharedClient): Pooled HTTP client.
+        cache (ResponseCache): Response cache.
+        inflight (SingleFlight): Call coalescing.
+        limiter (RateLimiter): Rate limiter and daily quota.
+        retry (Retry): Retry policy.
+        api_endpoint (str): API root.
+        headers (dict): Authentication headers.
+        index (FetchedIndex, optional): Full-text index of fetched items. Defaults to None.
+        links (LinkChecker, optional): Link checker. Defaults to LinkChecker().
+    """
+
+    def __init__(
+        self,
+        http: SharedClient,
+        cache: ResponseCache,
+        inflight: SingleFlight,
+        limiter: RateLimiter,
+        retry: Retry,
+        api_endpoint: str,
+        headers: dict,
+        index: FetchedIndex = None,
+        links: LinkChecker = None,
+    ):
+        self.http = http
+        self.cache = cache
+        self.inflight = inflight
+        self.limiter = limiter
+        self.retry = retry
+        self.index = index
+        self.links = links or LinkChecker()
+        self.timing = Timing()
+        self.transport = Transport(http, api_endpoint, headers)
+        self.middleware = [
+            self.timing,
+            Projection(),
+            Caching(cache, inflight),
+            *([Indexing(index)] if index is not None else []),
+            Retrying(retry),
+            RateLimiting(limiter),
+        ]
+        self._call = chain(self.middleware, self.transport)
+
+    @classmethod
+    def from_env(cls) -> "NaverService":
+        """
+        Build from NAVER_CLIENT_ID, NAVER_CLIENT_SECRET, NAVER_API_ENDPOINT and
+        the settings read by each component (the index only with NAVER_INDEX_DB).
+        """
+        return cls(
+            SharedClient(),
+            ResponseCache.from_env(),
+            SingleFlight(),
+            RateLimiter.from_env(),
+            Retry(),
+            os.environ.get("NAVER_API_ENDPOINT", "https://openapi.naver.com/v1"),
+            {
+                "X-Naver-Client-Id": os.environ.get("NAVER_CLIENT_ID"),
+                "X-Naver-Client-Secret": os.environ.get("NAVER_CLIENT_SECRET"),
+            },
+            FetchedIndex.from_env(),
+            LinkChecker.from_env(),
+        )
+
+    @asynccontextmanager
+    async def lifespan(self, server):
+        """FastMCP lifespan: close both HTTP clients when the last session ends."""
+        async with self.http.lifespan(server) as context, self.links.http.lifespan(server):
+            yield context
+
+    async def request(
+        self,
+        endpoint,
+        params: dict,
+        fields: list = None,
+        max_chars: int = 200,
+        format: str = "compact",
+    ) -> str:
+        """Call an endpoint (or its tool name) through the pipeline."""
+        if isinstance(endpoint, str):
+            endpoint = ENDPOINTS[endpoint]
+        return await self._call(NaverRequest(endpoint, params, fields, max_chars, format))
+
+    async def fetch(self, vertical: str, **params) -> dict:
+        """The API's JSON response of a vertical, with the tool's default parameters."""
+        endpoint = by_vertical(vertical)
+        text = await self.request(endpoint, {**endpoint.defaults(), **params}, format="raw")
+        return json.loads(text)
+
+    async def batch(self, endpoint, queries: list, concurrency: int = 8) -> str:
+        """
+        Call a single-query endpoint (one with `batch`, e.g. adult_check) for
+        many queries: repeated queries are sent once, at most `concurrency`
+        requests are in flight, and all of them run in the batch lane under
+        the rate limiter. Results are aligned with `queries`; a query that
+        failed gets {"error": ...} in its place.
+        """
+        if isinstance(endpoint, str):
+            endpoint = ENDPOINTS[endpoint]
+        semaphore = asyncio.Semaphore(max(1, min(concurrency, MAX_BATCH_CONCURRENCY)))
+        unique = list(dict.fromkeys(queries))
+
+        async def one(query: str):
+            async with semaphore:
+                text = await self.request(endpoint, {"query": query})
+            return json.loads(text).get(endpoint.batch)
+
+        with lane("batch"):
+            outcomes = await asyncio.gather(*(one(query) for query in unique), return_exceptions=True)
+
+        answers = dict(zip(unique, outcomes))
+        results = [
+            {"error": error_text(answer)} if isinstance(answer, Exception) else answer
+            for answer in (answers[query] for query in queries)
+        ]
+        return json.dumps(
+            {
+                "count": len(queries),
+                "unique": len(unique),
+                "errors": sum(isinstance(result, dict) for result in results),
+                endpoint.batch: results,
+            },
+            ensure_ascii=False,
+        )
+
+    async def search_all(
+        self,
+        query: str,
+        verticals: list[str] = None,
+        display: int = 10,
+        timeout: float = 5.0,
+        fields: list[str] = None,
+        max_chars: int = 200,
+        format: str = "compact",
+    ):
+        """
+        Search blogs, news, cafe articles, Q&A and web pages on Naver at once and merge the results
+
+        Args:
+            query (str): The query to search for.
+            verticals (list[str], optional): Any of "blog", "news", "cafearticle", "kin", "webkr". Defaults to all.
+            display (int, optional): The number of items to fetch per vertical. Defaults to 10.
+            timeout (float, optional): Seconds to wait for each vertical. Defaults to 5.
+            fields (list[str], optional): Fields to return. Defaults to the tool's usual fields.
+            max_chars (int, optional): Truncate descriptions to this many characters, 0 for no limit. Defaults to 200.
+            format (str, optional): "compact" lines, projected "json", or the "raw" API response. Defaults to "compact".
+        """
+
+        verticals = verticals or list(SEARCH_ALL_VERTICALS)
+        unknown = set(verticals) - set(SEARCH_ALL_VERTICALS)
+        assert not unknown, f"Unknown verticals {sorted(unknown)}, choose from {list(SEARCH_ALL_VERTICALS)}"
+
+        async def search(name: str) -> list:
+            data = await asyncio.wait_for(
+                self.fetch(name, query=query, display=display, start=1), timeout
+            )
+            return data.get("items", [])
+
+        outcomes = await asyncio.gather(
+            *(search(name) for name in verticals), return_exceptions=True
+        )
+
+        # 실패한 분야가 있어도 나머지 결과는 돌려준다
+        results, status = {}, {}
+        for name, outcome in zip(verticals, outcomes):
+            if isinstance(outcome, asyncio.TimeoutError):
+                status[name] = {"status": "timeout"}
+            elif isinstance(outcome, Exception):
+                status[name] = {"status": "error", "error": f"{type(outcome).__name__}: {outcome}"}
+            else:
+                results[name] = outcome
+                status[name] = {"status": "ok", "count": len(outcome)}
+
+        items = merge_ranked(results)
+        if format == "raw":
+            return json.dumps(
+                {"query": query, "total": len(items), "verticals": status, "items": items},
+                ensure_ascii=False,
+            )
+        projected = project("all", {"items": items}, fields, max_chars, format)
+        if format == "json":
+            return json.dumps({"verticals": status, **json.loads(projected)}, ensure_ascii=False)
+        summary = ", ".join(
+            f"{name} {info['status']}" + (f" {info['count']}" if "count" in info else "")
+            for name, info in status.items()
+        )
+        return f"verticals: {summary}\n{projected}"
+
+    async def search_many(
+        self,
+        vertical: str,
+        query: str,
+        count: int = 300,
+        sort: str = None,
+        fields: list[str] = None,
+        max_chars: int = 200,
+        format: str = "compact",
+    ):
+        """
+        Fetch up to `count` unique results (max 1000) from one Naver vertical in a single call.
+        If some pages fail, the pages fetched are returned and the result is marked partial.
+
+        Args:
+            vertical (str): One of "blog", "news", "book", "encyc", "cafearticle", "kin", "webkr", "image", "shop", "doc".
+            query (str): The query to search for.
+            count (int, optional): The number of unique results wanted. Defaults to 300.
+            sort (str, optional): The sorting method, for verticals that support it. Defaults to "sim".
+            fields (list[str], optional): Fields to return. Defaults to the tool's usual fields.
+            max_chars (int, optional): Truncate descriptions to this many characters, 0 for no limit. Defaults to 200.
+            format (str, optional): "compact" lines, projected "json", or the "raw" API response. Defaults to "compact".
+        """
+
+        assert vertical in PAGED_VERTICALS, f"Unknown vertical {vertical!r}, choose from {list(PAGED_VERTICALS)}"
+        extra = {}
+        if sort and "sort" in by_vertical(vertical).defaults():
+            extra["sort"] = sort
+        count = min(count, MAX_START + PAGE_SIZE - 1)
+
+        async def page(start: int) -> dict:
+            return await self.fetch(vertical, query=query, display=PAGE_SIZE, start=start, **extra)
+
+        pages, tasks, failed = {}, {}, {}
+        # total은 API가 알려 준 결과 수(보고용), last는 가져올 수 있는 마지막 결과 번호
+        total = None
+        last = MAX_START + PAGE_SIZE - 1
+        next_start = 1
+
+        def unique_items() -> list:
+            # 도착한 페이지를 순서대로 이어 붙이며 같은 URL은 한 번만
+            items, seen = [], set()
+            for start in sorted(pages):
+                for item in pages[start].get("items", []):
+                    key = normalize_url(item_url(item)) or json.dumps(item, sort_keys=True)
+                    if key not in seen:
+                        seen.add(key)
+                        items.append(item)
+            return items
+
+        # 여러 페이지를 동시에 요청하는 대량 작업이라 batch 차선에서 실행
+        with lane("batch"):
+            try:
+                while True:
+                    # 모자란 만큼의 페이지를 한꺼번에 요청 (실패한 페이지가 있으면 더 요청하지 않는다)
+                    missing = count - len(unique_items()) - PAGE_SIZE * len(tasks)
+                    while not failed and missing > 0 and next_start <= min(MAX_START, last):
+                        tasks[next_start] = asyncio.ensure_future(page(next_start))
+                        next_start += PAGE_SIZE
+                        missing -= PAGE_SIZE
+                    if not tasks:
+                        break
+
+                    done, _ = await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_COMPLETED)
+                    for start in [start for start, task in tasks.items() if task in done]:
+                        task = tasks.pop(start)
+                        if task.exception() is not None:
+                            failed[start] = task.exception()
+                            continue
+                        result = pages[start] = task.result()
+                        if "total" in result:
+                            total = int(result["total"])
+                            last = min(last, total)
+                        if len(result.get("items", [])) < PAGE_SIZE:
+                            # 마지막 페이지: 이후 페이지는 필요 없다
+                            last = min(last, start + len(result.get("items", [])) - 1)
+
+                    # 결과가 더 없는 페이지와, 충분히 모였으면 나머지 페이지를 취소
+                    enough = len(unique_items()) >= count
+                    for start in list(tasks):
+                        if enough or start > last:
+                            tasks.pop(start).cancel()
+                    if enough:
+                        break
+            finally:
+                for task in tasks.values():
+                    task.cancel()
+
+        if failed and not pages:
+            # 돌려줄 페이지가 하나도 없으면 첫 실패를 그대로 알린다
+            raise failed[min(failed)]
+        items = unique_items()[:count]
+        if total is None:
+            total = len(items)
+        errors = {str(start): error_text(error) for start, error in sorted(failed.items())}
+        if format == "raw":
+            return json.dumps(
+                {
+                    "query": query,
+                    "vertical": vertical,
+                    "total": total,
+                    "pages_fetched": len(pages),
+                    "count": len(items),
+                    "partial": bool(failed),
+                    **({"failed_pages": errors} if failed else {}),
+                    "items": items,
+                },
+                ensure_ascii=False,
+            )
+        projected = project(vertical, {"items": items, "total": total}, fields, max_chars, format)
+        if not failed:
+            return projected
+        if format == "json":
+            return json.dumps(
+                {"partial": True, "failed_pages": errors, **json.loads(projected)}, ensure_ascii=False
+            )
+        summary = ", ".join(f"start {start}: {error}" for start, error in errors.items())
+        return f"partial: {len(failed)} page(s) failed ({summary})\n{projected}"
+
+    async def search_fetched(
+        self,
+        query: str,
+        verticals: list[str] = None,
+        limit: int = 10,
+        fields: list[str] = None,
+        max_chars: int = 200,
+        format: str = "compact",
+    ):
+        """
+        Search the results Naver searches already returned, from the local index: no upstream call, no quota
+
+        Args:
+            query (str): Words that must all appear in the title, description or other text of an item.
+            verticals (list[str], optional): Only items from these verticals, e.g. ["blog", "news"]. Defaults to all.
+            limit (int, optional): The number of items to return. Defaults to 10.
+            fields (list[str], optional): Fields to return. Defaults to the tool's usual fields.
+            max_chars (int, optional): Truncate descriptions to this many characters, 0 for no limit. Defaults to 200.
+            format (str, optional): "compact" lines, projected "json", or the "raw" API response. Defaults to "compact".
+        """
+
+        items = await anyio.to_thread.run_sync(self.index.search, query, verticals, limit)
+        if format == "raw":
+            return json.dumps({"query": query, "total": len(items), "items": items}, ensure_ascii=False)
+        return project("fetched", {"items": items}, fields, max_chars, format)
+
+    async def shop_price_stats(
+        self,
+        query: str,
+        count: int = 300,
+        sort: str = "sim",
+        bins: int = 10,
+        top: int = 10,
+        category_level: int = 2,
+        format: str = "compact",
+    ):
+        """
+        Price range of a product on Naver shopping: min/max/median/percentiles, a histogram and per-mall and per-category prices over up to 1000 results
+
+        Args:
+            query (str): The product to search for.
+            count (int, optional): The number of shopping results to analyze (max 1000). Defaults to 300.
+            sort (str, optional): "sim", "date", "asc" or "dsc"; decides which results are analyzed. Defaults to "sim".
+            bins (int, optional): The number of histogram buckets. Defaults to 10.
+            top (int, optional): The number of malls and categories listed. Defaults to 10.
+            category_level (int, optional): Category depth the results are grouped by, 1 to 4. Defaults to 2.
+            format (str, optional): "compact" lines or "json". Defaults to "compact".
+        """
+
+        data = json.loads(await self.search_many("shop", query, count, sort, format="raw"))
+        # total은 API가 알려 준 전체 결과 수, count는 실제로 분석한 결과 수
+        stats = {
+            "query": query,
+            "total": data["total"],
+            **({"partial": True, "failed_pages": data["failed_pages"]} if data.get("partial") else {}),
+            **price_stats(data["items"], bins, top, category_level),
+        }
+        if format == "json":
+            return json.dumps(stats, ensure_ascii=False)
+        header = f"shop prices for {query!r} (won), of {stats['total']:,} results"
+        if stats.get("partial"):
+            header += f" (partial: {len(stats['failed_pages'])} page(s) failed)"
+        return f"{header}\n{format_stats(stats)}"
+
+    async def check_links(self, urls: list[str], format: str = "compact"):
+        """
+        Check whether links (e.g. from search results) are reachable: HTTP status and final URL after redirects
+
+        Args:
+            urls (list[str]): The URLs to check, up to 200; repeated ones are checked once.
+            format (str, optional): "compact" lines or "json". Defaults to "compact".
+        """
+
+        assert len(urls) <= MAX_LINKS, f"At most {MAX_LINKS} links per call, got {len(urls)}"
+        results = await self.links.check_many(urls)
+        if format == "json":
+            return json.dumps(
+                {
+                    "count": len(results),
+                    "reachable": sum(result["ok"] for result in results),
+                    "links": results,
+                },
+                ensure_ascii=False,
+            )
+        return format_results(results)
+
+    async def cache_stats(self):
+        """
+        Show hit ratio and API quota saved by the Naver response cache,
+        and how many calls were coalesced with an identical one in flight
+        """
+
+        stats = {**self.cache.stats(), "inflight": self.inflight.stats()}
+        if self.index is not None:
+            stats["index"] = self.index.stats()
+        return json.dumps(stats)
+
+    async def quota_status(self):
+        """
+        Show the Naver API rate limiter bucket level and remaining daily quota
+        """
+
+        return json.dumps({**self.limiter.stats(), "retry": self.retry.stats()})
+
+    def metrics(self) -> str:
+        """Timing, limiter, quota, retry, cache, single-flight and link checker numbers in Prometheus text format."""
+        values = {
+            "endpoint": self.timing.stats(),
+            "limiter": self.limiter.stats(),
+            "retry": self.retry.stats(),
+            "cache": self.cache.stats(),
+            "inflight": self.inflight.stats(),
+            "links": self.links.stats(),
+        }
+        if self.index is not None:
+            values["index"] = self.index.stats()
+        return "\n".join(prometheus(values, "naver")) + "\n"
+
+
+def error_text(error: Exception) -> str:
+    """'HTTPStatusError: Server error ...' without httpx's second line of advice."""
+    message = str(error).split("\n", 1)[0]
+    return f"{type(error).__name__}: {message}" if message else type(error).__name__
+
+
+def prometheus(values: dict, prefix: str) -> list:
+    lines = []
+    for name, value in values.items():
+        if isinstance(value, dict):
+            lines.extend(prometheus(value, f"{prefix}_{name}"))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            lines.append(f"{prefix}_{name} {float(value)}")
+    return lines
+
+
+def make_tool(service: NaverService, endpoint):
+    """
+    The tool function of an endpoint: its signature and docstring come from
+    the endpoint's parameters, and calls go through `service`'s pipeline.
+    """
+    signature = inspect.Signature(
+        [
+            inspect.Parameter(
+                name, inspect.Parameter.POSITIONAL_OR_KEYWORD, default=default, annotation=annotation
+            )
+            for name, annotation, default, _ in endpoint.tool_params()
+        ]
+    )
+
+    async def tool(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        params = dict(bound.arguments)
+        options = {name: params.pop(name) for name in ("fields", "max_chars", "format") if name in params}
+        if endpoint.require_any:
+            assert any(params.get(name) for name in endpoint.require_any), (
+                f"Either {' or '.join(endpoint.require_any)} must be provided"
+            )
+        return await service.request(endpoint, params, **options)
+
+    tool.__name__ = endpoint.name
+    tool.__qualname__ = endpoint.name
+    tool.__doc__ = endpoint.docstring()
+    tool.__signature__ = signature
+    return tool
+
+
+def make_batch_tool(service: NaverService, endpoint):
+    """The `<name>_batch` tool of an endpoint with `batch`, taking a list of queries."""
+
+    async def tool(queries: list[str], concurrency: int = 8):
+        return await service.batch(endpoint, queries, concurrency)
+
+    tool.__name__ = tool.__qualname__ = f"{endpoint.name}_batch"
+    tool.__doc__ = f"""
+    {endpoint.description}, for many queries in one call
+
+    Args:
+        queries (list[str]): The queries; repeated ones are sent once.
+        concurrency (int, optional): Requests in flight at once, up to {MAX_BATCH_CONCURRENCY}. Defaults to 8.
+    """
+    return tool
+
+
+def build_server(service: NaverService = None, tools=None, name: str = "Naver OpenAPI") -> FastMCP:
+    """
+    FastMCP server with a tool per entry of ENDPOINTS, a `<name>_batch`
+    tool per entry with `batch`, and search_all, search_many,
+    shop_price_stats, check_links, cache_stats and quota_status (plus search_fetched with an index), all
+    sharing `service`.
+
+    Args:
+        service (NaverService, optional): Defaults to NaverService.from_env().
+        tools (list, optional): Names of the tools to register. Defaults to all.
+        name (str, optional): Server name. Defaults to "Naver OpenAPI".
+    """
+    service = service or NaverService.from_env()
+    mcp = FastMCP(name, dependencies=["httpx", "xmltodict", "numpy"], lifespan=service.lifespan)
+
+    functions = {
+        endpoint.name: (make_tool(service, endpoint), endpoint.description)
+        for endpoint in ENDPOINTS.values()
+    }
+    for endpoint in ENDPOINTS.values():
+        if endpoint.batch:
+            functions[f"{endpoint.name}_batch"] = (
+                make_batch_tool(service, endpoint),
+                f"{endpoint.description}, for many queries in one call; results follow the query order",
+            )
+    functions.update(
+        search_all=(
+            service.search_all,
+            "Search blogs, news, cafe articles, Q&A and web pages on Naver at once and merge the results",
+        ),
+        search_many=(
+            service.search_many,
+            "Fetch up to `count` unique results (max 1000) from one Naver vertical in a single call",
+        ),
+        shop_price_stats=(
+            service.shop_price_stats,
+            "Price range of a product on Naver shopping: min/max/median/percentiles, a histogram "
+            "and per-mall and per-category prices over up to 1000 results",
+        ),
+        check_links=(
+            service.check_links,
+            "Check whether links (e.g. from search results) are reachable: HTTP status and final URL after redirects",
+        ),
+        cache_stats=(service.cache_stats, "Show hit ratio and API quota saved by the Naver response cache"),
+        quota_status=(
+            service.quota_status,
+            "Show the Naver API rate limiter bucket level and remaining daily quota",
+        ),
+    )
+    if service.index is not None:
+        functions["search_fetched"] = (
+            service.search_fetched,
+            "Search the results Naver searches already returned, from the local index: no upstream call, no quota",
+        )
+    for tool_name, (function, description) in functions.items():
+        if tools is None or tool_name in tools:
+            mcp.add_tool(function, name=tool_name, description=description)
+
+    mcp.resource("metrics://naver", mime_type="text/plain")(service.metrics)
+    return mcp
@@ -0,0 +1,68 @@
+# naver_xml.py
+import json
+from xml.etree.ElementTree import XMLPullParser
+
+from naver_projection import FIELDS
+
+# <channel> 바로 아래에서 읽는 값
+_CHANNEL_FIELDS = ("total", "start", "display")
+
+
+class BookAdvParser:
+    """
+    Incremental parser for book_adv.xml responses.
+
+    Fed the body chunk by chunk as it arrives, it keeps only the wanted
+    <item> fields as flat records and drops each <item> element as soon as
+    it is complete, so no dict tree of the whole document is built and
+    memory stays bounded by one item plus the records.
+
+    Args:
+        fields (tuple, optional): Item fields to keep. Defaults to FIELDS["book_adv"] plus "image".
+    """
+
+    def __init__(self, fields: tuple = (*FIELDS["book_adv"], "image")):
+        self.fields = set(fields)
+        self.channel = {}
+        self.items = []
+        self._parser = XMLPullParser(events=("start", "end"))
+        self._path = []
+        self._channel = None
+
+    def feed(self, chunk: bytes):
+        self._parser.feed(chunk)
+        self._consume()
+
+    def close(self) -> dict:
+        """Finish parsing and return {"total", "start", "display", "items"}."""
+        self._parser.close()
+        self._consume()
+        return {**self.channel, "items": self.items}
+
+    def _consume(self):
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                self._path.append(elem.tag)
+                if elem.tag == "channel":
+                    self._channel = elem
+                continue
+
+            self._path.pop()
+            parent = self._path[-1] if self._path else None
+            if elem.tag == "item":
+                self.items.append(
+                    {child.tag: child.text or "" for child in elem if child.tag in self.fields}
+                )
+                # 다 읽은 <item>은 트리에서 떼어내 메모리를 돌려준다
+                if self._channel is not None:
+                    self._channel.remove(elem)
+            elif parent == "channel" and elem.tag in _CHANNEL_FIELDS:
+                self.channel[elem.tag] = int(elem.text) if (elem.text or "").isdigit() else elem.text
+
+
+async def parse_book_adv(chunks) -> str:
+    """Parse an async iterator of book_adv.xml body chunks into compact JSON records."""
+    parser = BookAdvParser()
+    async for chunk in chunks:
+        parser.feed(chunk)
+    return json.dumps(parser.close(), ensure_ascii=False)
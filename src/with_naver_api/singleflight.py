@@ -0,0 +1,65 @@
+# singleflight.py
+import asyncio
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: while a call for a key is in
+    flight, later callers with the same key wait for it instead of starting
+    their own.
+
+    The shared call runs as its own task. Every waiter gets its result or
+    its exception, and a waiter that is cancelled only stops waiting: the
+    call keeps running for the others. Once every waiter has been
+    cancelled the call is cancelled too, so abandoned requests do not keep
+    their place in the rate limiter queue, and its key is freed at once:
+    a caller that comes after starts a new call instead of joining the
+    cancelled one.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._waiters = {}
+        self.calls = 0
+        self.shared = 0
+        self.abandoned = 0
+
+    async def do(self, key: str, call):
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            self._waiters[task] = 0
+            task.add_done_callback(lambda t: self._done(key, t))
+            self.calls += 1
+        else:
+            self.shared += 1
+        self._waiters[task] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if task in self._waiters:
+                self._waiters[task] -= 1
+                if self._waiters[task] == 0 and not task.done():
+                    self.abandoned += 1
+                    # 취소되는 호출에 나중 호출자가 합류하지 않도록 키를 바로 비운다
+                    if self._calls.get(key) is task:
+                        del self._calls[key]
+                    task.cancel()
+            raise
+
+    def _done(self, key: str, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        self._waiters.pop(task, None)
+        if not task.cancelled():
+            # 기다리던 쪽이 모두 취소된 경우에도 경고가 남지 않도록 예외를 회수
+            task.exception()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._calls),
+            "calls": self.calls,
+            "coalesced": self.shared,
+            "abandoned": self.abandoned,
+        }